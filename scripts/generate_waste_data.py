@@ -1,18 +1,19 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
-import uuid
+import argparse
+import time
 import os
 
-# Set random seed for reproducibility
-np.random.seed(42)
-
 # Define constants
-START_DATE = datetime.now() - timedelta(days=90)
-END_DATE = datetime.now()
+DEFAULT_SEED = 42
+DEFAULT_DAYS = 90
 NUM_RECORDS = 300
 
+# Rows drawn per random stream; each (seed, day, block) has its own
+# stream, so the output does not depend on the chunk size used to write it
+BLOCK_ROWS = 65536
+
 # Sample data
 INVENTORY_ITEMS = [
     {"id": "INV001", "name": "Tomatoes", "category": "produce", "unit": "kg", "unit_cost": 5.00},
@@ -41,61 +42,193 @@ STAFF_MEMBERS = [
 
 LOCATIONS = ["kitchen", "storage", "prep area", "receiving", "display"]
 
-def generate_waste_data():
-    data = []
-    
-    # Generate dates with more entries on weekends
-    dates = []
-    current_date = START_DATE
-    while current_date <= END_DATE:
-        # Add more entries for weekends
-        num_entries = np.random.randint(2, 6) if current_date.weekday() >= 5 else np.random.randint(1, 4)
-        dates.extend([current_date] * num_entries)
-        current_date += timedelta(days=1)
+COLUMNS = [
+    "waste_id", "date", "item_id", "item_name", "quantity", "unit", "reason",
+    "cost", "category", "disposal_method", "responsible_staff", "location"
+]
+
+# Less waste for expensive items, more for perishables
+CATEGORY_FACTORS = {"meat": 0.5, "seafood": 0.5, "produce": 1.5, "bakery": 1.5}
+
+HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype="S1")
+
+def waste_ids(row_numbers, seed):
+    """
+    Build 'W' + 8 hex digit ids from global row numbers
     
-    # Sort dates to ensure chronological order
-    dates.sort()
+    The row number is scrambled with an invertible 32-bit mix, so ids
+    look random but never repeat within 2**32 rows.
+    """
+    x = (row_numbers.astype(np.uint64) + np.uint64(seed * 0x9E3779B9)) & np.uint64(0xFFFFFFFF)
+    x = (x * np.uint64(0x85EBCA6B)) & np.uint64(0xFFFFFFFF)
+    x ^= x >> np.uint64(13)
+    x = (x * np.uint64(0xC2B2AE35)) & np.uint64(0xFFFFFFFF)
+    x ^= x >> np.uint64(16)
     
-    # Take only NUM_RECORDS entries
-    dates = dates[:NUM_RECORDS]
+    shifts = np.arange(28, -1, -4, dtype=np.uint64)
+    chars = np.empty((len(x), 9), dtype="S1")
+    chars[:, 0] = b"W"
+    chars[:, 1:] = HEX_DIGITS[((x[:, None] >> shifts) & np.uint64(0xF)).astype(np.intp)]
+    return chars.view("S9").ravel().astype(str)
+
+def daily_counts(dates, scale, seed):
+    """
+    Draw the number of records per day: more entries on weekends, scaled
+    by the scale factor
+    """
+    rng = np.random.default_rng(np.random.SeedSequence([seed]))
+    weekend = dates.dayofweek >= 5
+    low = np.where(weekend, 2, 1) * scale
+    high = np.where(weekend, 6, 4) * scale
+    return rng.integers(low, high)
+
+def item_table(items):
+    """
+    Build the column arrays generate_block draws items from
     
-    for date in dates:
-        # Select a random item
-        item = random.choice(INVENTORY_ITEMS)
-        
-        # Generate quantity with some variation based on item category
-        base_quantity = np.random.uniform(0.5, 5.0)
-        if item["category"] in ["meat", "seafood"]:
-            quantity = base_quantity * 0.5  # Less waste for expensive items
-        elif item["category"] in ["produce", "bakery"]:
-            quantity = base_quantity * 1.5  # More waste for perishables
-        else:
-            quantity = base_quantity
+    Args:
+        items (list): Dicts with 'id', 'name', 'category', 'unit' and
+            'unit_cost'
             
-        # Round quantity to 1 decimal place
-        quantity = round(quantity, 1)
-        
-        # Calculate cost
-        cost = round(quantity * item["unit_cost"], 2)
+    Returns:
+        dict: One array per key, plus 'factor' (the category waste factor)
+    """
+    table = {key: np.array([item[key] for item in items])
+             for key in ("id", "name", "category", "unit", "unit_cost")}
+    table["factor"] = np.array([CATEGORY_FACTORS.get(category, 1.0) for category in table["category"]])
+    return table
+
+ITEM_TABLE = item_table(INVENTORY_ITEMS)
+
+def generate_block(date, n_rows, first_row, seed, day_index, block_index, items=None,
+                   weights=None, stream=None):
+    """
+    Generate n_rows waste records for one day from the block's own stream
+    
+    Args:
+        items (dict): Item columns from item_table (defaults to
+            INVENTORY_ITEMS)
+        weights (np.ndarray): Probability of drawing each item (defaults
+            to uniform)
+        stream (int): Extra seed word, so callers drawing other tables
+            from the same seed get independent streams
+    """
+    items = ITEM_TABLE if items is None else items
+    entropy = [seed, day_index, block_index] if stream is None else [seed, stream, day_index, block_index]
+    rng = np.random.default_rng(np.random.SeedSequence(entropy))
+    if weights is None:
+        item = rng.integers(len(items["id"]), size=n_rows)
+    else:
+        item = rng.choice(len(weights), size=n_rows, p=weights)
+    quantity = np.round(rng.uniform(0.5, 5.0, size=n_rows) * items["factor"][item], 1)
+    
+    return pd.DataFrame({
+        "waste_id": waste_ids(np.arange(first_row, first_row + n_rows), seed),
+        "date": np.full(n_rows, date.strftime("%Y-%m-%d")),
+        "item_id": items["id"][item],
+        "item_name": items["name"][item],
+        "quantity": quantity,
+        "unit": items["unit"][item],
+        "reason": np.array(REASONS)[rng.integers(len(REASONS), size=n_rows)],
+        "cost": np.round(quantity * items["unit_cost"][item], 2),
+        "category": items["category"][item],
+        "disposal_method": np.array(DISPOSAL_METHODS)[rng.integers(len(DISPOSAL_METHODS), size=n_rows)],
+        "responsible_staff": np.array(STAFF_MEMBERS)[rng.integers(len(STAFF_MEMBERS), size=n_rows)],
+        "location": np.array(LOCATIONS)[rng.integers(len(LOCATIONS), size=n_rows)]
+    }, columns=COLUMNS)
+
+def iter_waste_data(scale=1, seed=DEFAULT_SEED, end_date=None, days=DEFAULT_DAYS,
+                    chunk_rows=1_000_000):
+    """
+    Generate waste records in date order as DataFrame chunks
+    
+    The same seed, scale, end date and days always give the same rows,
+    whatever chunk_rows is.
+    
+    Args:
+        scale (int): Multiplies the records per day and the record cap
+            (scale 1 is about 230 rows)
+        seed (int): Random seed
+        end_date (str): Last day (defaults to today)
+        days (int): Days of history before end_date
+        chunk_rows (int): Approximate rows per yielded chunk
         
-        # Generate record
-        record = {
-            "waste_id": f"W{str(uuid.uuid4())[:8]}",
-            "date": date.strftime("%Y-%m-%d"),
-            "item_id": item["id"],
-            "item_name": item["name"],
-            "quantity": quantity,
-            "unit": item["unit"],
-            "reason": random.choice(REASONS),
-            "cost": cost,
-            "category": item["category"],
-            "disposal_method": random.choice(DISPOSAL_METHODS),
-            "responsible_staff": random.choice(STAFF_MEMBERS),
-            "location": random.choice(LOCATIONS)
-        }
-        data.append(record)
+    Yields:
+        pd.DataFrame: Waste records with COLUMNS
+    """
+    end = pd.Timestamp(end_date or datetime.now()).normalize()
+    dates = pd.date_range(end - timedelta(days=days), end, freq="D")
+    counts = daily_counts(dates, scale, seed)
+    
+    # Cap the total like the original NUM_RECORDS limit
+    limit = NUM_RECORDS * scale
+    first_rows = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    counts = np.clip(limit - first_rows, 0, counts)
     
-    return pd.DataFrame(data)
+    pending = []
+    pending_rows = 0
+    for day_index, (date, count, first_row) in enumerate(zip(dates, counts, first_rows)):
+        for block_index, start in enumerate(range(0, count, BLOCK_ROWS)):
+            n_rows = min(BLOCK_ROWS, count - start)
+            pending.append(generate_block(date, n_rows, first_row + start, seed,
+                                          day_index, block_index))
+            pending_rows += n_rows
+            if pending_rows >= chunk_rows:
+                yield pd.concat(pending, ignore_index=True)
+                pending = []
+                pending_rows = 0
+                
+    if pending:
+        yield pd.concat(pending, ignore_index=True)
+
+def generate_waste_data(scale=1, seed=DEFAULT_SEED, end_date=None, days=DEFAULT_DAYS):
+    """
+    Generate all waste records as one DataFrame (see iter_waste_data)
+    """
+    chunks = list(iter_waste_data(scale, seed, end_date, days))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=COLUMNS)
+
+def write_waste_data(output_path, chunks, output_format="csv"):
+    """
+    Stream chunks to a CSV or Parquet file, replacing it only once
+    complete
+    
+    Args:
+        output_path (str): Output file
+        chunks (iterable): DataFrames from iter_waste_data
+        output_format (str): 'csv' or 'parquet' (requires pyarrow)
+        
+    Returns:
+        dict: Rows written, date range and waste cost per category
+    """
+    stats = {"rows": 0, "first_date": None, "last_date": None, "cost_by_category": pd.Series(dtype=float)}
+    tmp_path = f"{output_path}.tmp"
+    writer = None
+    try:
+        for chunk in chunks:
+            if output_format == "parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(tmp_path, mode="a" if stats["rows"] else "w",
+                             header=not stats["rows"], index=False)
+            
+            stats["rows"] += len(chunk)
+            stats["first_date"] = stats["first_date"] or chunk["date"].iloc[0]
+            stats["last_date"] = chunk["date"].iloc[-1]
+            stats["cost_by_category"] = stats["cost_by_category"].add(
+                chunk.groupby("category")["cost"].sum(), fill_value=0)
+    finally:
+        if writer is not None:
+            writer.close()
+            
+    if stats["rows"]:
+        os.replace(tmp_path, output_path)
+    return stats
 
 def ensure_directory_exists(file_path):
     directory = os.path.dirname(file_path)
@@ -104,32 +237,44 @@ def ensure_directory_exists(file_path):
         print(f"Created directory: {directory}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic waste management records")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="scale factor (1 is about 230 rows; 36000 is about 10M)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--end-date", help="last day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--output", help="output file (default: public/files/waste_management_data.csv)")
+    args = parser.parse_args()
+    
     try:
-        # Generate the data
-        df = generate_waste_data()
-        
-        # Sort by date
-        df = df.sort_values('date')
-        
-        # Ensure the output directory exists
-        output_path = os.path.join(os.path.dirname(__file__), '..', 'public', 'files', 'waste_management_data.csv')
+        output_path = args.output or os.path.join(
+            os.path.dirname(__file__), '..', 'public', 'files', f'waste_management_data.{args.format}')
         ensure_directory_exists(output_path)
         
-        # Save to CSV
-        df.to_csv(output_path, index=False)
-        print(f"Generated {len(df)} waste management records and saved to {output_path}")
+        # Generate and save the data
+        start = time.perf_counter()
+        chunks = iter_waste_data(args.scale, args.seed, args.end_date, args.days, args.chunk_rows)
+        stats = write_waste_data(output_path, chunks, args.format)
+        elapsed = time.perf_counter() - start
+        print(f"Generated {stats['rows']} waste management records in {elapsed:.1f}s "
+              f"({stats['rows'] / elapsed:,.0f} rows/s) and saved to {output_path}")
         
         # Print some basic statistics
         print("\nBasic Statistics:")
-        print(f"Date Range: {df['date'].min()} to {df['date'].max()}")
-        print(f"Total Waste Cost: ${df['cost'].sum():.2f}")
+        print(f"Date Range: {stats['first_date']} to {stats['last_date']}")
+        print(f"Total Waste Cost: ${stats['cost_by_category'].sum():.2f}")
         print("\nWaste by Category:")
-        print(df.groupby('category')['cost'].sum().sort_values(ascending=False))
+        print(stats["cost_by_category"].sort_values(ascending=False))
         
+    except ImportError as e:
+        print(f"An error occurred: {str(e)}")
+        print("Parquet output requires pyarrow: pip install pyarrow")
     except Exception as e:
         print(f"An error occurred: {str(e)}")
         print("Please make sure you have the required packages installed (pandas and numpy)")
         print("You can install them using: pip install pandas numpy")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
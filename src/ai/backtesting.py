@@ -0,0 +1,285 @@
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+import argparse
+import hashlib
+import json
+import os
+import time
+from sales_forecasting import _fit_prophet
+from forecast_engines import NumpyEngine
+from benchmark_dataset import SCALE_FACTORS, load_sales_series
+
+DEFAULT_ENGINES = {
+    'prophet': ('prophet', {}),
+    'holt_winters': ('numpy', {'method': 'holt_winters'}),
+    'seasonal_naive': ('numpy', {'method': 'seasonal_naive'})
+}
+
+def rolling_origin_cutoffs(dates, initial_days, horizon_days, period_days):
+    """
+    Compute rolling-origin fold cutoffs
+    
+    Args:
+        dates (pd.Series): Dates covered by the series
+        initial_days (int): Minimum training history before the first cutoff
+        horizon_days (int): Days forecast after each cutoff
+        period_days (int): Spacing between consecutive cutoffs
+        
+    Returns:
+        list: Cutoff Timestamps, oldest first (training data is <= cutoff)
+    """
+    start = pd.Timestamp(dates.min()).normalize()
+    end = pd.Timestamp(dates.max()).normalize()
+    
+    cutoffs = []
+    cutoff = end - timedelta(days=horizon_days)
+    while cutoff >= start + timedelta(days=initial_days):
+        cutoffs.append(cutoff)
+        cutoff -= timedelta(days=period_days)
+        
+    return cutoffs[::-1]
+
+def _fit_predict(engine_name, engine_params, train, dates):
+    """
+    Fit one engine on one training series and predict the given dates
+    
+    Returns:
+        tuple: (predictions, fit seconds, predict seconds)
+    """
+    start = time.perf_counter()
+    if engine_name == 'prophet':
+        df = train.rename(columns={'date': 'ds', 'sales': 'y'})
+        model, _ = _fit_prophet(df, evaluate=False, **engine_params)
+        fit_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        model.uncertainty_samples = 0
+        yhat = model.predict(pd.DataFrame({'ds': dates}))['yhat'].to_numpy()
+    elif engine_name == 'numpy':
+        engine = NumpyEngine(**engine_params)
+        engine.fit_many({'item': train})
+        fit_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        yhat = engine.predict_matrix(dates)['yhat'][0]
+    else:
+        raise ValueError(f"Unknown engine {engine_name}")
+        
+    return yhat, fit_seconds, time.perf_counter() - start
+
+def _run_fold(engine_name, engine_params, train, dates, cache_path):
+    """
+    Run one (item, engine, cutoff) fold inside a worker process
+    
+    Returns:
+        dict: Fold predictions and timings, or an 'error' entry
+    """
+    start = time.perf_counter()
+    try:
+        yhat, fit_seconds, predict_seconds = _fit_predict(
+            engine_name, engine_params, train, dates
+        )
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+        
+    fold = {
+        'yhat': [float(value) for value in yhat],
+        'fit_seconds': fit_seconds,
+        'predict_seconds': predict_seconds,
+        'wall_seconds': time.perf_counter() - start
+    }
+    
+    if cache_path:
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(fold, f)
+        os.replace(tmp_path, cache_path)
+        
+    return fold
+
+class Backtester:
+    def __init__(self, engines=None, horizons=(7, 14, 28), initial_days=180,
+                 period_days=30, workers=None, cache_dir='backtests'):
+        """
+        Initialize the rolling-origin backtesting harness
+        
+        Every (item, engine, cutoff) fold is fit independently in a process
+        pool. Fitted folds are cached on disk keyed by the engine settings
+        and a hash of the training data, so re-running a backtest only
+        fits folds whose inputs changed.
+        
+        Args:
+            engines (dict): Engine specs keyed by label, each an
+                (engine name, parameters) tuple; defaults to Prophet and
+                the NumPy Holt-Winters/seasonal-naive engines
+            horizons (tuple): Forecast horizons in days to score
+            initial_days (int): Minimum training history for the first fold
+            period_days (int): Spacing between fold cutoffs
+            workers (int): Number of worker processes (defaults to CPU count)
+            cache_dir (str): Directory for cached folds (None disables caching)
+        """
+        self.engines = engines or DEFAULT_ENGINES
+        self.horizons = sorted(horizons)
+        self.initial_days = initial_days
+        self.period_days = period_days
+        self.workers = workers
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.folds = None
+        
+    def _cache_path(self, item_name, label, train, dates):
+        if not self.cache_dir:
+            return None
+            
+        engine_name, engine_params = self.engines[label]
+        key = hashlib.sha256()
+        key.update(json.dumps([item_name, engine_name, engine_params], sort_keys=True).encode())
+        key.update(pd.util.hash_pandas_object(train, index=False).to_numpy().tobytes())
+        key.update(dates.asi8.tobytes())
+        return os.path.join(self.cache_dir, f"{key.hexdigest()}.json")
+        
+    def run(self, series_by_item):
+        """
+        Backtest every engine on every item
+        
+        Args:
+            series_by_item (dict): DataFrames with 'date' and 'sales'
+                columns keyed by item name
+                
+        Returns:
+            pd.DataFrame: Metrics per item, engine and horizon (MAE, RMSE,
+                number of folds and mean fit seconds); per-fold timings
+                are kept in self.folds
+        """
+        max_horizon = self.horizons[-1]
+        jobs = []
+        for item_name, sales_data in series_by_item.items():
+            df = sales_data.copy()
+            df.columns = ['date', 'sales']
+            df['date'] = pd.to_datetime(df['date']).dt.normalize()
+            df = df.sort_values('date').reset_index(drop=True)
+            actual = df.groupby('date')['sales'].sum()
+            
+            for cutoff in rolling_origin_cutoffs(df['date'], self.initial_days,
+                                                 max_horizon, self.period_days):
+                train = df[df['date'] <= cutoff]
+                dates = pd.date_range(cutoff + timedelta(days=1), periods=max_horizon, freq='D')
+                y_true = actual.reindex(dates, fill_value=0).to_numpy()
+                for label in self.engines:
+                    jobs.append((item_name, label, cutoff, train, dates, y_true))
+                    
+        fold_rows = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {}
+            for job in jobs:
+                item_name, label, cutoff, train, dates, y_true = job
+                cache_path = self._cache_path(item_name, label, train, dates)
+                if cache_path and os.path.exists(cache_path):
+                    with open(cache_path, 'r') as f:
+                        fold_rows.append(self._fold_row(job, json.load(f), cached=True))
+                    continue
+                    
+                engine_name, engine_params = self.engines[label]
+                future = executor.submit(
+                    _run_fold, engine_name, engine_params, train, dates, cache_path
+                )
+                futures[future] = job
+                
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    fold = future.result()
+                except Exception as e:
+                    fold = {'error': f"{type(e).__name__}: {e}"}
+                fold_rows.append(self._fold_row(job, fold, cached=False))
+                
+        self.folds = pd.DataFrame(fold_rows)
+        return self._summarize()
+        
+    def _fold_row(self, job, fold, cached):
+        item_name, label, cutoff, _, _, y_true = job
+        row = {
+            'item_name': item_name,
+            'engine': label,
+            'cutoff': cutoff,
+            'cached': cached,
+            'fit_seconds': fold.get('fit_seconds'),
+            'predict_seconds': fold.get('predict_seconds'),
+            'wall_seconds': fold.get('wall_seconds'),
+            'error': fold.get('error')
+        }
+        
+        if 'yhat' in fold:
+            errors = np.asarray(fold['yhat']) - y_true
+            for horizon in self.horizons:
+                row[f"abs_error_{horizon}"] = np.abs(errors[:horizon]).mean()
+                row[f"sq_error_{horizon}"] = (errors[:horizon] ** 2).mean()
+                
+        return row
+        
+    def _summarize(self):
+        folds = self.folds
+        if folds.empty:
+            return pd.DataFrame()
+        folds = folds[folds['error'].isna()]
+        
+        rows = []
+        for (item_name, label), group in folds.groupby(['item_name', 'engine']):
+            for horizon in self.horizons:
+                rows.append({
+                    'item_name': item_name,
+                    'engine': label,
+                    'horizon': horizon,
+                    'mae': group[f"abs_error_{horizon}"].mean(),
+                    'rmse': np.sqrt(group[f"sq_error_{horizon}"].mean()),
+                    'folds': len(group),
+                    'mean_fit_seconds': group['fit_seconds'].mean()
+                })
+                
+        return pd.DataFrame(rows)
+        
+    def export_results(self, metrics, output_path='backtest_metrics.csv',
+                       folds_path='backtest_folds.csv'):
+        """
+        Export the metrics table and per-fold timings to CSV
+        
+        Args:
+            metrics (pd.DataFrame): Output of run()
+            output_path (str): Path to save the metrics table
+            folds_path (str): Path to save the per-fold timings
+        """
+        metrics.to_csv(output_path, index=False)
+        columns = ['item_name', 'engine', 'cutoff', 'cached',
+                   'fit_seconds', 'predict_seconds', 'wall_seconds', 'error']
+        self.folds[columns].to_csv(folds_path, index=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the forecasting engines")
+    parser.add_argument('--scale', default='SF1', choices=sorted(SCALE_FACTORS),
+                        help="benchmark dataset scale factor")
+    parser.add_argument('--items', type=int, default=4,
+                        help="number of best-selling items to backtest")
+    args = parser.parse_args()
+    
+    try:
+        series_by_item = load_sales_series(args.scale)
+        top_items = sorted(series_by_item, key=lambda item: -series_by_item[item]['sales'].sum())
+        series_by_item = {item: series_by_item[item] for item in top_items[:args.items]}
+        
+        backtester = Backtester(horizons=(7, 14, 28))
+        start = time.perf_counter()
+        metrics = backtester.run(series_by_item)
+        print(f"Backtested {len(backtester.folds)} folds in "
+              f"{time.perf_counter() - start:.1f}s")
+        print(metrics.groupby(['engine', 'horizon'])[['mae', 'rmse']].mean())
+        
+        backtester.export_results(metrics)
+        
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
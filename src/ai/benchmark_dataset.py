@@ -0,0 +1,506 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# The waste log rows come from the same generator as the standalone
+# waste data script
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts')
+if SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
+from generate_waste_data import BLOCK_ROWS, COLUMNS as WASTE_COLUMNS, generate_block, item_table
+from sales_ingestion import SalesIngestor
+from waste_ingestion import WasteIngestor, load_inventory_attributes
+
+SCALE_FACTORS = {'SF1': 1, 'SF10': 10, 'SF100': 100}
+
+# Table sizes at SF1; every table grows linearly with the scale factor
+BASE_ROWS = {
+    'ingredients': 200,
+    'recipes': 100,
+    'sales': 100_000,
+    'waste': 10_000
+}
+
+DATASET_FILES = {
+    'sales': 'sales_data.csv',
+    'waste': 'waste_management_data.csv',
+    'restaurant_inventory': 'restaurant_inventory_data.csv',
+    'indian_inventory': 'indian_restaurant_inventory.csv',
+    'recipes': 'recipes.json',
+    'costs': 'costs.json'
+}
+
+INGREDIENT_TYPES = [
+    # name, category, unit, cost per unit, shelf life in days
+    ('Tomato', 'vegetables', 'kg', 40.0, 7),
+    ('Onion', 'vegetables', 'kg', 30.0, 30),
+    ('Potato', 'vegetables', 'kg', 25.0, 45),
+    ('Spinach', 'vegetables', 'kg', 60.0, 4),
+    ('Paneer', 'dairy', 'kg', 350.0, 7),
+    ('Milk', 'dairy', 'L', 60.0, 3),
+    ('Butter', 'dairy', 'kg', 500.0, 60),
+    ('Curd', 'dairy', 'kg', 80.0, 5),
+    ('Chicken', 'meat', 'kg', 250.0, 3),
+    ('Mutton', 'meat', 'kg', 700.0, 3),
+    ('Fish', 'seafood', 'kg', 450.0, 2),
+    ('Basmati Rice', 'grains', 'kg', 120.0, 365),
+    ('Wheat Flour', 'grains', 'kg', 45.0, 180),
+    ('Bread', 'bakery', 'units', 5.0, 4),
+    ('Mustard Oil', 'oils', 'L', 180.0, 365),
+    ('Garam Masala', 'spices', 'kg', 900.0, 365),
+    ('Turmeric', 'spices', 'kg', 300.0, 365),
+    ('Sugar', 'staples', 'kg', 45.0, 730),
+    ('Tea Leaves', 'beverages', 'kg', 500.0, 365),
+    ('Coffee Beans', 'beverages', 'kg', 900.0, 180)
+]
+
+RECIPE_TYPES = [
+    # name, sales item type, typical price
+    ('Vadapav', 'Fastfood', 20.0),
+    ('Panipuri', 'Fastfood', 20.0),
+    ('Aalopuri', 'Fastfood', 20.0),
+    ('Sandwich', 'Fastfood', 60.0),
+    ('Frankie', 'Fastfood', 50.0),
+    ('Paneer Tikka', 'Main Course', 220.0),
+    ('Chicken Biryani', 'Main Course', 280.0),
+    ('Fish Curry', 'Main Course', 320.0),
+    ('Dal Rice', 'Main Course', 150.0),
+    ('Cold coffee', 'Beverages', 40.0),
+    ('Masala Chai', 'Beverages', 20.0),
+    ('Sugarcane juice', 'Beverages', 25.0)
+]
+
+TIMES_OF_SALE = ['Morning', 'Afternoon', 'Evening', 'Night', 'Midnight']
+TRANSACTION_TYPES = ['Cash', 'Online', '']
+
+# Stream ids, so every table (and every day of the logs) draws from its
+# own stream
+STREAMS = {'ingredients': 0, 'recipes': 1, 'sales': 2, 'waste': 3, 'inventory': 4}
+
+def _variant_names(base_names, n):
+    """
+    Name n entities after the base names, adding a letter suffix from the
+    second round on ('Tomato', ..., 'Tomato B', ...), so names stay unique
+    and survive waste_ingestion.normalize_item_name
+    """
+    names = []
+    for i in range(n):
+        round_index = i // len(base_names)
+        suffix = ''
+        while round_index:
+            suffix = chr(ord('A') + round_index % 26) + suffix
+            round_index //= 26
+        names.append(f"{base_names[i % len(base_names)]} {suffix}".strip())
+    return names
+
+def _rng(seed, stream, day=0):
+    return np.random.default_rng(np.random.SeedSequence([seed, STREAMS[stream], day]))
+
+def build_ingredients(scale, seed):
+    """
+    Build the ingredient master table
+    
+    Returns:
+        pd.DataFrame: 'ingredient_id', 'name', 'category', 'unit',
+            'cost_per_unit' and 'shelf_life_days'
+    """
+    n = BASE_ROWS['ingredients'] * scale
+    rng = _rng(seed, 'ingredients')
+    kind = np.arange(n) % len(INGREDIENT_TYPES)
+    types = pd.DataFrame(INGREDIENT_TYPES, columns=['name', 'category', 'unit', 'cost', 'shelf_life'])
+    return pd.DataFrame({
+        'ingredient_id': [f"INV{i + 1:06d}" for i in range(n)],
+        'name': _variant_names(types['name'].tolist(), n),
+        'category': types['category'].to_numpy()[kind],
+        'unit': types['unit'].to_numpy()[kind],
+        'cost_per_unit': np.round(types['cost'].to_numpy()[kind] * rng.uniform(0.8, 1.25, n), 2),
+        'shelf_life_days': np.maximum(
+            np.round(types['shelf_life'].to_numpy()[kind] * rng.uniform(0.8, 1.2, n)), 1
+        ).astype(int)
+    })
+
+def build_recipes(ingredients, scale, seed):
+    """
+    Build recipes over the ingredients, with popularity weights and
+    amounts per serving
+    
+    Returns:
+        tuple: (recipes DataFrame with 'recipe_id', 'name', 'item_type',
+            'price', 'popularity' and 'overhead_percentage'; usage
+            DataFrame with 'recipe_id', 'ingredient_id' and 'amount')
+    """
+    n = BASE_ROWS['recipes'] * scale
+    rng = _rng(seed, 'recipes')
+    kind = np.arange(n) % len(RECIPE_TYPES)
+    types = pd.DataFrame(RECIPE_TYPES, columns=['name', 'item_type', 'price'])
+    popularity = rng.zipf(1.6, n).astype(float)
+    recipes = pd.DataFrame({
+        'recipe_id': [f"recipe_{i + 1:06d}" for i in range(n)],
+        'name': _variant_names(types['name'].tolist(), n),
+        'item_type': types['item_type'].to_numpy()[kind],
+        'price': np.round(types['price'].to_numpy()[kind] * rng.uniform(0.9, 1.3, n)),
+        'popularity': popularity / popularity.sum(),
+        'overhead_percentage': np.round(rng.uniform(0.15, 0.3, n), 2)
+    })
+    
+    # 3-8 distinct ingredients per recipe, amounts sized to the price
+    n_ingredients = rng.integers(3, 9, n)
+    recipe_index = np.repeat(np.arange(n), n_ingredients)
+    ingredient_index = np.concatenate([
+        rng.choice(len(ingredients), size=k, replace=False) for k in n_ingredients
+    ])
+    unit_cost = ingredients['cost_per_unit'].to_numpy()[ingredient_index]
+    target_cost = recipes['price'].to_numpy()[recipe_index] * rng.uniform(0.05, 0.15, len(recipe_index))
+    usage = pd.DataFrame({
+        'recipe_id': recipes['recipe_id'].to_numpy()[recipe_index],
+        'ingredient_id': ingredients['ingredient_id'].to_numpy()[ingredient_index],
+        'amount': np.round(target_cost / unit_cost, 3).clip(0.001)
+    })
+    return recipes, usage
+
+def _day_partitions(days, n_partitions):
+    """
+    Split the days into contiguous ranges, one per partition
+    """
+    bounds = np.linspace(0, days, n_partitions + 1).round().astype(int)
+    return [(int(bounds[p]), int(bounds[p + 1]))
+            for p in range(n_partitions) if bounds[p + 1] > bounds[p]]
+
+def _draw_days(stream, seed, first_day, last_day, row_bounds, draw):
+    """
+    Draw a day range of log rows, each day from its own stream so the
+    rows do not depend on how the days are partitioned
+    
+    Args:
+        draw (callable): Takes (rng, n_rows) and returns a dict of arrays
+        
+    Returns:
+        dict: Concatenated arrays plus 'day' (day index per row)
+    """
+    columns = {}
+    for day in range(first_day, last_day):
+        n_rows = int(row_bounds[day + 1] - row_bounds[day])
+        drawn = draw(_rng(seed, stream, day), n_rows)
+        drawn['day'] = np.full(n_rows, day)
+        for key, values in drawn.items():
+            columns.setdefault(key, []).append(values)
+    return {key: np.concatenate(values) for key, values in columns.items()}
+
+def _day_labels(start, n_days, date_format):
+    """Format each day once instead of every row"""
+    return pd.date_range(start, periods=n_days, freq='D').strftime(date_format).to_numpy()
+
+def generate_sales_partition(recipes, start, first_day, last_day, row_bounds, seed, path):
+    """
+    Write one day range of sales transactions in the sales_data.csv layout
+    """
+    popularity = recipes['popularity'].to_numpy()
+    drawn = _draw_days('sales', seed, first_day, last_day, row_bounds, lambda rng, n: {
+        'recipe': rng.choice(len(popularity), size=n, p=popularity),
+        'quantity': rng.integers(1, 16, n),
+        'transaction_type': rng.integers(0, len(TRANSACTION_TYPES), n),
+        'received_by': rng.random(n),
+        'time_of_sale': rng.integers(0, len(TIMES_OF_SALE), n)
+    })
+    recipe = drawn['recipe']
+    price = recipes['price'].to_numpy()[recipe]
+    first_row = int(row_bounds[first_day])
+    frame = pd.DataFrame({
+        'order_id': np.arange(first_row + 1, first_row + len(recipe) + 1),
+        'date': _day_labels(start, last_day, '%m-%d-%Y')[drawn['day']],
+        'item_name': recipes['name'].to_numpy()[recipe],
+        'item_type': recipes['item_type'].to_numpy()[recipe],
+        'item_price': price,
+        'quantity': drawn['quantity'],
+        'transaction_amount': price * drawn['quantity'],
+        'transaction_type': np.array(TRANSACTION_TYPES)[drawn['transaction_type']],
+        'received_by': np.where(drawn['received_by'] < 0.5, 'Mr.', 'Mrs.'),
+        'time_of_sale': np.array(TIMES_OF_SALE)[drawn['time_of_sale']]
+    })
+    frame.to_csv(path, index=False)
+    return len(frame)
+
+def generate_waste_partition(ingredients, start, first_day, last_day, row_bounds, seed, path):
+    """
+    Write one day range of waste events in the waste_management_data.csv
+    layout; short shelf-life ingredients are wasted more often
+    """
+    items = item_table(ingredients.rename(columns={'ingredient_id': 'id', 'cost_per_unit': 'unit_cost'})
+                                  .to_dict('records'))
+    weight = 1 / ingredients['shelf_life_days'].to_numpy()
+    weight = weight / weight.sum()
+    dates = pd.date_range(start, periods=last_day, freq='D')
+    
+    blocks = []
+    for day in range(first_day, last_day):
+        first_row, last_row = int(row_bounds[day]), int(row_bounds[day + 1])
+        for block_index, block_start in enumerate(range(first_row, last_row, BLOCK_ROWS)):
+            blocks.append(generate_block(
+                dates[day], min(BLOCK_ROWS, last_row - block_start), block_start, seed,
+                day, block_index, items=items, weights=weight, stream=STREAMS['waste']
+            ))
+    frame = pd.concat(blocks, ignore_index=True) if blocks else pd.DataFrame(columns=WASTE_COLUMNS)
+    frame.to_csv(path, index=False)
+    return len(frame)
+
+def _concat_csv(part_paths, output_path):
+    """
+    Concatenate partition CSVs, keeping only the first header
+    """
+    with open(output_path, 'wb') as out:
+        for i, part_path in enumerate(part_paths):
+            with open(part_path, 'rb') as part:
+                if i:
+                    part.readline()
+                shutil.copyfileobj(part, out)
+            os.remove(part_path)
+
+def build_inventory(ingredients, recipes, usage, daily_orders, end_date, seed):
+    """
+    Build inventory snapshots consistent with the sales volume: usage
+    counts are the expected 30-day ingredient usage implied by the recipe
+    popularity
+    
+    Returns:
+        tuple: (restaurant_inventory_data.csv frame,
+            indian_restaurant_inventory.csv frame)
+    """
+    rng = _rng(seed, 'inventory')
+    # Expected servings per day: orders x mean quantity (8) x popularity
+    servings = recipes.set_index('recipe_id')['popularity'] * daily_orders * 8
+    daily_usage = (usage.assign(daily=usage['amount'] * usage['recipe_id'].map(servings).to_numpy())
+                        .groupby('ingredient_id')['daily'].sum()
+                        .reindex(ingredients['ingredient_id'], fill_value=0)
+                        .to_numpy())
+    stock = np.round(daily_usage * rng.uniform(0.5, 10, len(ingredients)), 1)
+    threshold = np.round(daily_usage * 3, 1)
+    
+    restaurant = pd.DataFrame({
+        'Item': ingredients['name'],
+        'Category': ingredients['category'].str.title(),
+        'Current_Stock': stock,
+        'Threshold': threshold,
+        'Expiration_Days': ingredients['shelf_life_days'],
+        'Usage_Count': np.round(daily_usage * 30).astype(int),
+        'Stock_Alert_Color': np.where(stock < threshold, 'Red', 'Green'),
+        'Expiration_Alert_Color': np.where(ingredients['shelf_life_days'] < 5, 'Red', 'Green'),
+        'Reorder_Quantity': np.round(np.maximum(threshold * 2 - stock, 0), 1)
+    })
+    days_left = np.minimum(rng.integers(0, ingredients['shelf_life_days'].to_numpy() + 1), 365)
+    indian = pd.DataFrame({
+        'Name': ingredients['name'],
+        'Quantity': stock,
+        'Unit': ingredients['unit'],
+        'Expiration Date': (pd.Timestamp(end_date) + pd.to_timedelta(days_left, unit='D')).strftime('%Y-%m-%d'),
+        'Category': ingredients['category'],
+        'Min Quantity': threshold,
+        'Cost': np.round(stock * ingredients['cost_per_unit'], 2)
+    })
+    return restaurant, indian
+
+def build_menu_files(ingredients, recipes, usage, daily_orders):
+    """
+    Build the recipes.json and costs.json inputs of menu.cost_optimization
+    """
+    names = ingredients.set_index('ingredient_id')['name']
+    amounts = usage.assign(name=usage['ingredient_id'].map(names))
+    ingredients_by_recipe = {
+        recipe_id: dict(zip(group['name'], group['amount'].astype(float)))
+        for recipe_id, group in amounts.groupby('recipe_id')
+    }
+    recipe_json = {
+        row.recipe_id: {
+            'name': row.name,
+            'ingredients': ingredients_by_recipe.get(row.recipe_id, {}),
+            'current_price': float(row.price),
+            'expected_sales': round(float(row.popularity * daily_orders * 8), 2),
+            'overhead_percentage': float(row.overhead_percentage)
+        }
+        for row in recipes.itertuples(index=False)
+    }
+    cost_json = {
+        row.name: {'cost_per_unit': float(row.cost_per_unit), 'unit': row.unit,
+                   'category': row.category}
+        for row in ingredients.itertuples(index=False)
+    }
+    return recipe_json, cost_json
+
+def build_benchmark_dataset(scale='SF1', output_dir='benchmark_data', seed=42, days=365,
+                            end_date='2025-03-31', workers=None, partitions=None):
+    """
+    Build a mutually consistent benchmark dataset at a TPC-style scale
+    factor
+    
+    Sales sell the recipes, recipes use the ingredients, waste events and
+    inventory snapshots refer to the same ingredients and unit costs, and
+    inventory usage matches the sales volume. Files use the layouts of
+    the files in public/files (plus the menu optimizer's JSON inputs), so
+    existing loaders read them unchanged. Sales and waste are generated
+    in day-range partitions in parallel; every day has its own random
+    stream, so the same seed and scale give the same files whatever the
+    partition and worker counts.
+    
+    Args:
+        scale (str): 'SF1', 'SF10' or 'SF100' (or an integer factor)
+        output_dir (str): Root directory; files go to output_dir/<scale>
+        seed (int): Random seed
+        days (int): Days of sales and waste history
+        end_date (str): Last day of history
+        workers (int): Worker processes (defaults to the CPU count)
+        partitions (int): Partitions per table (defaults to 4 per SF1
+            unit, at most days)
+            
+    Returns:
+        dict: Manifest with the scale, seed, row counts, file paths and
+            generation time
+    """
+    factor = SCALE_FACTORS[scale] if isinstance(scale, str) else int(scale)
+    name = scale if isinstance(scale, str) else f"SF{factor}"
+    dataset_dir = os.path.join(output_dir, name.lower())
+    os.makedirs(dataset_dir, exist_ok=True)
+    partitions = min(partitions or 4 * factor, days)
+    start_time = time.perf_counter()
+    
+    end = pd.Timestamp(end_date)
+    start = end - pd.Timedelta(days=days - 1)
+    ingredients = build_ingredients(factor, seed)
+    recipes, usage = build_recipes(ingredients, factor, seed)
+    n_sales = BASE_ROWS['sales'] * factor
+    n_waste = BASE_ROWS['waste'] * factor
+    
+    paths = {key: os.path.join(dataset_dir, file_name) for key, file_name in DATASET_FILES.items()}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        jobs = {}
+        for table, n_rows, function, master in (
+            ('sales', n_sales, generate_sales_partition, recipes),
+            ('waste', n_waste, generate_waste_partition, ingredients)
+        ):
+            # Day d holds rows row_bounds[d] to row_bounds[d + 1]
+            row_bounds = np.round(np.arange(days + 1) / days * n_rows).astype(np.int64)
+            jobs[table] = []
+            for p, (first_day, last_day) in enumerate(_day_partitions(days, partitions)):
+                part_path = f"{paths[table]}.part{p:05d}"
+                jobs[table].append((part_path, executor.submit(
+                    function, master, start, first_day, last_day, row_bounds, seed, part_path)))
+                    
+        rows = {table: sum(future.result() for _, future in table_jobs)
+                for table, table_jobs in jobs.items()}
+    for table, table_jobs in jobs.items():
+        _concat_csv([part_path for part_path, _ in table_jobs], paths[table])
+        
+    daily_orders = n_sales / days
+    restaurant, indian = build_inventory(ingredients, recipes, usage, daily_orders, end, seed)
+    restaurant.to_csv(paths['restaurant_inventory'], index=False)
+    indian.to_csv(paths['indian_inventory'], index=False)
+    recipe_json, cost_json = build_menu_files(ingredients, recipes, usage, daily_orders)
+    with open(paths['recipes'], 'w') as f:
+        json.dump(recipe_json, f)
+    with open(paths['costs'], 'w') as f:
+        json.dump(cost_json, f)
+        
+    manifest = {
+        'scale': name,
+        'seed': seed,
+        'days': days,
+        'end_date': end.strftime('%Y-%m-%d'),
+        'rows': {**rows, 'ingredients': len(ingredients), 'recipes': len(recipes)},
+        'files': paths,
+        'generation_seconds': time.perf_counter() - start_time
+    }
+    with open(os.path.join(dataset_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def load_benchmark_dataset(scale='SF1', output_dir='benchmark_data', seed=42, **kwargs):
+    """
+    Get a benchmark dataset, building it only when it is missing or was
+    built with different settings
+    
+    Args:
+        scale (str): 'SF1', 'SF10' or 'SF100'
+        output_dir (str): Root directory of the datasets
+        seed (int): Random seed
+        **kwargs: Further build_benchmark_dataset arguments
+        
+    Returns:
+        dict: Manifest; manifest['files'] maps 'sales', 'waste',
+            'restaurant_inventory', 'indian_inventory', 'recipes' and
+            'costs' to file paths
+    """
+    name = scale if isinstance(scale, str) else f"SF{int(scale)}"
+    manifest_path = os.path.join(output_dir, name.lower(), 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        settings = {'seed': seed, 'days': kwargs.get('days', 365),
+                    'end_date': kwargs.get('end_date', '2025-03-31')}
+        if all(manifest.get(key) == value for key, value in settings.items()) \
+                and all(os.path.exists(path) for path in manifest['files'].values()):
+            return manifest
+            
+    return build_benchmark_dataset(scale, output_dir, seed, **kwargs)
+
+def load_sales_series(scale='SF1', output_dir='benchmark_data', seed=42, value='quantity',
+                      **kwargs):
+    """
+    Get a benchmark dataset's daily per-item sales series
+    
+    Args:
+        scale (str): 'SF1', 'SF10' or 'SF100'
+        output_dir (str): Root directory of the datasets
+        seed (int): Random seed
+        value (str): 'quantity' or 'revenue'
+        **kwargs: Further build_benchmark_dataset arguments
+        
+    Returns:
+        dict: DataFrames with 'date' and 'sales' columns keyed by item,
+            as expected by SalesForecaster and Backtester
+    """
+    sales_path = load_benchmark_dataset(scale, output_dir, seed, **kwargs)['files']['sales']
+    ingestor = SalesIngestor(cache_dir=os.path.join(os.path.dirname(sales_path), 'cache'))
+    return ingestor.series_by_item(ingestor.load_daily(sales_path), value)
+
+def load_waste_history(scale='SF1', output_dir='benchmark_data', seed=42, **kwargs):
+    """
+    Get a benchmark dataset's waste log as daily per-item training rows
+    
+    Args:
+        scale (str): 'SF1', 'SF10' or 'SF100'
+        output_dir (str): Root directory of the datasets
+        seed (int): Random seed
+        **kwargs: Further build_benchmark_dataset arguments
+        
+    Returns:
+        pd.DataFrame: WastePredictor training rows joined to the
+            dataset's inventory attributes
+    """
+    files = load_benchmark_dataset(scale, output_dir, seed, **kwargs)['files']
+    ingestor = WasteIngestor()
+    ingestor.update_from_csv(files['waste'])
+    inventory = load_inventory_attributes(files['indian_inventory'],
+                                          files['restaurant_inventory'])
+    return ingestor.training_frame(inventory)
+
+def main():
+    # Example usage
+    try:
+        manifest = load_benchmark_dataset('SF1')
+        print(f"{manifest['scale']}: {manifest['rows']} "
+              f"({manifest['generation_seconds']:.1f}s)")
+        
+        # The files load with the existing ingestion code
+        series_by_item = load_sales_series('SF1')
+        training = load_waste_history('SF1')
+        print(f"Read {len(series_by_item)} sales series and built {len(training)} "
+              f"waste training rows")
+        
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
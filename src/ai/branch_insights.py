@@ -0,0 +1,267 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from generate_insights import (
+    SECTION_FILES, get_client, generate_insights, combine_insights,
+    load_json_data, write_json_atomic
+)
+from insight_cache import InsightCache
+
+class RateLimiter:
+    def __init__(self, rate, burst=1):
+        """
+        Initialize a thread-safe token bucket
+        
+        Args:
+            rate (float): Tokens added per second
+            burst (int): Bucket capacity (requests allowed back to back)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        
+    def acquire(self):
+        """
+        Block until a token is available and take it
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class LimitedClient:
+    def __init__(self, client, limiter=None, max_concurrency=8):
+        """
+        Wrap an LLM client so every call goes through a shared rate limit
+        and concurrency limit, and record each call's outcome
+        
+        generate_text() starts a call's deadline only once limit() is
+        entered, so time spent waiting for the limits does not count
+        against it. The slot is held until the call returns, so calls
+        abandoned after their deadline still count as in flight.
+        
+        Args:
+            client: Object with a generate(prompt, timeout) method
+            limiter (RateLimiter): Shared request-rate limit (None for no
+                rate limit)
+            max_concurrency (int): Maximum calls in flight
+        """
+        self.client = client
+        self.model_name = client.model_name
+        self.limiter = limiter
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+        
+    @contextmanager
+    def limit(self):
+        with self.semaphore:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            yield
+            
+    def generate(self, prompt, timeout):
+        start = time.perf_counter()
+        try:
+            text = self.client.generate(prompt, timeout)
+        except Exception:
+            with self.lock:
+                self.errors += 1
+            raise
+        with self.lock:
+            self.latencies.append(time.perf_counter() - start)
+        return text
+
+def _percentiles(values, percentiles=(50, 95, 99)):
+    if not values:
+        return {f'p{p}': None for p in percentiles}
+    return {f'p{p}': float(np.percentile(values, p)) for p in percentiles}
+
+def find_branches(input_dir):
+    """
+    List the branch directories holding at least one section's data file
+    
+    Args:
+        input_dir (str): Directory with one subdirectory per branch
+        
+    Returns:
+        list: Branch names, sorted
+    """
+    return sorted(
+        name for name in os.listdir(input_dir)
+        if os.path.isdir(os.path.join(input_dir, name))
+        and any(os.path.exists(os.path.join(input_dir, name, file_name))
+                for file_name in SECTION_FILES.values())
+    )
+
+def generate_branch_insights(input_dir, output_dir=None, client=None, requests_per_second=5.0,
+                             burst=5, max_concurrency=8, branch_workers=16, timeout=20.0,
+                             retries=2, batch=False, cache=None):
+    """
+    Generate insights for every branch concurrently under one shared
+    request-rate and concurrency limit
+    
+    Each branch directory holds the dashboard files used by
+    generate_insights.main (sales_forecast.json, waste_prediction.json,
+    inventory_optimization.json); its combined_insights.json is written
+    to the branch's directory under output_dir.
+    
+    Args:
+        input_dir (str): Directory with one subdirectory per branch
+        output_dir (str): Output root (defaults to input_dir)
+        client: LLM client (defaults to get_client())
+        requests_per_second (float): Request rate across all branches
+            (None for no rate limit)
+        burst (int): Requests allowed back to back
+        max_concurrency (int): LLM calls in flight across all branches
+        branch_workers (int): Branches processed at once
+        timeout (float): Deadline in seconds for each call
+        retries (int): Retries after the first attempt
+        batch (bool): One structured request per branch
+        cache (InsightCache): Shared insight cache
+        
+    Returns:
+        dict: Run report with throughput, latency percentiles and error
+            counts ('failed_branches' maps branch to error)
+    """
+    output_dir = output_dir or input_dir
+    limiter = RateLimiter(requests_per_second, burst) if requests_per_second else None
+    limited = LimitedClient(client or get_client(), limiter, max_concurrency)
+    branches = find_branches(input_dir)
+    
+    def run_branch(branch):
+        start = time.perf_counter()
+        sections_data = {
+            section: load_json_data(os.path.join(input_dir, branch, file_name))
+            for section, file_name in SECTION_FILES.items()
+            if os.path.exists(os.path.join(input_dir, branch, file_name))
+        }
+        analyses = generate_insights(sections_data, client=limited, timeout=timeout,
+                                     retries=retries, batch=batch, cache=cache)
+        branch_dir = os.path.join(output_dir, branch)
+        os.makedirs(branch_dir, exist_ok=True)
+        write_json_atomic(combine_insights(sections_data, analyses),
+                          os.path.join(branch_dir, 'combined_insights.json'))
+        return time.perf_counter() - start
+        
+    start = time.perf_counter()
+    branch_seconds = []
+    failed_branches = {}
+    with ThreadPoolExecutor(max_workers=max(min(branch_workers, len(branches)), 1)) as executor:
+        futures = {branch: executor.submit(run_branch, branch) for branch in branches}
+        for branch, future in futures.items():
+            try:
+                branch_seconds.append(future.result())
+            except Exception as e:
+                failed_branches[branch] = f"{type(e).__name__}: {str(e)}"
+    elapsed = time.perf_counter() - start
+    
+    completed = len(branch_seconds)
+    return {
+        'branches': len(branches),
+        'completed': completed,
+        'failed_branches': failed_branches,
+        'llm_calls': len(limited.latencies) + limited.errors,
+        'llm_errors': limited.errors,
+        'elapsed_seconds': elapsed,
+        'branches_per_second': completed / elapsed if elapsed else 0.0,
+        'calls_per_second': (len(limited.latencies) + limited.errors) / elapsed if elapsed else 0.0,
+        'call_latency_seconds': _percentiles(limited.latencies),
+        'branch_latency_seconds': _percentiles(branch_seconds)
+    }
+
+def make_demo_branches(data_dir, n_branches, output_dir=None):
+    """
+    Create per-branch inputs by copying one set of dashboard files with a
+    different trend percentage per branch, so every branch needs its own
+    insights
+    
+    Args:
+        data_dir (str): Directory with the dashboard JSON files
+        n_branches (int): Number of branches
+        output_dir (str): Directory to create the branches in (defaults
+            to a new temporary directory)
+            
+    Returns:
+        str: Directory with one subdirectory per branch
+    """
+    output_dir = output_dir or tempfile.mkdtemp(prefix='branches_')
+    for i in range(n_branches):
+        branch_dir = os.path.join(output_dir, f'branch_{i:03d}')
+        os.makedirs(branch_dir, exist_ok=True)
+        for file_name in SECTION_FILES.values():
+            data = load_json_data(os.path.join(data_dir, file_name))
+            data['trendPercentage'] = i % 20 + 1
+            with open(os.path.join(branch_dir, file_name), 'w') as f:
+                json.dump(data, f, indent=2)
+    return output_dir
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate AI insights for every branch")
+    parser.add_argument('input_dir', nargs='?',
+                        help="directory with one subdirectory of dashboard files per branch")
+    parser.add_argument('--output-dir', help="output root (default: input_dir)")
+    parser.add_argument('--rate', type=float, default=5.0, help="LLM requests per second")
+    parser.add_argument('--concurrency', type=int, default=8, help="LLM calls in flight")
+    parser.add_argument('--timeout', type=float, default=20.0)
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--batch', action='store_true')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--demo', type=int, metavar='N',
+                        help="generate N demo branches from ../data against the stand-in "
+                             "LLM server")
+    args = parser.parse_args()
+    
+    client = None
+    server = None
+    try:
+        input_dir = args.input_dir
+        if args.demo:
+            from generate_insights import HttpLLMClient
+            from local_llm_server import start_server
+            server, url = start_server(latency=0.3, jitter=0.1, failure_rate=0.05)
+            client = HttpLLMClient(url)
+            input_dir = make_demo_branches('../data', args.demo)
+        if not input_dir:
+            parser.error("input_dir is required unless --demo is given")
+            
+        report = generate_branch_insights(
+            input_dir,
+            output_dir=args.output_dir,
+            client=client,
+            requests_per_second=args.rate,
+            burst=max(int(args.rate), 1),
+            max_concurrency=args.concurrency,
+            timeout=args.timeout,
+            retries=args.retries,
+            batch=args.batch,
+            cache=None if args.no_cache or args.demo else InsightCache()
+        )
+        print(json.dumps(report, indent=2))
+        
+        if args.demo:
+            print(f"Demo branch insights written under {args.output_dir or input_dir}")
+            
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import numpy as np
+
+class CompiledForest:
+    def __init__(self, feature, threshold, left, right, value, roots, depth):
+        """
+        Initialize a forest flattened into contiguous arrays
+        
+        All trees share one set of node arrays; roots holds the index of
+        each tree's root. Nodes are numbered breadth-first so a split's
+        right child directly follows its left child, and leaves point to
+        themselves with an infinite threshold, so traversal is a fixed
+        number of branch-free steps for every row and tree.
+        
+        Args:
+            feature (np.ndarray): Split feature per node
+            threshold (np.ndarray): Split threshold per node (go left when
+                the feature is <= threshold)
+            left (np.ndarray): Left child per node
+            right (np.ndarray): Right child per node
+            value (np.ndarray): Mean target per node
+            roots (np.ndarray): Root node of each tree
+            depth (int): Maximum depth over all trees
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        
+    @classmethod
+    def from_sklearn(cls, model, scaler=None, max_depth=None, min_samples=1):
+        """
+        Flatten a fitted sklearn tree ensemble (or a single tree)
+        
+        Args:
+            model: Fitted RandomForestRegressor, ExtraTreesRegressor or
+                DecisionTreeRegressor
+            scaler (StandardScaler): Scaler the model was trained behind;
+                it is folded into the thresholds so raw features can be
+                passed to predict()
+            max_depth (int): Truncate trees below this depth, using the
+                node means as leaf values
+            min_samples (int): Prune splits with a child holding fewer
+                training samples than this
+                
+        Returns:
+            CompiledForest: The compiled forest
+        """
+        estimators = getattr(model, 'estimators_', [model])
+        
+        arrays = {name: [] for name in ('feature', 'threshold', 'left', 'right', 'value')}
+        roots = []
+        depth = 0
+        offset = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            nodes, tree_depth = _reachable_nodes(tree, max_depth, min_samples)
+            renumber = np.full(tree.node_count, -1, dtype=np.int64)
+            renumber[nodes] = np.arange(len(nodes)) + offset
+            
+            # Kept nodes whose children were dropped become leaves
+            left = renumber[np.maximum(tree.children_left[nodes], 0)]
+            right = renumber[np.maximum(tree.children_right[nodes], 0)]
+            is_leaf = (tree.children_left[nodes] < 0) | (left < 0)
+            own = renumber[nodes]
+            left = np.where(is_leaf, own, left)
+            right = np.where(is_leaf, own, right)
+            feature = np.where(is_leaf, 0, tree.feature[nodes])
+            threshold = _float32_boundary(np.where(is_leaf, np.inf, tree.threshold[nodes]))
+            
+            # x_scaled <= t  <=>  x <= t * scale + mean (scale is positive)
+            if scaler is not None:
+                if getattr(scaler, 'scale_', None) is not None:
+                    threshold = threshold * scaler.scale_[feature]
+                if getattr(scaler, 'mean_', None) is not None:
+                    threshold = threshold + scaler.mean_[feature]
+                    
+            arrays['feature'].append(feature)
+            arrays['threshold'].append(threshold)
+            arrays['left'].append(left)
+            arrays['right'].append(right)
+            arrays['value'].append(tree.value[nodes, 0, 0])
+            roots.append(offset)
+            depth = max(depth, tree_depth)
+            offset += len(nodes)
+            
+        index_dtype = np.int32 if offset < 2 ** 31 else np.int64
+        return cls(
+            feature=np.concatenate(arrays['feature']).astype(np.int32),
+            threshold=np.concatenate(arrays['threshold']).astype(np.float64),
+            left=np.concatenate(arrays['left']).astype(index_dtype),
+            right=np.concatenate(arrays['right']).astype(index_dtype),
+            value=np.concatenate(arrays['value']).astype(np.float64),
+            roots=np.asarray(roots, dtype=index_dtype),
+            depth=depth
+        )
+        
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+        
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in (self.feature, self.threshold, self.left,
+                                              self.right, self.value, self.roots))
+    
+    def leaves(self, X, chunk_size=256):
+        """
+        Find the leaf reached by every row in every tree
+        
+        Args:
+            X (array-like): Raw (unscaled) features, n_rows x n_features
+            chunk_size (int): Rows traversed at once, bounding memory to
+                chunk_size x n_trees node indices
+                
+        Returns:
+            np.ndarray: n_rows x n_trees leaf indices
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        n_features = X.shape[1]
+        leaves = np.empty((len(X), len(self.roots)), dtype=self.roots.dtype)
+        for start in range(0, len(X), chunk_size):
+            rows = X[start:start + chunk_size]
+            values = rows.ravel()
+            row_offset = (np.arange(len(rows)) * n_features)[:, None]
+            node = np.broadcast_to(self.roots, (len(rows), len(self.roots))).copy()
+            for _ in range(self.depth):
+                go_right = values[row_offset + self.feature[node]] > self.threshold[node]
+                node = self.left[node] + go_right
+            leaves[start:start + chunk_size] = node
+        return leaves
+        
+    def predict(self, X, chunk_size=256):
+        """
+        Predict by averaging the leaf values over the trees
+        
+        Args:
+            X (array-like): Raw (unscaled) features, n_rows x n_features
+            chunk_size (int): Rows traversed at once
+            
+        Returns:
+            np.ndarray: Predictions
+        """
+        return self.value[self.leaves(X, chunk_size)].mean(axis=1)
+        
+    def contributions(self, X, chunk_size=256):
+        """
+        Decompose predictions into per-feature contributions
+        
+        Follows every row's path through every tree and credits each
+        split's change in node mean to the split feature (Saabas'
+        tree-path decomposition), averaged over the trees. For each row,
+        bias plus the sum of its contributions equals predict().
+        
+        Args:
+            X (array-like): Raw (unscaled) features, n_rows x n_features
+            chunk_size (int): Rows traversed at once
+            
+        Returns:
+            tuple: (bias per row, n_rows x n_features contributions)
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        n_rows, n_features = X.shape
+        n_trees = len(self.roots)
+        contributions = np.zeros((n_rows, n_features))
+        for start in range(0, n_rows, chunk_size):
+            rows = X[start:start + chunk_size]
+            values = rows.ravel()
+            row_offset = (np.arange(len(rows)) * n_features)[:, None]
+            node = np.broadcast_to(self.roots, (len(rows), n_trees)).copy()
+            totals = np.zeros(len(rows) * n_features)
+            for _ in range(self.depth):
+                feature = self.feature[node]
+                child = self.left[node] + (values[row_offset + feature] > self.threshold[node])
+                # Leaves point to themselves, so they add nothing
+                totals += np.bincount((row_offset + feature).ravel(),
+                                      weights=(self.value[child] - self.value[node]).ravel(),
+                                      minlength=len(totals))
+                node = child
+            contributions[start:start + chunk_size] = totals.reshape(len(rows), n_features) / n_trees
+            
+        bias = np.full(n_rows, self.value[self.roots].mean())
+        return bias, contributions
+        
+    def save(self, path):
+        """
+        Save the compiled forest
+        
+        Args:
+            path (str): Path of the .npz file
+        """
+        np.savez(path, feature=self.feature, threshold=self.threshold, left=self.left,
+                 right=self.right, value=self.value, roots=self.roots,
+                 depth=np.array(self.depth))
+    
+    @classmethod
+    def load(cls, path):
+        """
+        Load a compiled forest written by save()
+        
+        Args:
+            path (str): Path of the .npz file
+            
+        Returns:
+            CompiledForest: The loaded forest
+        """
+        with np.load(path) as data:
+            return cls(
+                feature=data['feature'],
+                threshold=data['threshold'],
+                left=data['left'],
+                right=data['right'],
+                value=data['value'],
+                roots=data['roots'],
+                depth=int(data['depth'])
+            )
+
+def _float32_boundary(threshold):
+    """
+    Move thresholds to the float64 boundary matching sklearn's splits
+    
+    sklearn casts features to float32 before comparing them with the
+    thresholds, so a value goes left when its float32 rounding is at most
+    the threshold. That holds for values below the midpoint between the
+    largest float32 at most the threshold and the next float32 up.
+    """
+    lower = threshold.astype(np.float32)
+    lower = np.where(lower > threshold, np.nextafter(lower, np.float32(-np.inf)), lower)
+    upper = np.nextafter(lower, np.float32(np.inf))
+    return np.where(np.isinf(threshold), threshold,
+                    (lower.astype(np.float64) + upper.astype(np.float64)) / 2)
+
+def _reachable_nodes(tree, max_depth=None, min_samples=1):
+    """
+    List the nodes of a fitted sklearn tree kept after truncation and
+    pruning, in breadth-first order
+    
+    A node is kept as a split only when it is above max_depth and both
+    children hold at least min_samples training samples; otherwise it
+    becomes a leaf and its subtree is dropped.
+    
+    Returns:
+        tuple: (kept node ids, depth of the kept tree)
+    """
+    kept = []
+    depth = 0
+    level = [0]
+    level_depth = 0
+    while level:
+        kept.extend(level)
+        depth = level_depth
+        next_level = []
+        for node in level:
+            left, right = tree.children_left[node], tree.children_right[node]
+            if left < 0:
+                continue
+            if max_depth is not None and level_depth >= max_depth:
+                continue
+            if min(tree.n_node_samples[left], tree.n_node_samples[right]) < min_samples:
+                continue
+            next_level.extend((left, right))
+        level = next_level
+        level_depth += 1
+    return np.asarray(kept, dtype=np.int64), depth
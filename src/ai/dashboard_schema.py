@@ -0,0 +1,175 @@
+import json
+import re
+
+SCHEMA_VERSION = 1
+CURRENCY = 'INR'
+CURRENCY_SYMBOLS = {'INR': '₹'}
+
+# Numeric fields per section: 'amount' (currency), 'percent' or
+# 'quantity' (number plus a separate '<field>Unit'); nested dicts apply
+# to the items of a list field
+SECTION_FIELDS = {
+    'sales': {
+        'predictedRevenue': 'amount',
+        'trendPercentage': 'percent',
+        'dailyPredictions': {'revenue': 'amount', 'confidence': 'percent'}
+    },
+    'waste': {
+        'totalWasteCost': 'amount',
+        'trendPercentage': 'percent',
+        'highRiskItems': {'quantity': 'quantity', 'potentialLoss': 'amount'},
+        'wasteByCategory': {'amount': 'amount', 'percentage': 'percent'}
+    },
+    'inventory': {
+        'efficiencyScore': 'percent',
+        'trendPercentage': 'percent',
+        'stockLevels': {'currentLevel': 'percent', 'value': 'amount'},
+        'reorderSuggestions': {'currentStock': 'quantity', 'suggestedOrder': 'quantity'}
+    }
+}
+
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+
+def _compact(value):
+    return int(value) if float(value).is_integer() else float(value)
+
+def parse_number(value):
+    """
+    Read a number from a numeric value or a formatted string
+    ('₹45,000' -> 45000, '3.7%' -> 3.7, '5 kg' -> 5)
+    
+    Raises:
+        ValueError: When the string holds no number
+    """
+    if isinstance(value, (int, float)):
+        return _compact(value)
+    match = _NUMBER.search(str(value).replace(',', ''))
+    if not match:
+        raise ValueError(f"No number in {value!r}")
+    return _compact(float(match.group(0)))
+
+def parse_quantity(value, unit=None):
+    """
+    Split a quantity into its number and unit ('5 kg' -> (5, 'kg'))
+    """
+    if isinstance(value, (int, float)):
+        return _compact(value), unit
+    text = str(value).replace(',', '')
+    match = _NUMBER.search(text)
+    if not match:
+        raise ValueError(f"No number in {value!r}")
+    return _compact(float(match.group(0))), text[match.end():].strip() or unit
+
+def format_amount(value, currency=CURRENCY):
+    return f"{CURRENCY_SYMBOLS.get(currency, currency + ' ')}{round(value):,}"
+
+def format_percent(value):
+    return f"{value:g}%"
+
+def format_quantity(value, unit):
+    return f"{value:g} {unit}" if unit else f"{value:g}"
+
+def _normalize_fields(record, fields):
+    record = dict(record)
+    for field, kind in fields.items():
+        if field not in record:
+            continue
+        if isinstance(kind, dict):
+            record[field] = [_normalize_fields(item, kind) for item in record[field]]
+        elif kind == 'quantity':
+            record[field], record[f"{field}Unit"] = parse_quantity(
+                record[field], record.get(f"{field}Unit"))
+        else:
+            record[field] = parse_number(record[field])
+    return record
+
+def _legacy_fields(record, fields, currency):
+    record = dict(record)
+    for field, kind in fields.items():
+        if field not in record:
+            continue
+        if isinstance(kind, dict):
+            record[field] = [_legacy_fields(item, kind, currency) for item in record[field]]
+        elif kind == 'quantity':
+            record[field] = format_quantity(record[field], record.pop(f"{field}Unit", None))
+        elif kind == 'amount':
+            record[field] = format_amount(record[field], currency)
+        else:
+            record[field] = format_percent(record[field])
+    return record
+
+def normalize_section(section, data):
+    """
+    Convert one section's dashboard data to the numeric schema
+    
+    Accepts both the legacy shape with formatted strings ('₹45,000',
+    '85%', '5 kg') and data already in the schema. Amounts become numbers
+    in the 'currency' field's currency, percentages numbers of percent,
+    and quantities a number plus a '<field>Unit' string. Trend
+    percentages stay magnitudes, with the direction in 'trend'.
+    
+    Args:
+        section (str): 'sales', 'waste' or 'inventory'
+        data (dict): Section data
+        
+    Returns:
+        dict: Data in the current schema version
+        
+    Raises:
+        ValueError: For an unknown section or a newer schema version
+    """
+    if section not in SECTION_FIELDS:
+        raise ValueError(f"Unknown dashboard section: {section}")
+    version = data.get('schemaVersion')
+    if version == SCHEMA_VERSION:
+        return data
+    if version is not None and version > SCHEMA_VERSION:
+        raise ValueError(f"Unsupported {section} schema version {version}")
+        
+    normalized = _normalize_fields(data, SECTION_FIELDS[section])
+    normalized['schemaVersion'] = SCHEMA_VERSION
+    normalized.setdefault('currency', CURRENCY)
+    return normalized
+
+def to_legacy(section, data):
+    """
+    Format schema data in the legacy string shape for older consumers
+    
+    Args:
+        section (str): 'sales', 'waste' or 'inventory'
+        data (dict): Section data (any supported shape)
+        
+    Returns:
+        dict: Data with formatted strings and no schema fields
+    """
+    data = normalize_section(section, data)
+    legacy = _legacy_fields(data, SECTION_FIELDS[section], data.get('currency', CURRENCY))
+    legacy.pop('schemaVersion', None)
+    legacy.pop('currency', None)
+    return legacy
+
+def encode(data, binary=False):
+    """
+    Serialize dashboard data compactly
+    
+    Args:
+        data (dict): Data to serialize
+        binary (bool): Use MessagePack (requires the msgpack package)
+            instead of JSON
+            
+    Returns:
+        bytes: Encoded data
+    """
+    if binary:
+        import msgpack
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode()
+
+def decode(payload, binary=False):
+    """
+    Deserialize data written by encode()
+    """
+    if binary:
+        import msgpack
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload)
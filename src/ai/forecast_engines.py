@@ -0,0 +1,371 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import time
+from statistics import NormalDist
+
+class ForecastEngine:
+    """
+    Interface shared by the forecasting engines used by SalesForecaster
+    
+    An engine fits many items at once and predicts them on arbitrary
+    dates as date-indexed frames with the columns produced by
+    SalesForecaster.predict_frame ('yhat', 'yhat_lower', 'yhat_upper',
+    'trend' and any seasonal components).
+    """
+    name = None
+    
+    def fit_many(self, series_by_item):
+        """
+        Fit models for several items
+        
+        Args:
+            series_by_item (dict): DataFrames with 'date' and 'sales'
+                columns keyed by item name
+                
+        Returns:
+            dict: Training metrics by item
+        """
+        raise NotImplementedError
+        
+    def predict_frames(self, items, dates, uncertainty_samples=None):
+        """
+        Predict several items on the given dates
+        
+        Args:
+            items (iterable): Names of the items
+            dates (iterable): Dates to predict
+            uncertainty_samples (int): Interval sampling override, for
+                engines that sample
+                
+        Returns:
+            dict: Forecast frames indexed by normalized date, by item
+        """
+        raise NotImplementedError
+        
+    def history_span(self, item_name):
+        """
+        Return the first and last training dates of an item
+        
+        Returns:
+            tuple: (first date, last date) as normalized Timestamps
+        """
+        raise NotImplementedError
+
+class ProphetEngine(ForecastEngine):
+    name = 'prophet'
+    
+    def __init__(self, forecaster, workers=None, save_model=True):
+        """
+        Adapt a SalesForecaster's Prophet models to the engine interface
+        
+        Args:
+            forecaster (SalesForecaster): Forecaster owning the models
+            workers (int): Worker processes used by fit_many
+            save_model (bool): Whether fit_many saves the trained models
+        """
+        self.forecaster = forecaster
+        self.workers = workers
+        self.save_model = save_model
+        
+    def fit_many(self, series_by_item):
+        return self.forecaster.train_many(
+            series_by_item,
+            workers=self.workers,
+            save_model=self.save_model
+        )
+        
+    def predict_frames(self, items, dates, uncertainty_samples=None):
+        return {
+            item_name: self.forecaster.predict_frame(
+                item_name, dates, uncertainty_samples
+            )
+            for item_name in items
+        }
+        
+    def history_span(self, item_name):
+        history = self.forecaster.load_model(item_name).history['ds']
+        return history.min().normalize(), history.max().normalize()
+
+class NumpyEngine(ForecastEngine):
+    name = 'numpy'
+    METHODS = ('seasonal_naive', 'ses', 'holt_winters')
+    
+    def __init__(self, method='holt_winters', season_length=7,
+                 alpha=0.3, beta=0.05, gamma=0.2, interval_width=0.8):
+        """
+        Initialize a vectorized exponential-smoothing engine
+        
+        All items are aligned on one daily grid and smoothed together as
+        rows of a 2-D array, so fitting and forecasting thousands of items
+        costs one pass over the time axis.
+        
+        Args:
+            method (str): 'seasonal_naive', 'ses' (simple exponential
+                smoothing) or 'holt_winters' (additive trend and season)
+            season_length (int): Seasonal period in days
+            alpha (float): Level smoothing factor
+            beta (float): Trend smoothing factor (Holt-Winters only)
+            gamma (float): Seasonal smoothing factor (Holt-Winters only)
+            interval_width (float): Width of the prediction interval,
+                matching Prophet's default of 0.8
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method {method}, expected one of {self.METHODS}")
+            
+        self.method = method
+        self.season_length = season_length
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.interval_width = interval_width
+        
+        self.items = []
+        self.index = {}
+        self.start = None
+        self.n_steps = 0
+        self.values = None
+        
+    def fit_many(self, series_by_item):
+        """
+        Fit models for several items, keeping the other items already fit
+        
+        Items fit earlier are refit from their stored history on the
+        combined daily grid, so fitting a new batch adds to the engine
+        instead of replacing it. Items in series_by_item replace their
+        previous history.
+        
+        Args:
+            series_by_item (dict): DataFrames with 'date' and 'sales'
+                columns keyed by item name
+                
+        Returns:
+            dict: Training metrics for the items in series_by_item
+        """
+        start_time = time.perf_counter()
+        new_items = list(series_by_item)
+        series_by_item = {**self._stored_series(exclude=series_by_item), **series_by_item}
+        self.items = list(series_by_item)
+        self.index = {item_name: i for i, item_name in enumerate(self.items)}
+        
+        values, self.first_dates = self._align(series_by_item)
+        self.n_steps = values.shape[1]
+        self.values = values
+        self._smooth(values)
+        
+        residuals = values - self.fitted
+        mae = np.nanmean(np.abs(residuals), axis=1)
+        rmse = np.sqrt(np.nanmean(residuals ** 2, axis=1))
+        self.sigma = np.nan_to_num(np.nanstd(residuals, axis=1))
+        
+        fit_seconds = (time.perf_counter() - start_time) / max(len(self.items), 1)
+        training_date = datetime.now().isoformat()
+        return {
+            item_name: {
+                'mae': float(mae[self.index[item_name]]),
+                'rmse': float(rmse[self.index[item_name]]),
+                'fit_seconds': fit_seconds,
+                'training_date': training_date
+            }
+            for item_name in new_items
+        }
+        
+    def _stored_series(self, exclude=()):
+        """
+        Rebuild the training series of the items already fit, from each
+        item's first date on
+        
+        Returns:
+            dict: DataFrames with 'date' and 'sales' columns by item
+        """
+        if self.values is None:
+            return {}
+        dates = pd.date_range(self.start, periods=self.n_steps, freq='D')
+        series = {}
+        for i, item_name in enumerate(self.items):
+            if item_name in exclude:
+                continue
+            observed = dates >= self.first_dates[item_name]
+            series[item_name] = pd.DataFrame({'date': dates[observed],
+                                              'sales': self.values[i, observed]})
+        return series
+        
+    def _align(self, series_by_item):
+        """
+        Pivot the per-item series onto one daily grid
+        
+        Missing days inside an item's history count as zero sales; days
+        before an item's first sale are back-filled so the smoothing
+        state is not initialized from an artificial run of zeros.
+        
+        Returns:
+            tuple: (n_items x n_days array, first date per item)
+        """
+        frames = []
+        for item_name, sales_data in series_by_item.items():
+            df = sales_data.copy()
+            df.columns = ['date', 'sales']
+            df['date'] = pd.to_datetime(df['date']).dt.normalize()
+            df['item_name'] = item_name
+            frames.append(df)
+        long = pd.concat(frames, ignore_index=True)
+        
+        self.start = long['date'].min()
+        grid = pd.date_range(self.start, long['date'].max(), freq='D')
+        wide = (long.pivot_table(index='item_name', columns='date',
+                                 values='sales', aggfunc='sum')
+                    .reindex(index=self.items, columns=grid))
+                    
+        first_dates = long.groupby('item_name')['date'].min().reindex(self.items)
+        observed = wide.notna().cumsum(axis=1).to_numpy() > 0
+        values = wide.to_numpy(dtype=float, copy=True)
+        values[observed & np.isnan(values)] = 0.0
+        values = pd.DataFrame(values).bfill(axis=1).to_numpy()
+        
+        return values, first_dates
+        
+    def _smooth(self, values):
+        n_items, n_steps = values.shape
+        m = self.season_length
+        self.fitted = np.empty_like(values)
+        
+        if self.method == 'seasonal_naive':
+            self.fitted[:, :m] = values[:, :m]
+            self.fitted[:, m:] = values[:, :-m]
+            self.level = values[:, -m:].mean(axis=1)
+            self.trend = np.zeros(n_items)
+            # Seasonal offsets by absolute phase (t % m)
+            last = values[:, -m:]
+            phases = np.arange(n_steps - m, n_steps) % m
+            self.season = np.empty((n_items, m))
+            self.season[:, phases] = last - self.level[:, None]
+            return
+            
+        alpha = self.alpha
+        use_season = self.method == 'holt_winters'
+        beta = self.beta if use_season else 0.0
+        gamma = self.gamma if use_season else 0.0
+        
+        init = min(m, n_steps)
+        level = values[:, :init].mean(axis=1)
+        trend = np.zeros(n_items)
+        season = np.zeros((n_items, m))
+        if use_season:
+            season[:, :init] = values[:, :init] - level[:, None]
+            
+        for t in range(n_steps):
+            phase = t % m
+            prediction = level + trend + season[:, phase]
+            self.fitted[:, t] = prediction
+            
+            y = values[:, t]
+            previous_level = level
+            level = alpha * (y - season[:, phase]) + (1 - alpha) * (level + trend)
+            if use_season:
+                trend = beta * (level - previous_level) + (1 - beta) * trend
+                season[:, phase] = gamma * (y - level) + (1 - gamma) * season[:, phase]
+                
+        self.level = level
+        self.trend = trend
+        self.season = season
+        
+    def predict_matrix(self, dates, items=None):
+        """
+        Predict items on the given dates as 2-D arrays
+        
+        Args:
+            dates (iterable): Dates to predict
+            items (iterable): Names of the items (defaults to all)
+            
+        Returns:
+            dict: n_items x n_dates arrays for 'yhat', 'yhat_lower',
+                'yhat_upper', 'trend' and 'weekly'
+        """
+        rows = np.arange(len(self.items)) if items is None else \
+            np.array([self.index[item_name] for item_name in items], dtype=int)
+        dates = pd.DatetimeIndex(dates).normalize()
+        steps = np.asarray((dates - self.start).days)
+        
+        in_sample = (steps >= 0) & (steps < self.n_steps)
+        horizon = np.where(steps >= self.n_steps, steps - self.n_steps + 1, 0)
+        
+        level = self.level[rows, None] + self.trend[rows, None] * horizon
+        seasonal = self.season[rows][:, steps % self.season_length]
+        yhat = level + seasonal
+        
+        fitted = self.fitted[rows][:, np.clip(steps, 0, self.n_steps - 1)]
+        yhat = np.where(in_sample, fitted, yhat)
+        trend = np.where(in_sample, fitted - seasonal, level)
+        
+        z = NormalDist().inv_cdf(0.5 + self.interval_width / 2)
+        spread = z * self.sigma[rows, None] * np.sqrt(np.maximum(horizon, 1))
+        
+        return {
+            'yhat': yhat,
+            'yhat_lower': yhat - spread,
+            'yhat_upper': yhat + spread,
+            'trend': trend,
+            'weekly': seasonal
+        }
+        
+    def predict_frames(self, items, dates, uncertainty_samples=None):
+        items = list(items)
+        dates = pd.DatetimeIndex(dates).normalize()
+        matrix = self.predict_matrix(dates, items)
+        return {
+            item_name: pd.DataFrame(
+                {column: values[i] for column, values in matrix.items()},
+                index=pd.Index(dates, name='date')
+            )
+            for i, item_name in enumerate(items)
+        }
+        
+    def history_span(self, item_name):
+        end = self.start + pd.Timedelta(days=self.n_steps - 1)
+        return self.first_dates[item_name], end
+        
+    def save(self, path):
+        """
+        Save the fitted engine state
+        
+        Args:
+            path (str): Path of the .npz file
+        """
+        np.savez_compressed(
+            path,
+            items=np.array(self.items, dtype=object),
+            first_dates=self.first_dates.to_numpy(dtype='datetime64[ns]'),
+            start=np.datetime64(self.start, 'ns'),
+            values=self.values,
+            fitted=self.fitted,
+            level=self.level,
+            trend=self.trend,
+            season=self.season,
+            sigma=self.sigma
+        )
+        
+    def load(self, path):
+        """
+        Load engine state written by save()
+        
+        Files saved before the training history was stored can still be
+        predicted from, but a later fit_many replaces their items.
+        
+        Args:
+            path (str): Path of the .npz file
+        """
+        with np.load(path, allow_pickle=True) as data:
+            self.items = data['items'].tolist()
+            self.index = {item_name: i for i, item_name in enumerate(self.items)}
+            self.first_dates = pd.Series(pd.DatetimeIndex(data['first_dates']), index=self.items)
+            self.start = pd.Timestamp(data['start'].item())
+            self.values = data['values'] if 'values' in data.files else None
+            self.fitted = data['fitted']
+            self.level = data['level']
+            self.trend = data['trend']
+            self.season = data['season']
+            self.sigma = data['sigma']
+        self.n_steps = self.fitted.shape[1]
+        
+    def __contains__(self, item_name):
+        return item_name in self.index
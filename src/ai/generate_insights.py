@@ -1,107 +1,431 @@
 import json
-import google.generativeai as genai
 import os
+import re
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from dotenv import load_dotenv
-from sales_forecasting_data import generate_sales_data
-from waste_prediction_data import generate_waste_data
-from inventory_optimization_data import generate_inventory_data
+from insight_cache import InsightCache
+from dashboard_schema import normalize_section, format_amount, format_percent
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Gemini
-GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-genai.configure(api_key=GOOGLE_API_KEY)
-model = genai.GenerativeModel('gemini-pro')
+GEMINI_MODEL = 'gemini-pro'
+
+FALLBACK_INSIGHTS = {
+    'sales': "Sales show a strong upward trend with notable weekend peaks. Recommend staffing adjustments and inventory preparation for peak hours.",
+    'waste': "Waste costs are trending down with meat category showing highest loss. Immediate attention needed for perishables expiring within 48 hours.",
+    'inventory': "Inventory efficiency is improving with some critical items needing attention. Recommend implementing automated reordering for high-turnover items."
+}
+
+class GeminiClient:
+    def __init__(self, gemini_model=None, model_name=GEMINI_MODEL):
+        """
+        Generate text with a Gemini model
+        
+        The Gemini SDK is imported and configured on the first call, so
+        runs answered from the cache or offline never load it.
+        
+        Args:
+            gemini_model (genai.GenerativeModel): Model to call (defaults
+                to model_name, created on first use)
+            model_name (str): Gemini model name
+        """
+        self._model = gemini_model
+        self.model_name = getattr(gemini_model, 'model_name', model_name)
+        
+    @property
+    def model(self):
+        if self._model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+            self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+        
+    def generate(self, prompt, timeout):
+        response = self.model.generate_content(prompt, request_options={'timeout': timeout})
+        return response.text.strip()
+
+class HttpLLMClient:
+    def __init__(self, url, model_name='local'):
+        """
+        Generate text with an HTTP endpoint, e.g. the stand-in server in
+        local_llm_server.py
+        
+        The endpoint receives a JSON body {"model": ..., "prompt": ...}
+        and answers with {"text": ...}.
+        
+        Args:
+            url (str): Endpoint URL
+            model_name (str): Model name sent with every request
+        """
+        self.url = url
+        self.model_name = model_name
+        
+    def generate(self, prompt, timeout):
+        import urllib.request
+        body = json.dumps({'model': self.model_name, 'prompt': prompt}).encode()
+        request = urllib.request.Request(self.url, data=body,
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())['text'].strip()
+
+class OfflineClient:
+    def __init__(self, model_name):
+        """
+        Stand in for a client without making calls, so only cached
+        insights and fallbacks are used
+        
+        Args:
+            model_name (str): Name of the model whose cached insights to
+                reuse
+        """
+        self.model_name = model_name
+        
+    def generate(self, prompt, timeout):
+        raise ConnectionError("offline mode, no LLM calls are made")
+
+def get_client(offline=False):
+    """
+    Choose the LLM client: the HTTP endpoint in INSIGHTS_LLM_URL when set,
+    Gemini otherwise
+    
+    Args:
+        offline (bool): Return an OfflineClient for the chosen model
+            (also enabled by setting INSIGHTS_OFFLINE=1)
+    """
+    url = os.getenv('INSIGHTS_LLM_URL')
+    if url:
+        client = HttpLLMClient(url, os.getenv('INSIGHTS_LLM_MODEL', 'local'))
+    else:
+        client = GeminiClient(model_name=os.getenv('INSIGHTS_LLM_MODEL', GEMINI_MODEL))
+        
+    if offline or os.getenv('INSIGHTS_OFFLINE') == '1':
+        return OfflineClient(client.model_name)
+    return client
 
 def load_json_data(file_path):
     with open(file_path, 'r') as f:
         return json.load(f)
 
-def get_sales_insights(data):
-    prompt = f"""
+def write_json_atomic(data, file_path):
+    """
+    Write JSON through a temporary file so readers never see a partial file
+    """
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, file_path)
+
+def sales_prompt(data):
+    data = normalize_section('sales', data)
+    revenues = [d['revenue'] for d in data['dailyPredictions']]
+    currency = data['currency']
+    return f"""
     Analyze this sales forecast data and provide a BRIEF insight (2-3 sentences):
-    - Predicted Revenue: {data['predictedRevenue']}
-    - Trend: {data['trend']} ({data['trendPercentage']})
+    - Predicted Revenue: {format_amount(data['predictedRevenue'], currency)}
+    - Trend: {data['trend']} ({format_percent(data['trendPercentage'])})
     - Peak Hours: {', '.join(data['peakHours'])}
-    - Daily Revenue Range: {min(d['revenue'] for d in data['dailyPredictions'])} to {max(d['revenue'] for d in data['dailyPredictions'])}
+    - Daily Revenue Range: {format_amount(min(revenues), currency)} to {format_amount(max(revenues), currency)}
     
     Focus on key actionable insights and revenue patterns.
     """
-    try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        print(f"Error getting sales insights: {str(e)}")
-        return "Sales show a strong upward trend with notable weekend peaks. Recommend staffing adjustments and inventory preparation for peak hours."
 
-def get_waste_insights(data):
-    prompt = f"""
+def waste_prompt(data):
+    data = normalize_section('waste', data)
+    return f"""
     Analyze this waste management data and provide a BRIEF insight (2-3 sentences):
-    - Total Waste Cost: {data['totalWasteCost']}
-    - Trend: {data['trend']} ({data['trendPercentage']})
+    - Total Waste Cost: {format_amount(data['totalWasteCost'], data['currency'])}
+    - Trend: {data['trend']} ({format_percent(data['trendPercentage'])})
     - High Risk Items: {len(data['highRiskItems'])} items
     - Highest Waste Category: {max(data['wasteByCategory'], key=lambda x: x['amount'])['category']}
     
     Focus on immediate actions needed to reduce waste.
     """
-    try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        print(f"Error getting waste insights: {str(e)}")
-        return "Waste costs are trending down with meat category showing highest loss. Immediate attention needed for perishables expiring within 48 hours."
 
-def get_inventory_insights(data):
-    prompt = f"""
+def inventory_prompt(data):
+    data = normalize_section('inventory', data)
+    return f"""
     Analyze this inventory data and provide a BRIEF insight (2-3 sentences):
-    - Efficiency Score: {data['efficiencyScore']}
-    - Trend: {data['trend']} ({data['trendPercentage']})
+    - Efficiency Score: {format_percent(data['efficiencyScore'])}
+    - Trend: {data['trend']} ({format_percent(data['trendPercentage'])})
     - Critical Items: {sum(1 for item in data['reorderSuggestions'] if item['urgency'] == 'high')}
     - Low Stock Categories: {sum(1 for level in data['stockLevels'] if level['status'] == 'low')}
     
     Focus on critical stock management needs and efficiency improvements.
     """
+
+PROMPT_BUILDERS = {
+    'sales': sales_prompt,
+    'waste': waste_prompt,
+    'inventory': inventory_prompt
+}
+
+SECTION_FILES = {
+    'sales': 'sales_forecast.json',
+    'waste': 'waste_prediction.json',
+    'inventory': 'inventory_optimization.json'
+}
+
+INSIGHT_KEYS = {
+    'sales': 'salesInsight',
+    'waste': 'wasteInsight',
+    'inventory': 'inventoryInsight'
+}
+
+def combine_insights(sections_data, analyses):
+    """
+    Pair each section's data with its insight in the combined_insights.json
+    layout
+    """
+    return {
+        INSIGHT_KEYS[section]: {"data": data, "analysis": analyses[section]}
+        for section, data in sections_data.items()
+    }
+
+def batch_prompt(sections_data, prompt_builders=None):
+    """
+    Build one prompt asking for every section's insight as a JSON object
+    """
+    prompt_builders = prompt_builders or PROMPT_BUILDERS
+    parts = "\n".join(
+        f"### {section}\n{prompt_builders[section](data)}"
+        for section, data in sections_data.items()
+    )
+    keys = ", ".join(f'"{section}"' for section in sections_data)
+    return f"""
+    Answer each of the following analyses. Respond with only a JSON object
+    with the keys {keys}, each holding that analysis' insight as a string.
+    {parts}
+    """
+
+def parse_batch_response(text, sections):
+    """
+    Extract the per-section insights from a batched response
+    
+    Returns:
+        dict: Insight text by section (sections missing from the
+            response are left out)
+    """
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    if not match:
+        return {}
     try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        print(f"Error getting inventory insights: {str(e)}")
-        return "Inventory efficiency is improving with some critical items needing attention. Recommend implementing automated reordering for high-turnover items."
+        answers = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    return {
+        section: str(answers[section]).strip()
+        for section in sections
+        if isinstance(answers, dict) and answers.get(section)
+    }
+
+def generate_text(client, prompt, timeout=20.0, retries=2, backoff=1.0):
+    """
+    Call an LLM client with a deadline, retrying failures with
+    exponential backoff and jitter
+    
+    Args:
+        client: Object with a generate(prompt, timeout) method and
+            optionally a limit() context manager (see
+            branch_insights.LimitedClient). Each attempt's deadline starts
+            once the limit is entered, and the limit is held until the
+            call itself returns, even after the deadline has passed
+        prompt (str): Prompt text
+        timeout (float): Deadline in seconds for each attempt
+        retries (int): Retries after the first attempt
+        backoff (float): Delay before the first retry, doubled for each
+            further retry
+            
+    Returns:
+        str: Generated text
+        
+    Raises:
+        Exception: The last attempt's error (TimeoutError on a deadline)
+    """
+    limit = getattr(client, 'limit', nullcontext)
+    
+    def call(started):
+        with limit():
+            started.set()
+            return client.generate(prompt, timeout)
+            
+    for attempt in range(retries + 1):
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            started = threading.Event()
+            future = executor.submit(call, started)
+            future.add_done_callback(lambda _: started.set())
+            started.wait()
+            return future.result(timeout=timeout)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+        finally:
+            # A timed-out call is abandoned, not waited for
+            executor.shutdown(wait=False)
+
+def generate_insights(sections_data, client=None, timeout=20.0, retries=2, backoff=1.0,
+                      batch=False, cache=None, prompt_builders=None, fallbacks=None):
+    """
+    Generate the insight text for several sections concurrently
+    
+    Every section has its own deadline and retries and falls back to a
+    canned insight when its calls fail, so one slow or failing request
+    does not hold back the others.
+    
+    Args:
+        sections_data (dict): Dashboard data by section ('sales',
+            'waste', 'inventory')
+        client: LLM client (defaults to get_client()); an OfflineClient
+            makes no calls
+        timeout (float): Deadline in seconds for each call
+        retries (int): Retries after the first attempt
+        backoff (float): Delay before the first retry
+        batch (bool): Ask for all sections in one structured request
+        cache (InsightCache): Reuse insights whose prompt and model are
+            unchanged, and store newly generated ones (fallbacks are not
+            cached)
+        prompt_builders (dict): Prompt function by section (defaults to
+            PROMPT_BUILDERS)
+        fallbacks (dict or callable): Text by section used when
+            generation fails (defaults to FALLBACK_INSIGHTS), or a function
+            called with the list of failed sections that returns it, so
+            costly fallbacks such as LocalInsightEngine.insights() are
+            only computed when needed
+            
+    Returns:
+        dict: Insight text by section
+    """
+    client = client or get_client()
+    prompt_builders = prompt_builders or PROMPT_BUILDERS
+    prompts = {section: prompt_builders[section](data) for section, data in sections_data.items()}
+    keys = {section: InsightCache.key(client.model_name, prompt)
+            for section, prompt in prompts.items()}
+            
+    insights = {}
+    if cache is not None:
+        for section, key in keys.items():
+            text = cache.get(key)
+            if text is not None:
+                insights[section] = text
+    pending = [section for section in sections_data if section not in insights]
+    
+    generated = {}
+    if pending and isinstance(client, OfflineClient):
+        print(f"Offline, using fallback insights for: {', '.join(pending)}")
+    elif pending and batch:
+        try:
+            prompt = batch_prompt({section: sections_data[section] for section in pending},
+                                  prompt_builders)
+            text = generate_text(client, prompt, timeout, retries, backoff)
+            generated = parse_batch_response(text, pending)
+        except Exception as e:
+            print(f"Error getting batched insights: {str(e)}")
+        for section in pending:
+            if section not in generated:
+                print(f"No {section} insight in batched response, using fallback")
+                
+    elif pending:
+        def generate_section(section):
+            try:
+                return generate_text(client, prompts[section], timeout, retries, backoff)
+            except Exception as e:
+                print(f"Error getting {section} insights: {type(e).__name__}: {str(e)}")
+                return None
+                
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = {section: executor.submit(generate_section, section) for section in pending}
+            generated = {section: future.result() for section, future in futures.items()
+                         if future.result() is not None}
+    
+    failed = [section for section in pending if section not in generated]
+    if failed:
+        if callable(fallbacks):
+            fallbacks = fallbacks(failed)
+        fallbacks = {**FALLBACK_INSIGHTS, **(fallbacks or {})}
+        
+    for section in pending:
+        if section in generated:
+            insights[section] = generated[section]
+            if cache is not None:
+                cache.put(keys[section], generated[section], client.model_name)
+        else:
+            insights[section] = fallbacks[section]
+            
+    return {section: insights[section] for section in sections_data}
+
+def get_sales_insights(data):
+    return generate_insights({'sales': data})['sales']
+
+def get_waste_insights(data):
+    return generate_insights({'waste': data})['waste']
+
+def get_inventory_insights(data):
+    return generate_insights({'inventory': data})['inventory']
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate AI insights for the dashboard")
+    parser.add_argument('--batch', action='store_true',
+                        help="request all insights in one structured call")
+    parser.add_argument('--timeout', type=float, default=20.0,
+                        help="deadline in seconds for each LLM call")
+    parser.add_argument('--retries', type=int, default=2,
+                        help="retries after a failed or timed-out call")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="regenerate every insight instead of reusing cached ones")
+    parser.add_argument('--offline', action='store_true',
+                        help="make no LLM calls; use cached insights and fallbacks only")
+    parser.add_argument('--output', default='../data/combined_insights.json',
+                        help="path of the combined insights JSON")
+    args = parser.parse_args()
+    
     # Load data
-    sales_data = load_json_data('../data/sales_forecast.json')
-    waste_data = load_json_data('../data/waste_prediction.json')
-    inventory_data = load_json_data('../data/inventory_optimization.json')
+    sections_data = {section: load_json_data(f'../data/{file_name}')
+                     for section, file_name in SECTION_FILES.items()}
     
+    # Insights computed from the CSV files replace the canned fallbacks,
+    # only for the sections the cache and the LLM could not provide
+    def local_fallbacks(sections):
+        try:
+            from local_insights import LocalInsightEngine
+            return LocalInsightEngine().insights(tuple(sections))
+        except Exception as e:
+            print(f"Error computing local insights: {str(e)}")
+            return None
+            
     # Get insights
-    sales_insight = get_sales_insights(sales_data)
-    waste_insight = get_waste_insights(waste_data)
-    inventory_insight = get_inventory_insights(inventory_data)
+    cache = None if args.no_cache else InsightCache()
+    start = time.perf_counter()
+    analyses = generate_insights(
+        sections_data,
+        client=get_client(offline=args.offline),
+        timeout=args.timeout,
+        retries=args.retries,
+        batch=args.batch,
+        cache=cache,
+        fallbacks=local_fallbacks
+    )
+    elapsed = time.perf_counter() - start
+    sales_insight = analyses['sales']
+    waste_insight = analyses['waste']
+    inventory_insight = analyses['inventory']
     
     # Combine data and insights
-    insights = {
-        "salesInsight": {
-            "data": sales_data,
-            "analysis": sales_insight
-        },
-        "wasteInsight": {
-            "data": waste_data,
-            "analysis": waste_insight
-        },
-        "inventoryInsight": {
-            "data": inventory_data,
-            "analysis": inventory_insight
-        }
-    }
+    insights = combine_insights(sections_data, analyses)
     
     # Save combined insights
-    with open('../data/combined_insights.json', 'w') as f:
-        json.dump(insights, f, indent=2)
-        
+    write_json_atomic(insights, args.output)
+    
     # Print insights
-    print("\n=== Generated AI Insights ===\n")
+    if cache is not None:
+        print(f"Insight cache: {cache.get_stats()}")
+    print(f"\n=== Generated AI Insights ({elapsed:.1f}s) ===\n")
     print("Sales Insight:")
     print("-" * 50)
     print(sales_insight)
@@ -113,4 +437,4 @@ def main():
     print(inventory_insight)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,276 @@
+import pandas as pd
+import numpy as np
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+from datetime import datetime, timedelta
+import tempfile
+import time
+from sales_forecasting import SalesForecaster
+from sales_ingestion import SalesIngestor
+
+LEVELS = ('item_name', 'item_type', 'total')
+TOTAL = 'total'
+
+class HierarchicalForecaster:
+    def __init__(self, forecaster, level='item_type', proportion_days=None):
+        """
+        Initialize hierarchical forecasting over item -> item_type -> total
+        
+        Models are fit only at the chosen level and reconciled to the
+        others: levels above are the sum of the fitted forecasts
+        (bottom-up), items below are disaggregated top-down in proportion
+        to their historical share of their parent.
+        
+        Args:
+            forecaster (SalesForecaster): Forecaster used to fit and
+                predict the series at the chosen level
+            level (str): 'item_name' (flat, bottom-up), 'item_type' or
+                'total'
+            proportion_days (int): Only use the most recent days of
+                history for the top-down proportions (default: all)
+        """
+        if level not in LEVELS:
+            raise ValueError(f"Unknown level {level}, expected one of {LEVELS}")
+            
+        self.forecaster = forecaster
+        self.level = level
+        self.proportion_days = proportion_days
+        self.item_types = None
+        self.proportions = None
+        self.nodes = []
+        
+    def build_series(self, daily, value='quantity'):
+        """
+        Aggregate daily item sales into zero-filled series for every node
+        
+        Args:
+            daily (pd.DataFrame): Daily sales with 'date', 'item_name',
+                'item_type' and the value column
+            value (str): Column to forecast
+            
+        Returns:
+            pd.DataFrame: Wide frame (date x node) with item, item_type
+                and total columns
+        """
+        grid = pd.date_range(daily['date'].min(), daily['date'].max(), freq='D')
+        items = (daily.pivot_table(index='date', columns='item_name',
+                                   values=value, aggfunc='sum')
+                      .reindex(grid, fill_value=0)
+                      .fillna(0))
+                      
+        self.item_types = (daily.drop_duplicates('item_name')
+                                .set_index('item_name')['item_type'])
+        types = items.T.groupby(self.item_types).sum().T
+        
+        wide = pd.concat([items, types.add_prefix('item_type:')], axis=1)
+        wide[TOTAL] = items.sum(axis=1)
+        wide.index.name = 'date'
+        return wide
+        
+    def _parent(self, item_name):
+        if self.level == 'item_type':
+            return f"item_type:{self.item_types[item_name]}"
+        return TOTAL
+        
+    def _fitted_nodes(self, wide):
+        if self.level == 'item_name':
+            return list(self.item_types.index)
+        if self.level == 'item_type':
+            return [column for column in wide.columns if column.startswith('item_type:')]
+        return [TOTAL]
+        
+    def fit(self, daily, value='quantity'):
+        """
+        Fit models at the chosen level and learn the top-down proportions
+        
+        Args:
+            daily (pd.DataFrame): Daily sales with 'date', 'item_name',
+                'item_type' and the value column
+            value (str): Column to forecast
+            
+        Returns:
+            dict: Training metrics by fitted node
+        """
+        wide = self.build_series(daily, value)
+        self.nodes = self._fitted_nodes(wide)
+        
+        history = wide
+        if self.proportion_days:
+            history = wide.iloc[-self.proportion_days:]
+        totals = history.sum()
+        self.proportions = pd.Series({
+            item_name: (totals[item_name] / totals[self._parent(item_name)]
+                        if totals[self._parent(item_name)] else 0.0)
+            for item_name in self.item_types.index
+        })
+        
+        series_by_node = {
+            node: pd.DataFrame({'date': wide.index, 'sales': wide[node].to_numpy()})
+            for node in self.nodes
+        }
+        return self.forecaster.fit_engines(series_by_node)
+        
+    def predict_frames(self, dates, uncertainty_samples=None):
+        """
+        Predict and reconcile every node of the hierarchy
+        
+        Interval bounds are reconciled the same way as the point
+        forecast, which treats them as perfectly correlated across nodes.
+        
+        Args:
+            dates (iterable): Dates to predict
+            uncertainty_samples (int): Override Prophet's number of
+                uncertainty samples
+                
+        Returns:
+            dict: Forecast frames indexed by date for every item,
+                item_type and the total
+        """
+        dates = pd.DatetimeIndex(dates).normalize()
+        groups = {}
+        for node in self.nodes:
+            groups.setdefault(self.forecaster.engine_for(node), []).append(node)
+            
+        fitted = {}
+        for name, group in groups.items():
+            engine = self.forecaster.get_engine(name)
+            fitted.update(engine.predict_frames(group, dates, uncertainty_samples))
+            
+        columns = ['yhat', 'yhat_lower', 'yhat_upper', 'trend']
+        fitted = {node: frame[columns] for node, frame in fitted.items()}
+        
+        if self.level == 'item_name':
+            items = fitted
+        else:
+            items = {
+                item_name: fitted[self._parent(item_name)] * self.proportions[item_name]
+                for item_name in self.item_types.index
+            }
+            
+        frames = dict(items)
+        for item_type, members in self.item_types.groupby(self.item_types).groups.items():
+            frames[f"item_type:{item_type}"] = sum(items[item_name] for item_name in members)
+        frames[TOTAL] = sum(items.values())
+        
+        # Keep the model's own forecast for the fitted level
+        frames.update(fitted)
+        return frames
+        
+    def forecast(self, days=30, return_components=False, uncertainty_samples=None):
+        """
+        Generate reconciled forecasts for every node
+        
+        Args:
+            days (int): Number of days to forecast
+            return_components (bool): Whether to return the trend component
+            uncertainty_samples (int): Override Prophet's number of
+                uncertainty samples
+                
+        Returns:
+            dict: Forecast results by node, in the forecast_sales format
+        """
+        today = pd.Timestamp(datetime.now()).normalize()
+        window = pd.date_range(today - timedelta(days=days), periods=2 * days, freq='D')
+        frames = self.predict_frames(window, uncertainty_samples)
+        
+        # Limit every node to the training history plus the forecast
+        # horizon, like SalesForecaster.forecast_many: items below the
+        # fitted level use their parent's span, aggregates above it the
+        # span of all fitted nodes
+        spans = {
+            node: self.forecaster.get_engine(self.forecaster.engine_for(node)).history_span(node)
+            for node in self.nodes
+        }
+        overall = (min(start for start, _ in spans.values()),
+                   max(end for _, end in spans.values()))
+        
+        results = {}
+        for node, frame in frames.items():
+            if node in spans:
+                history_start, history_end = spans[node]
+            elif node in self.item_types.index:
+                history_start, history_end = spans[self._parent(node)]
+            else:
+                history_start, history_end = overall
+            horizon_end = history_end + timedelta(days=days)
+            frame = frame[(frame.index >= history_start) & (frame.index <= horizon_end)]
+            results[node] = self.forecaster.format_forecast(node, days, frame, return_components)
+        return results
+
+def benchmark_hierarchy(daily, value='quantity', holdout_days=28,
+                        levels=LEVELS, engine='prophet'):
+    """
+    Compare fit time and item-level holdout accuracy across fit levels
+    
+    Args:
+        daily (pd.DataFrame): Daily sales with 'date', 'item_name',
+            'item_type' and the value column
+        value (str): Column to forecast
+        holdout_days (int): Number of trailing days held out for scoring
+        levels (iterable): Levels to fit at ('item_name' is the flat
+            per-item baseline)
+        engine (str): Forecasting engine used at every level
+        
+    Returns:
+        pd.DataFrame: One row per level with model count, fit time and
+            item-level MAE/RMSE on the holdout
+    """
+    cutoff = daily['date'].max() - timedelta(days=holdout_days)
+    train = daily[daily['date'] <= cutoff]
+    test = daily[daily['date'] > cutoff]
+    
+    test_dates = pd.date_range(cutoff + timedelta(days=1), daily['date'].max(), freq='D')
+    actual = (test.pivot_table(index='date', columns='item_name',
+                               values=value, aggfunc='sum')
+                  .reindex(test_dates, fill_value=0)
+                  .fillna(0))
+                  
+    rows = []
+    for level in levels:
+        with tempfile.TemporaryDirectory() as model_dir:
+            forecaster = SalesForecaster(model_dir=model_dir, default_engine=engine)
+            hierarchy = HierarchicalForecaster(forecaster, level=level)
+            
+            start = time.perf_counter()
+            hierarchy.fit(train, value)
+            fit_seconds = time.perf_counter() - start
+            
+            frames = hierarchy.predict_frames(test_dates, uncertainty_samples=0)
+            
+        items = [item_name for item_name in hierarchy.item_types.index
+                 if item_name in actual.columns]
+        y_true = np.concatenate([actual[item_name].to_numpy() for item_name in items])
+        y_pred = np.concatenate([
+            frames[item_name]['yhat'].reindex(test_dates).to_numpy()
+            for item_name in items
+        ])
+        
+        rows.append({
+            'level': level,
+            'models': len(hierarchy.nodes),
+            'fit_seconds': fit_seconds,
+            'item_mae': mean_absolute_error(y_true, y_pred),
+            'item_rmse': np.sqrt(mean_squared_error(y_true, y_pred))
+        })
+        
+    return pd.DataFrame(rows)
+
+def main():
+    # Example usage
+    try:
+        daily = SalesIngestor().load_daily('../../public/files/sales_data.csv')
+        
+        forecaster = SalesForecaster()
+        hierarchy = HierarchicalForecaster(forecaster, level='item_type')
+        metrics = hierarchy.fit(daily)
+        print(f"Fitted {len(metrics)} models for {len(hierarchy.item_types)} items")
+        
+        forecasts = hierarchy.forecast(days=14)
+        print(f"Generated reconciled forecasts for {len(forecasts)} nodes")
+        
+        print(benchmark_hierarchy(daily).to_string(index=False))
+        
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import time
+
+class InsightCache:
+    def __init__(self, cache_dir='cache/insights', ttl_seconds=7 * 24 * 3600,
+                 max_entries=512, max_bytes=16 * 2 ** 20):
+        """
+        Initialize a persistent cache of generated insight text
+        
+        Entries are content addressed by a hash of the model name and the
+        full prompt, so an insight is reused exactly when the data it was
+        generated from is unchanged. Each entry is one JSON file. Entries
+        expire ttl_seconds after they were created, however often they
+        are used; expired entries are dropped on read and on every put,
+        and the least recently used entries are evicted when the cache
+        exceeds its size limits.
+        
+        Args:
+            cache_dir (str): Directory for cache entries
+            ttl_seconds (float): Maximum entry age (None keeps entries
+                until evicted)
+            max_entries (int): Maximum number of entries
+            max_bytes (int): Maximum total size of the entries in bytes
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        
+    @staticmethod
+    def key(model_name, prompt):
+        """
+        Compute the cache key of a prompt
+        
+        Args:
+            model_name (str): Name of the model answering the prompt
+            prompt (str): Full prompt text
+            
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        digest.update(model_name.encode())
+        digest.update(b'\0')
+        digest.update(prompt.encode())
+        return digest.hexdigest()
+        
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+        
+    def get(self, key):
+        """
+        Look up a cached insight
+        
+        Args:
+            key (str): Cache key from key()
+            
+        Returns:
+            str: Cached text, or None when missing or expired
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+            
+        if self._expired(entry, time.time()):
+            self._remove(path)
+            self.misses += 1
+            return None
+            
+        # The modification time tracks the last use for eviction
+        os.utime(path)
+        self.hits += 1
+        return entry['text']
+        
+    def put(self, key, text, model_name=None):
+        """
+        Store an insight and evict entries over the size limits
+        
+        Args:
+            key (str): Cache key from key()
+            text (str): Insight text
+            model_name (str): Model that generated the text
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'model': model_name, 'created': time.time(), 'text': text}, f)
+        os.replace(tmp_path, path)
+        self._evict()
+        
+    def _expired(self, entry, now):
+        return self.ttl_seconds is not None and now - entry['created'] > self.ttl_seconds
+        
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+        
+    def _evict(self):
+        entries = self._entries()
+        if self.ttl_seconds is not None:
+            # Same rule as get(): age since creation, read from the entry
+            now = time.time()
+            live = []
+            for entry in entries:
+                try:
+                    with open(entry[2], 'r') as f:
+                        expired = self._expired(json.load(f), now)
+                except (OSError, ValueError, KeyError):
+                    expired = True
+                if expired:
+                    self._remove(entry[2])
+                else:
+                    live.append(entry)
+            entries = live
+            
+        total_bytes = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            over_entries = self.max_entries is not None and len(entries) > self.max_entries
+            over_bytes = self.max_bytes is not None and total_bytes > self.max_bytes
+            if not (over_entries or over_bytes):
+                break
+            self._remove(path)
+            entries = entries[1:]
+            total_bytes -= size
+            
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+            
+    def clear(self):
+        """
+        Remove every entry
+        """
+        for _, _, path in self._entries():
+            self._remove(path)
+            
+    def get_stats(self):
+        """
+        Get cache statistics
+        
+        Returns:
+            dict: Hits, misses, number of entries and their total size
+        """
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries)
+        }
@@ -0,0 +1,191 @@
+import os
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from dashboard_schema import normalize_section, to_legacy, encode, decode
+from benchmark_dataset import SCALE_FACTORS, load_benchmark_dataset
+from local_insights import LocalInsightEngine
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _run_seconds(args, env=None):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=SCRIPT_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def benchmark_startup(repeats=10, commands=None):
+    """
+    Measure the wall-clock startup time of the insights entry point
+    
+    Every command runs in a fresh interpreter, so the timings include
+    interpreter start and module imports. The bare interpreter is timed
+    as a baseline. The offline run also includes its cached and local
+    fallback insights and the output write; it writes to a temporary
+    directory so the dashboard's combined insights are left untouched.
+    
+    Args:
+        repeats (int): Runs per command
+        commands (dict): Interpreter arguments by label (defaults to the
+            import, an offline run and the baseline)
+            
+    Returns:
+        pd.DataFrame: Median, min and max seconds per command
+    """
+    with tempfile.TemporaryDirectory(prefix='insights_startup_') as output_dir:
+        if commands is None:
+            output_path = os.path.join(output_dir, 'combined_insights.json')
+            commands = {
+                'python (baseline)': ['-c', 'pass'],
+                'import generate_insights': ['-c', 'import generate_insights'],
+                'generate_insights.py --offline': ['generate_insights.py', '--offline',
+                                                   '--output', output_path]
+            }
+            
+        env = dict(os.environ, INSIGHTS_OFFLINE='1')
+        rows = []
+        for label, args in commands.items():
+            # The first run warms the filesystem and bytecode caches
+            _run_seconds(args, env)
+            timings = [_run_seconds(args, env) for _ in range(repeats)]
+            rows.append({
+                'command': label,
+                'median_seconds': float(np.median(timings)),
+                'min_seconds': min(timings),
+                'max_seconds': max(timings)
+            })
+            
+    return pd.DataFrame(rows)
+
+def _median_seconds(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+def waste_section(scale='SF1', output_dir='benchmark_data'):
+    """
+    Build waste dashboard data in the numeric schema from a benchmark
+    dataset, with one high risk item per wasted ingredient and one entry
+    per category
+    """
+    files = load_benchmark_dataset(scale, output_dir)['files']
+    waste = pd.read_csv(files['waste'])
+    expiry = pd.read_csv(files['restaurant_inventory']).set_index('Item')['Expiration_Days']
+    by_item = waste.groupby('item_name').agg(quantity=('quantity', 'sum'), unit=('unit', 'first'),
+                                             cost=('cost', 'sum'))
+    by_category = waste.groupby('category')['cost'].sum()
+    total = by_category.sum()
+    return normalize_section('waste', {
+        'totalWasteCost': round(float(total)),
+        'trend': 'down',
+        'trendPercentage': 7.4,
+        'highRiskItems': [
+            {'name': name, 'expiryDays': int(expiry.get(name, 0)),
+             'quantity': round(float(row.quantity), 1), 'quantityUnit': row.unit,
+             'potentialLoss': round(float(row.cost))}
+            for name, row in by_item.iterrows()
+        ],
+        'wasteByCategory': [
+            {'category': category, 'amount': round(float(cost)),
+             'percentage': round(float(cost / total * 100), 1)}
+            for category, cost in by_category.items()
+        ],
+        'recommendations': []
+    })
+
+def benchmark_dashboard_schema(scale='SF1', repeats=5):
+    """
+    Compare the legacy string-formatted dashboard JSON with the numeric
+    schema, as JSON and (when msgpack is installed) MessagePack
+    
+    Parse times include what a consumer needs to get numbers out: legacy
+    payloads are normalized after decoding.
+    
+    Args:
+        scale (str): Benchmark dataset the waste section is built from
+            (see waste_section)
+        repeats (int): Timed runs per measurement
+        
+    Returns:
+        pd.DataFrame: Payload bytes and median serialize/parse seconds
+    """
+    data = waste_section(scale)
+    legacy = to_legacy('waste', data)
+    
+    variants = {
+        'legacy json': (legacy, False, True),
+        'schema json': (data, False, False)
+    }
+    try:
+        import msgpack
+        variants['schema msgpack'] = (data, True, False)
+    except ImportError:
+        print("msgpack is not installed, skipping the binary encoding")
+        
+    rows = []
+    for label, (payload, binary, needs_normalize) in variants.items():
+        encoded = encode(payload, binary)
+        
+        def parse():
+            decoded = decode(encoded, binary)
+            return normalize_section('waste', decoded) if needs_normalize else decoded
+            
+        rows.append({
+            'format': label,
+            'bytes': len(encoded),
+            'serialize_seconds': _median_seconds(lambda: encode(payload, binary), repeats),
+            'parse_seconds': _median_seconds(parse, repeats)
+        })
+        
+    return pd.DataFrame(rows)
+
+def benchmark_local_insights(scale='SF1', repeats=3):
+    """
+    Time the local insight engine over a benchmark dataset's CSV files
+    
+    Args:
+        scale (str): 'SF1', 'SF10' or 'SF100'
+        repeats (int): Timed runs (the median is reported)
+        
+    Returns:
+        pd.DataFrame: Median seconds per section
+    """
+    manifest = load_benchmark_dataset(scale)
+    files = manifest['files']
+    engine = LocalInsightEngine(
+        sales_path=files['sales'],
+        waste_path=files['waste'],
+        indian_inventory_path=files['indian_inventory'],
+        restaurant_inventory_path=files['restaurant_inventory'],
+        as_of=manifest['end_date']
+    )
+    tables = {'sales': 'sales', 'waste': 'waste', 'inventory': 'ingredients'}
+    return pd.DataFrame([
+        {'section': section, 'rows': manifest['rows'][table],
+         'median_seconds': _median_seconds(lambda: engine.insights((section,)), repeats)}
+        for section, table in tables.items()
+    ])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the insights pipeline")
+    parser.add_argument('--scale', default='SF1', choices=sorted(SCALE_FACTORS),
+                        help="benchmark dataset scale factor")
+    args = parser.parse_args()
+    
+    try:
+        print(benchmark_startup().to_string(index=False))
+        print(benchmark_dashboard_schema(args.scale).to_string(index=False))
+        print(benchmark_local_insights(args.scale).to_string(index=False))
+        
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
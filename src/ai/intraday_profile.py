@@ -0,0 +1,264 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+from sales_ingestion import iter_transactions, log_fingerprint, log_unchanged
+
+TIME_BUCKETS = ['Morning', 'Afternoon', 'Evening', 'Night', 'Midnight']
+PROFILE_KEYS = ['item_name', 'weekday', 'time_of_sale']
+
+class IntradayProfile:
+    def __init__(self):
+        """
+        Initialize the intraday demand profile
+        
+        The profile accumulates sold quantity per (item, weekday,
+        time_of_sale bucket). It is updated incrementally from chunks of
+        the transaction log and projected onto daily forecasts to get
+        per-slot preparation quantities and peak periods.
+        """
+        self.reset()
+        
+    def reset(self):
+        """Drop the accumulated profile and the position in the sales log"""
+        self.counts = pd.Series(
+            dtype='float64',
+            index=pd.MultiIndex.from_arrays([[], [], []], names=PROFILE_KEYS)
+        )
+        self.rows_seen = 0
+        self.source = None
+        self.first_date = None
+        self.last_date = None
+        
+    def update(self, transactions):
+        """
+        Add a chunk of transactions to the profile
+        
+        Rows without a date, time of sale or quantity are skipped.
+        
+        Args:
+            transactions (pd.DataFrame): Transactions with 'date',
+                'item_name', 'time_of_sale' and 'quantity'
+        """
+        dates = pd.to_datetime(transactions['date'])
+        frame = pd.DataFrame({
+            'item_name': transactions['item_name'].astype(str),
+            'weekday': dates.dt.dayofweek,
+            'time_of_sale': transactions['time_of_sale'],
+            'quantity': transactions['quantity']
+        }).dropna(subset=['weekday', 'time_of_sale', 'quantity'])
+        frame['weekday'] = frame['weekday'].astype(int)
+        frame['time_of_sale'] = frame['time_of_sale'].astype(str)
+        
+        counts = frame.groupby(PROFILE_KEYS)['quantity'].sum()
+        self.counts = self.counts.add(counts, fill_value=0)
+        
+        if dates.notna().any():
+            first, last = dates.min().normalize(), dates.max().normalize()
+            self.first_date = first if self.first_date is None else min(self.first_date, first)
+            self.last_date = last if self.last_date is None else max(self.last_date, last)
+            
+    def update_from_csv(self, csv_path, chunksize=1_000_000):
+        """
+        Add the rows appended to a sales log since the last update
+        
+        When the log was rewritten or truncated since then, the profile
+        is rebuilt from the whole file.
+        
+        Args:
+            csv_path (str): Path to a sales_data.csv style log
+            chunksize (int): Rows parsed per chunk
+            
+        Returns:
+            int: Number of new rows processed
+        """
+        if self.rows_seen and not log_unchanged(csv_path, self.source):
+            print(f"{csv_path} was rewritten since the last update, rebuilding the profile")
+            self.reset()
+        self.source = log_fingerprint(csv_path)
+        
+        processed = 0
+        for chunk in iter_transactions(csv_path, chunksize, skip_rows=self.rows_seen):
+            self.update(chunk)
+            processed += len(chunk)
+            
+        self.rows_seen += processed
+        return processed
+        
+    def shares(self):
+        """
+        Compute each time bucket's share of an item's demand per weekday
+        
+        Weekdays without history for an item fall back to the item's
+        overall profile.
+        
+        Returns:
+            pd.DataFrame: Shares indexed by (item_name, weekday) with one
+                column per time bucket
+        """
+        by_weekday = self.counts.unstack('time_of_sale', fill_value=0)
+        by_item = self.counts.groupby(['item_name', 'time_of_sale']).sum() \
+                             .unstack('time_of_sale', fill_value=0)
+        
+        items = by_item.index
+        full_index = pd.MultiIndex.from_product([items, range(7)], names=['item_name', 'weekday'])
+        buckets = [bucket for bucket in TIME_BUCKETS if bucket in by_item.columns] + \
+                  [bucket for bucket in by_item.columns if bucket not in TIME_BUCKETS]
+        
+        weekday_counts = by_weekday.reindex(index=full_index, columns=buckets, fill_value=0)
+        item_counts = by_item.reindex(columns=buckets, fill_value=0) \
+                             .reindex(full_index.get_level_values('item_name'))
+        item_counts.index = full_index
+        
+        totals = weekday_counts.sum(axis=1)
+        counts = weekday_counts.where(totals > 0, item_counts, axis=0)
+        return counts.div(counts.sum(axis=1).replace(0, np.nan), axis=0).fillna(0)
+        
+    def baseline_forecast(self, dates):
+        """
+        Forecast daily item demand from the profile's weekday averages
+        
+        A fallback for when no SalesForecaster forecast is available.
+        
+        Args:
+            dates (iterable): Dates to forecast
+            
+        Returns:
+            pd.DataFrame: 'date', 'item_name' and 'quantity' columns
+        """
+        history_days = (self.last_date - self.first_date).days + 1
+        weeks = max(history_days / 7, 1)
+        per_weekday = (self.counts.groupby(['item_name', 'weekday']).sum() / weeks) \
+                          .rename('quantity').reset_index()
+        calendar = pd.DataFrame({'date': pd.DatetimeIndex(dates).normalize()})
+        calendar['weekday'] = calendar['date'].dt.dayofweek
+        return calendar.merge(per_weekday, on='weekday')[['date', 'item_name', 'quantity']]
+        
+    def project(self, daily_forecast):
+        """
+        Split daily item forecasts into per-slot preparation quantities
+        
+        Args:
+            daily_forecast (pd.DataFrame): 'date', 'item_name' and
+                'quantity' columns
+                
+        Returns:
+            pd.DataFrame: 'date', 'item_name', 'time_of_sale' and
+                'prep_quantity' columns
+        """
+        shares = self.shares().stack().rename('share').reset_index()
+        forecast = daily_forecast.assign(
+            weekday=pd.to_datetime(daily_forecast['date']).dt.dayofweek
+        )
+        projected = forecast.merge(shares, on=['item_name', 'weekday'])
+        projected['prep_quantity'] = projected['quantity'] * projected['share']
+        return projected[['date', 'item_name', 'time_of_sale', 'prep_quantity']]
+        
+    def peak_hours(self, top_n=3, daily_forecast=None):
+        """
+        Rank time buckets by demand
+        
+        Args:
+            top_n (int): Number of buckets to return
+            daily_forecast (pd.DataFrame): Rank by projected demand for
+                these forecasts instead of historical demand
+                
+        Returns:
+            list: Busiest time buckets, busiest first
+        """
+        if daily_forecast is not None:
+            demand = self.project(daily_forecast).groupby('time_of_sale')['prep_quantity'].sum()
+        else:
+            demand = self.counts.groupby('time_of_sale').sum()
+        return demand.sort_values(ascending=False).index[:top_n].tolist()
+        
+    def prep_schedule(self, daily_forecast):
+        """
+        Summarize projected preparation quantities over the forecast
+        window for the dashboard
+        
+        Args:
+            daily_forecast (pd.DataFrame): 'date', 'item_name' and
+                'quantity' columns
+                
+        Returns:
+            list: One entry per time bucket with the total and per-item
+                quantities
+        """
+        projected = self.project(daily_forecast)
+        per_item = projected.groupby(['time_of_sale', 'item_name'])['prep_quantity'].sum()
+        
+        schedule = []
+        for bucket in TIME_BUCKETS:
+            if bucket not in per_item.index.get_level_values('time_of_sale'):
+                continue
+            items = per_item.loc[bucket].sort_values(ascending=False)
+            schedule.append({
+                "timeOfSale": bucket,
+                "quantity": round(float(items.sum())),
+                "items": {item_name: round(float(quantity)) for item_name, quantity in items.items()}
+            })
+        return schedule
+        
+    def save(self, path):
+        """
+        Save the profile state
+        
+        Args:
+            path (str): Path of the JSON state file
+        """
+        state = {
+            'rows_seen': self.rows_seen,
+            'source': self.source,
+            'first_date': self.first_date.isoformat() if self.first_date is not None else None,
+            'last_date': self.last_date.isoformat() if self.last_date is not None else None,
+            'counts': [
+                [item_name, int(weekday), bucket, float(quantity)]
+                for (item_name, weekday, bucket), quantity in self.counts.items()
+            ]
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        
+    def load(self, path):
+        """
+        Load profile state written by save()
+        
+        Args:
+            path (str): Path of the JSON state file
+        """
+        with open(path, 'r') as f:
+            state = json.load(f)
+            
+        self.rows_seen = state['rows_seen']
+        self.source = state.get('source')
+        self.first_date = pd.Timestamp(state['first_date']) if state['first_date'] else None
+        self.last_date = pd.Timestamp(state['last_date']) if state['last_date'] else None
+        counts = pd.DataFrame(state['counts'], columns=PROFILE_KEYS + ['quantity'])
+        self.counts = counts.set_index(PROFILE_KEYS)['quantity']
+
+def main():
+    # Example usage
+    profile = IntradayProfile()
+    
+    try:
+        state_path = 'intraday_profile.json'
+        if os.path.exists(state_path):
+            profile.load(state_path)
+            
+        new_rows = profile.update_from_csv('../../public/files/sales_data.csv')
+        profile.save(state_path)
+        print(f"Processed {new_rows} new transactions ({profile.rows_seen} total)")
+        
+        dates = pd.date_range(pd.Timestamp.now().normalize(), periods=7, freq='D')
+        forecast = profile.baseline_forecast(dates)
+        print(f"Peak periods: {profile.peak_hours(daily_forecast=forecast)}")
+        print(json.dumps(profile.prep_schedule(forecast), indent=2))
+        
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
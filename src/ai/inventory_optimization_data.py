@@ -1,5 +1,6 @@
 import numpy as np
 import json
+from dashboard_schema import SCHEMA_VERSION, CURRENCY
 from datetime import datetime, timedelta
 
 def generate_inventory_data():
@@ -16,29 +17,35 @@ def generate_inventory_data():
         
         stock_levels.append({
             "category": category,
-            "currentLevel": f"{level}%",
+            "currentLevel": level,
             "status": status,
-            "value": f"₹{np.random.randint(5000, 15000):,}"
+            "value": np.random.randint(5000, 15000)
         })
-    
+        
     # Generate reorder suggestions
     reorder_suggestions = [
         {
             "item": "Basmati Rice",
-            "currentStock": "5 kg",
-            "suggestedOrder": "25 kg",
+            "currentStock": 5,
+            "currentStockUnit": "kg",
+            "suggestedOrder": 25,
+            "suggestedOrderUnit": "kg",
             "urgency": "high"
         },
         {
             "item": "Cooking Oil",
-            "currentStock": "10 L",
-            "suggestedOrder": "20 L",
+            "currentStock": 10,
+            "currentStockUnit": "L",
+            "suggestedOrder": 20,
+            "suggestedOrderUnit": "L",
             "urgency": "medium"
         },
         {
             "item": "Tomatoes",
-            "currentStock": "3 kg",
-            "suggestedOrder": "10 kg",
+            "currentStock": 3,
+            "currentStockUnit": "kg",
+            "suggestedOrder": 10,
+            "suggestedOrderUnit": "kg",
             "urgency": "high"
         }
     ]
@@ -49,9 +56,11 @@ def generate_inventory_data():
     
     # Generate synthetic data
     inventory_data = {
-        "efficiencyScore": f"{base_efficiency}%",
+        "schemaVersion": SCHEMA_VERSION,
+        "currency": CURRENCY,
+        "efficiencyScore": base_efficiency,
         "trend": "up",  # Assuming improvement
-        "trendPercentage": f"{abs(round(trend_percentage, 1))}%",
+        "trendPercentage": abs(round(trend_percentage, 1)),
         "stockLevels": stock_levels,
         "reorderSuggestions": reorder_suggestions,
         "recommendations": [
@@ -71,6 +80,6 @@ if __name__ == "__main__":
     # Save to JSON file
     with open('inventory_optimization.json', 'w') as f:
         json.dump(data, f, indent=2)
-    
+        
     print("Generated inventory optimization data:")
     print(json.dumps(data, indent=2)) 
\ No newline at end of file
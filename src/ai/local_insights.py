@@ -0,0 +1,308 @@
+import pandas as pd
+import numpy as np
+import os
+import time
+import argparse
+from sales_ingestion import iter_transactions
+from waste_ingestion import iter_waste_log
+
+def _percent_change(current, previous):
+    return (current - previous) / previous * 100 if previous else 0.0
+
+def _trend_word(change, flat_band=2.0):
+    if change > flat_band:
+        return 'up'
+    if change < -flat_band:
+        return 'down'
+    return 'flat'
+
+def _window_totals(dates, values, window_days):
+    """
+    Sum values over the last window_days up to the latest date and over
+    the window before it
+    """
+    end = dates.max()
+    days_back = (end - dates).dt.days.to_numpy()
+    values = np.asarray(values, dtype=float)
+    current = values[days_back < window_days].sum()
+    previous = values[(days_back >= window_days) & (days_back < 2 * window_days)].sum()
+    return current, previous
+
+def _chunked_sums(chunks, value, keys):
+    """
+    Sum a value per day and per key column over a chunked log, so memory
+    grows with the number of days and keys instead of rows
+    
+    Returns:
+        tuple: (sums indexed by day, dict of sums indexed by each key)
+    """
+    daily = pd.Series(dtype='float64')
+    by_key = {key: pd.Series(dtype='float64') for key in keys}
+    for chunk in chunks:
+        chunk = chunk.dropna(subset=['date'])
+        daily = daily.add(chunk.groupby(chunk['date'].dt.normalize())[value].sum(), fill_value=0)
+        for key in keys:
+            # Plain objects, since every chunk has its own categories
+            sums = chunk.groupby(chunk[key].astype(object))[value].sum()
+            by_key[key] = by_key[key].add(sums, fill_value=0)
+    return daily, by_key
+
+class LocalInsightEngine:
+    def __init__(self, sales_path='../../public/files/sales_data.csv',
+                 waste_path='../../public/files/waste_management_data.csv',
+                 indian_inventory_path='../../public/files/indian_restaurant_inventory.csv',
+                 restaurant_inventory_path='../../public/files/restaurant_inventory_data.csv',
+                 window_days=30, expiry_days=3, as_of=None):
+        """
+        Initialize insights computed directly from the raw CSV files
+        
+        Sales and waste trends compare the last window_days up to each
+        log's latest date with the window before it. Expiry is measured
+        from as_of.
+        
+        Args:
+            sales_path (str): Path to sales_data.csv
+            waste_path (str): Path to waste_management_data.csv
+            indian_inventory_path (str): Path to indian_restaurant_inventory.csv
+            restaurant_inventory_path (str): Path to restaurant_inventory_data.csv
+            window_days (int): Days per trend window
+            expiry_days (int): Items expiring within this many days are
+                high risk
+            as_of (str): Reference date for expiry (defaults to today)
+        """
+        self.sales_path = sales_path
+        self.waste_path = waste_path
+        self.indian_inventory_path = indian_inventory_path
+        self.restaurant_inventory_path = restaurant_inventory_path
+        self.window_days = window_days
+        self.expiry_days = expiry_days
+        self.as_of = pd.Timestamp(as_of).normalize() if as_of else pd.Timestamp.today().normalize()
+        
+    def sales_summary(self):
+        """
+        Summarize revenue trend, top items and the busiest time of day
+        
+        Returns:
+            dict: Summary statistics (None when the log is missing)
+        """
+        if not os.path.exists(self.sales_path):
+            return None
+        daily, by_key = _chunked_sums(iter_transactions(self.sales_path), 'transaction_amount',
+                                      ['item_name', 'time_of_sale'])
+        
+        current, previous = _window_totals(pd.Series(daily.index), daily, self.window_days)
+        change = _percent_change(current, previous)
+        by_item = by_key['item_name'].sort_values(ascending=False)
+        by_time = by_key['time_of_sale']
+        by_weekday = daily.groupby(daily.index.day_name()).sum()
+        
+        return {
+            'total_revenue': float(daily.sum()),
+            'window_revenue': float(current),
+            'trend': _trend_word(change),
+            'trend_percentage': float(change),
+            'top_items': [(str(item), float(revenue)) for item, revenue in by_item.head(3).items()],
+            'top_item_share': float(by_item.iloc[0] / by_item.sum() * 100) if len(by_item) else 0.0,
+            'peak_time': str(by_time.idxmax()) if len(by_time) else None,
+            'best_weekday': str(by_weekday.idxmax()) if len(by_weekday) else None
+        }
+        
+    def waste_summary(self):
+        """
+        Summarize waste cost trend and the costliest categories and items
+        
+        Returns:
+            dict: Summary statistics (None when the log is missing)
+        """
+        if not os.path.exists(self.waste_path):
+            return None
+        daily, by_key = _chunked_sums(iter_waste_log(self.waste_path), 'cost',
+                                      ['category', 'item_name'])
+        
+        current, previous = _window_totals(pd.Series(daily.index), daily, self.window_days)
+        change = _percent_change(current, previous)
+        total = daily.sum()
+        by_category = by_key['category'].sort_values(ascending=False)
+        by_item = by_key['item_name'].sort_values(ascending=False)
+        
+        return {
+            'total_cost': float(total),
+            'window_cost': float(current),
+            'trend': _trend_word(change),
+            'trend_percentage': float(change),
+            'top_categories': [(str(category), float(cost), float(cost / total * 100))
+                               for category, cost in by_category.head(3).items()],
+            'top_items': [(str(item), float(cost)) for item, cost in by_item.head(3).items()]
+        }
+        
+    def inventory_summary(self):
+        """
+        Summarize expired and soon-expiring items and low-stock categories
+        
+        Returns:
+            dict: Summary statistics (None when both files are missing)
+        """
+        expiring = pd.DataFrame(columns=['name', 'days_left', 'value'])
+        low_stock = pd.Series(dtype='int64')
+        found = False
+        
+        if os.path.exists(self.indian_inventory_path):
+            found = True
+            indian = pd.read_csv(self.indian_inventory_path)
+            days_left = (pd.to_datetime(indian['Expiration Date'], errors='coerce')
+                         - self.as_of).dt.days
+            at_risk = days_left <= self.expiry_days
+            expiring = pd.DataFrame({
+                'name': indian['Name'][at_risk],
+                'days_left': days_left[at_risk],
+                'value': indian['Cost'][at_risk]
+            }).sort_values(['days_left', 'value'], ascending=[True, False])
+            low = indian['Quantity'] < indian['Min Quantity']
+            low_stock = indian['Category'][low].str.lower().value_counts()
+            
+        if os.path.exists(self.restaurant_inventory_path):
+            found = True
+            restaurant = pd.read_csv(self.restaurant_inventory_path)
+            low = restaurant['Current_Stock'] < restaurant['Threshold']
+            low_stock = low_stock.add(restaurant['Category'][low].str.lower().value_counts(),
+                                      fill_value=0).astype('int64')
+        
+        if not found:
+            return None
+            
+        low_stock = low_stock.sort_values(ascending=False)
+        expired = expiring['days_left'] < 0
+        return {
+            'expired_items': int(expired.sum()),
+            'expiring_items': int((~expired).sum()),
+            'at_risk_value': float(expiring['value'].sum()),
+            'most_urgent': expiring[~expired]['name'].head(3).tolist(),
+            'low_stock_items': int(low_stock.sum()),
+            'low_stock_categories': [(str(category), int(count))
+                                     for category, count in low_stock.head(3).items()]
+        }
+        
+    def sales_insight(self, summary=None):
+        summary = summary or self.sales_summary()
+        if not summary or not summary['top_items']:
+            return None
+        items = ', '.join(item for item, _ in summary['top_items'])
+        return (
+            f"Revenue is {summary['trend']} {abs(summary['trend_percentage']):.0f}% over the last "
+            f"{self.window_days} days (₹{summary['window_revenue']:,.0f}). "
+            f"{items} lead sales, with {summary['top_items'][0][0]} alone at "
+            f"{summary['top_item_share']:.0f}% of revenue. "
+            f"{summary['peak_time']} and {summary['best_weekday']}s are the busiest; staff and "
+            f"prep for them first."
+        )
+        
+    def waste_insight(self, summary=None):
+        summary = summary or self.waste_summary()
+        if not summary or not summary['top_categories']:
+            return None
+        category, cost, share = summary['top_categories'][0]
+        items = ', '.join(item for item, _ in summary['top_items'])
+        return (
+            f"Waste cost is {summary['trend']} {abs(summary['trend_percentage']):.0f}% over the "
+            f"last {self.window_days} days (cost {summary['window_cost']:,.0f}). "
+            f"{category.title()} accounts for {share:.0f}% of all logged waste "
+            f"(cost {cost:,.0f}); "
+            f"{items} are the costliest items to target first."
+        )
+        
+    def inventory_insight(self, summary=None):
+        summary = summary or self.inventory_summary()
+        if summary is None:
+            return None
+        parts = []
+        if summary['expired_items']:
+            parts.append(f"{summary['expired_items']} items are past expiry and should be cleared.")
+        if summary['expiring_items']:
+            parts.append(f"{summary['expiring_items']} items expire within {self.expiry_days} "
+                         f"days ({', '.join(summary['most_urgent'])}); use them first.")
+        if summary['low_stock_categories']:
+            categories = ', '.join(f"{category} ({count})"
+                                   for category, count in summary['low_stock_categories'])
+            parts.append(f"{summary['low_stock_items']} items are below their reorder level, "
+                         f"mostly {categories}.")
+        return ' '.join(parts) or "Stock levels and expiry dates need no immediate action."
+        
+    def insights(self, sections=('sales', 'waste', 'inventory')):
+        """
+        Render the insight text for each section
+        
+        Args:
+            sections (tuple): Sections to render
+            
+        Returns:
+            dict: Insight text by section (sections without data are
+                left out)
+        """
+        renderers = {
+            'sales': self.sales_insight,
+            'waste': self.waste_insight,
+            'inventory': self.inventory_insight
+        }
+        texts = {section: renderers[section]() for section in sections}
+        return {section: text for section, text in texts.items() if text}
+
+def polish_prompt(text):
+    return f"""
+    Rewrite this restaurant dashboard insight as a BRIEF insight (2-3 sentences).
+    Keep every number and item name unchanged and do not add new facts:
+    {text}
+    """
+
+def polish_insights(insights, client=None, cache=None, timeout=20.0, retries=1):
+    """
+    Rewrite locally computed insights with an LLM, keeping the local text
+    for any section whose call fails
+    
+    Args:
+        insights (dict): Insight text by section
+        client: LLM client (defaults to generate_insights.get_client())
+        cache (InsightCache): Cache for the rewritten text
+        timeout (float): Deadline in seconds for each call
+        retries (int): Retries after the first attempt
+        
+    Returns:
+        dict: Rewritten insight text by section
+    """
+    from generate_insights import generate_insights
+    return generate_insights(
+        insights,
+        client=client,
+        timeout=timeout,
+        retries=retries,
+        cache=cache,
+        prompt_builders={section: polish_prompt for section in insights},
+        fallbacks=insights
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute dashboard insights from the CSV files")
+    parser.add_argument('--polish', action='store_true',
+                        help="rewrite the insights with the configured LLM")
+    parser.add_argument('--as-of', help="reference date for expiry (default: today)")
+    args = parser.parse_args()
+    
+    try:
+        engine = LocalInsightEngine(as_of=args.as_of)
+        start = time.perf_counter()
+        insights = engine.insights()
+        elapsed = time.perf_counter() - start
+        
+        if args.polish:
+            insights = polish_insights(insights)
+            
+        print(f"=== Local Insights ({elapsed * 1000:.0f} ms) ===\n")
+        for section, text in insights.items():
+            print(f"{section.title()}:")
+            print("-" * 50)
+            print(f"{text}\n")
+            
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
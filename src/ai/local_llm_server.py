@@ -0,0 +1,105 @@
+import json
+import random
+import re
+import threading
+import time
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class StandInLLMHandler(BaseHTTPRequestHandler):
+    """
+    Answer generate requests like a slow, occasionally failing LLM
+    
+    POST a JSON body {"model": ..., "prompt": ...} to get {"text": ...}.
+    Prompts asking for a JSON object get one with a short insight per
+    requested key.
+    """
+    latency = 0.5
+    jitter = 0.2
+    failure_rate = 0.0
+    
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            prompt = json.loads(self.rfile.read(length))['prompt']
+        except (ValueError, KeyError):
+            self._reply(400, {'error': 'expected a JSON body with a prompt'})
+            return
+        with self.server.lock:
+            self.server.requests += 1
+            
+        time.sleep(max(self.latency + random.uniform(-self.jitter, self.jitter), 0))
+        if random.random() < self.failure_rate:
+            self._reply(503, {'error': 'overloaded'})
+            return
+            
+        self._reply(200, {'text': self._answer(prompt)})
+        
+    def _answer(self, prompt):
+        keys = re.search(r'JSON object\s+with the keys (.+?), each', prompt, re.DOTALL)
+        if keys:
+            sections = re.findall(r'"(\w+)"', keys.group(1))
+            return json.dumps({
+                section: f"Stand-in {section} insight: review the latest {section} figures."
+                for section in sections
+            })
+            
+        topic = re.search(r'Analyze this (.+?) data', prompt)
+        topic = topic.group(1) if topic else 'dashboard'
+        return f"Stand-in insight for the {topic} data. Focus on the largest changes first."
+        
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def log_message(self, format, *args):
+        pass
+
+def start_server(port=0, latency=0.5, jitter=0.2, failure_rate=0.0):
+    """
+    Start the stand-in LLM server on a background thread
+    
+    Args:
+        port (int): Port to listen on (0 picks a free port)
+        latency (float): Mean response delay in seconds
+        jitter (float): Maximum deviation from the mean delay
+        failure_rate (float): Probability of answering 503
+        
+    Returns:
+        tuple: (server, URL to set as INSIGHTS_LLM_URL); server.requests
+            counts the generate requests received, and server.shutdown()
+            stops it
+    """
+    handler = type('ConfiguredHandler', (StandInLLMHandler,), {
+        'latency': latency,
+        'jitter': jitter,
+        'failure_rate': failure_rate
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.requests = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/generate"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stand-in LLM server for local testing")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--jitter', type=float, default=0.2)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    
+    server, url = start_server(args.port, args.latency, args.jitter, args.failure_rate)
+    print(f"Stand-in LLM listening on {url} (set INSIGHTS_LLM_URL to use it)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
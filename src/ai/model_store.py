@@ -0,0 +1,242 @@
+import os
+import re
+import json
+from collections import OrderedDict
+
+import joblib
+from prophet.serialize import model_to_json, model_from_json
+
+# Characters not allowed in Windows file names, plus '%' so the encoding
+# stays unambiguous
+_UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*%]')
+
+def file_stem(name):
+    """
+    Encode a model name for use in a file name ('item_type:Fastfood' ->
+    'item_type%3AFastfood'); names without unsafe characters are unchanged
+    """
+    return _UNSAFE_FILENAME_CHARS.sub(lambda match: f"%{ord(match.group()):02X}", name)
+
+class ModelStore:
+    def __init__(self, model_dir='models', max_models=None, max_bytes=None):
+        """
+        Initialize a lazily loaded, size-bounded Prophet model store
+        
+        Models are persisted with Prophet's JSON serialization as
+        models/<item>_model.json and loaded on first access. Loaded models
+        are kept in an LRU cache bounded by model count and/or by the
+        serialized size of the cached models, which is used as a proxy for
+        their in-memory footprint.
+        
+        Args:
+            model_dir (str): Directory to store trained models
+            max_models (int): Maximum number of models kept in memory
+            max_bytes (int): Maximum total serialized size kept in memory
+        """
+        self.model_dir = model_dir
+        os.makedirs(model_dir, exist_ok=True)
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()
+        self._unsaved = set()
+        self.current_bytes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'loads': 0,
+            'evictions': 0
+        }
+        
+    def model_path(self, item_name):
+        return os.path.join(self.model_dir, f"{file_stem(item_name)}_model.json")
+        
+    def legacy_model_path(self, item_name):
+        return os.path.join(self.model_dir, f"{file_stem(item_name)}_model.pkl")
+        
+    def metrics_path(self, item_name):
+        return os.path.join(self.model_dir, f"{file_stem(item_name)}_metrics.json")
+        
+    def save_metrics(self, item_name, metrics):
+        """
+        Persist the training metrics recorded alongside a model
+        
+        Args:
+            item_name (str): Name of the item
+            metrics (dict): Training metrics
+        """
+        with open(self.metrics_path(item_name), 'w') as f:
+            json.dump(metrics, f, indent=4, default=float)
+            
+    def load_metrics(self, item_name):
+        """
+        Load the training metrics recorded alongside a model
+        
+        Args:
+            item_name (str): Name of the item
+            
+        Returns:
+            dict: Training metrics, or None if none were recorded
+        """
+        path = self.metrics_path(item_name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+            
+    def save(self, item_name, model):
+        """
+        Persist a model and cache it
+        
+        Args:
+            item_name (str): Name of the item
+            model (Prophet): Fitted model
+        """
+        serialized = model_to_json(model)
+        self.write_serialized(item_name, serialized)
+        self._put(item_name, model, len(serialized))
+        
+    def write_serialized(self, item_name, serialized):
+        """
+        Persist an already serialized model and drop any stale cached copy
+        
+        The model is loaded from disk the next time it is requested.
+        
+        Args:
+            item_name (str): Name of the item
+            serialized (str): Output of prophet.serialize.model_to_json
+        """
+        path = self.model_path(item_name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(serialized)
+        os.replace(tmp_path, path)
+        self.discard(item_name)
+        
+    def get(self, item_name):
+        """
+        Return a model, loading it from disk on a cache miss
+        
+        Args:
+            item_name (str): Name of the item
+            
+        Returns:
+            Prophet: Fitted model
+        """
+        if item_name in self._cache:
+            self.stats['hits'] += 1
+            self._cache.move_to_end(item_name)
+            return self._cache[item_name][0]
+            
+        self.stats['misses'] += 1
+        model, size = self._load(item_name)
+        self._put(item_name, model, size)
+        return model
+        
+    def _load(self, item_name):
+        path = self.model_path(item_name)
+        legacy_path = self.legacy_model_path(item_name)
+        
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                serialized = f.read()
+            model = model_from_json(serialized)
+        elif os.path.exists(legacy_path):
+            # Migrate joblib pickles written by older versions
+            with open(legacy_path, 'rb') as f:
+                model = joblib.load(f)
+            serialized = model_to_json(model)
+            self.write_serialized(item_name, serialized)
+        else:
+            raise FileNotFoundError(f"No trained model found for {item_name}")
+            
+        self.stats['loads'] += 1
+        return model, len(serialized)
+        
+    def put(self, item_name, model):
+        """
+        Cache a model without persisting it
+        
+        Unpersisted models are never evicted, since they could not be
+        reloaded (an older file of the same name would be served instead),
+        so they can hold the cache above its budget; a budgeted store
+        should normally be used with save() instead.
+        
+        Args:
+            item_name (str): Name of the item
+            model (Prophet): Fitted model
+        """
+        size = len(model_to_json(model)) if self.max_bytes is not None else 0
+        self._put(item_name, model, size, saved=False)
+        
+    def _put(self, item_name, model, size, saved=True):
+        self.discard(item_name)
+        self._cache[item_name] = (model, size)
+        if not saved:
+            self._unsaved.add(item_name)
+        self.current_bytes += size
+        self._evict()
+        
+    def _over_budget(self):
+        return ((self.max_models is not None and len(self._cache) > self.max_models) or
+                (self.max_bytes is not None and self.current_bytes > self.max_bytes))
+        
+    def _evict(self):
+        # Always keep the most recently used model, even if it alone
+        # exceeds the byte budget, and every unpersisted model
+        newest = next(reversed(self._cache))
+        candidates = [name for name in self._cache
+                      if name != newest and name not in self._unsaved]
+        for name in candidates:
+            if not self._over_budget():
+                break
+            _, size = self._cache.pop(name)
+            self.current_bytes -= size
+            self.stats['evictions'] += 1
+            
+    def discard(self, item_name):
+        """Drop a model from the cache without touching the stored file"""
+        self._unsaved.discard(item_name)
+        if item_name in self._cache:
+            _, size = self._cache.pop(item_name)
+            self.current_bytes -= size
+            
+    def clear(self):
+        """Drop every cached model"""
+        self._cache.clear()
+        self._unsaved.clear()
+        self.current_bytes = 0
+        
+    def cached_items(self):
+        return list(self._cache.keys())
+        
+    def get_stats(self):
+        """
+        Report cache statistics
+        
+        Returns:
+            dict: Hit/miss/load/eviction counters and current cache usage
+        """
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            'cached_models': len(self._cache),
+            'unsaved_models': len(self._unsaved),
+            'cached_bytes': self.current_bytes
+        }
+        
+    def __contains__(self, item_name):
+        return (
+            item_name in self._cache or
+            os.path.exists(self.model_path(item_name)) or
+            os.path.exists(self.legacy_model_path(item_name))
+        )
+        
+    def __getitem__(self, item_name):
+        return self.get(item_name)
+        
+    def __setitem__(self, item_name, model):
+        self.put(item_name, model)
+        
+    def __len__(self):
+        return len(self._cache)
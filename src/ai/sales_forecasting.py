@@ -2,22 +2,264 @@ import pandas as pd
 import numpy as np
 from prophet import Prophet
 from sklearn.metrics import mean_absolute_error, mean_squared_error
+from prophet.serialize import model_to_json, model_from_json
 import json
 from datetime import datetime, timedelta
-import joblib
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from model_store import ModelStore
+from forecast_engines import ProphetEngine, NumpyEngine
+
+def _build_model(seasonality_mode='multiplicative'):
+    """
+    Create an unfitted Prophet model with the standard configuration
+    
+    Args:
+        seasonality_mode (str): Seasonality mode for Prophet
+        
+    Returns:
+        Prophet: Configured model
+    """
+    model = Prophet(
+        seasonality_mode=seasonality_mode,
+        yearly_seasonality=True,
+        weekly_seasonality=True,
+        daily_seasonality=True
+    )
+    
+    model.add_country_holidays(country_name='IN')
+    return model
+
+def _fit_prophet(df, seasonality_mode='multiplicative', init=None, evaluate=True):
+    """
+    Fit a Prophet model and compute its training metrics
+    
+    Args:
+        df (pd.DataFrame): Prepared data with 'ds' and 'y' columns
+        seasonality_mode (str): Seasonality mode for Prophet
+        init (dict): Initial parameter values to warm-start the optimizer
+        evaluate (bool): Whether to compute in-sample MAE/RMSE, which
+            costs a full predict over the training history
+            
+    Returns:
+        tuple: Fitted model and training metrics
+    """
+    model = _build_model(seasonality_mode)
+    start = time.perf_counter()
+    if init is None:
+        model.fit(df)
+    else:
+        model.fit(df, init=init)
+    fit_seconds = time.perf_counter() - start
+    
+    metrics = {
+        'fit_seconds': fit_seconds,
+        'training_date': datetime.now().isoformat()
+    }
+    if evaluate:
+        forecast = model.predict(df)
+        metrics['mae'] = mean_absolute_error(df['y'], forecast['yhat'])
+        metrics['rmse'] = np.sqrt(mean_squared_error(df['y'], forecast['yhat']))
+        
+    return model, metrics
+
+def _warm_start_params(model):
+    """
+    Extract a fitted model's parameters in the form Prophet.fit accepts
+    as ``init``
+    
+    Args:
+        model (Prophet): Fitted model
+        
+    Returns:
+        dict: Initial values for k, m, sigma_obs, delta and beta
+    """
+    params = {}
+    for name in ['k', 'm', 'sigma_obs']:
+        if model.mcmc_samples == 0:
+            params[name] = model.params[name][0][0]
+        else:
+            params[name] = np.mean(model.params[name])
+    for name in ['delta', 'beta']:
+        if model.mcmc_samples == 0:
+            params[name] = model.params[name][0]
+        else:
+            params[name] = np.mean(model.params[name], axis=0)
+    return params
+
+def _train_item_worker(item_name, df, seasonality_mode, model_dir):
+    """
+    Train one item inside a worker process
+    
+    Failures are returned instead of raised so that one bad series
+    does not take down the rest of the batch. The model is sent back in
+    Prophet's JSON form, the same format the model store persists.
+    
+    Returns:
+        tuple: (item_name, serialized model or None, metrics)
+    """
+    try:
+        model, metrics = _fit_prophet(df, seasonality_mode)
+        serialized = model_to_json(model)
+        if model_dir:
+            store = ModelStore(model_dir)
+            store.write_serialized(item_name, serialized)
+            store.save_metrics(item_name, metrics)
+        return item_name, serialized, metrics
+    except Exception as e:
+        return item_name, None, {
+            'error': f"{type(e).__name__}: {e}",
+            'training_date': datetime.now().isoformat()
+        }
 
 class SalesForecaster:
-    def __init__(self, model_dir='models'):
+    def __init__(self, model_dir='models', max_cached_models=None,
+                 max_cache_bytes=None, default_engine='prophet',
+                 engine_by_item=None):
         """
         Initialize the sales forecasting system
         
         Args:
             model_dir (str): Directory to store trained models
+            max_cached_models (int): Maximum number of models kept in memory
+            max_cache_bytes (int): Maximum serialized size of models kept
+                in memory
+            default_engine (str): Engine used for items without an
+                explicit assignment ('prophet' or 'numpy')
+            engine_by_item (dict): Engine name by item name
         """
         self.model_dir = model_dir
         os.makedirs(model_dir, exist_ok=True)
-        self.models = {}
+        self.models = ModelStore(
+            model_dir,
+            max_models=max_cached_models,
+            max_bytes=max_cache_bytes
+        )
+        self.engines = {
+            'prophet': ProphetEngine(self),
+            'numpy': NumpyEngine()
+        }
+        self.default_engine = default_engine
+        self.engine_by_item = dict(engine_by_item or {})
+        
+    def register_engine(self, name, engine):
+        """
+        Register a forecasting engine
+        
+        Args:
+            name (str): Engine name used in engine assignments
+            engine (ForecastEngine): Engine instance
+        """
+        self.engines[name] = engine
+        
+    def set_engine(self, item_name, engine_name):
+        """
+        Choose the engine used for an item
+        
+        Args:
+            item_name (str): Name of the item
+            engine_name (str): Name of a registered engine
+        """
+        if engine_name not in self.engines:
+            raise ValueError(f"Unknown engine {engine_name}")
+        self.engine_by_item[item_name] = engine_name
+        
+    def assign_engines_by_volume(self, series_by_item, top_n,
+                                 top_engine='prophet', tail_engine='numpy'):
+        """
+        Use the heavy engine for the best sellers only
+        
+        Args:
+            series_by_item (dict): Historical sales data keyed by item name
+            top_n (int): Number of highest-volume items for top_engine
+            top_engine (str): Engine for the top sellers
+            tail_engine (str): Engine for every other item
+            
+        Returns:
+            dict: Engine name by item name
+        """
+        volumes = pd.Series({
+            item_name: sales_data.iloc[:, 1].sum()
+            for item_name, sales_data in series_by_item.items()
+        })
+        top_items = set(volumes.nlargest(top_n).index)
+        for item_name in series_by_item:
+            self.set_engine(item_name, top_engine if item_name in top_items else tail_engine)
+        return {item_name: self.engine_by_item[item_name] for item_name in series_by_item}
+        
+    def engine_for(self, item_name):
+        """
+        Return the name of the engine used for an item
+        
+        Args:
+            item_name (str): Name of the item
+            
+        Returns:
+            str: Engine name
+        """
+        if item_name in self.engine_by_item:
+            return self.engine_by_item[item_name]
+        if self.default_engine == 'prophet' and item_name not in self.models:
+            # Items only ever fit by the fast path after a restart
+            if item_name in self.get_engine('numpy'):
+                return 'numpy'
+        return self.default_engine
+        
+    def get_engine(self, name):
+        """
+        Return a registered engine, loading its saved state on first use
+        
+        Args:
+            name (str): Engine name
+            
+        Returns:
+            ForecastEngine: The engine
+        """
+        engine = self.engines[name]
+        path = self._engine_path(name)
+        if hasattr(engine, 'load') and not getattr(engine, 'items', None) and os.path.exists(path):
+            engine.load(path)
+        return engine
+        
+    def _engine_path(self, name):
+        """
+        Return the path of an engine's saved state
+        
+        Args:
+            name (str): Engine name
+            
+        Returns:
+            str: Path of the .npz file
+        """
+        return os.path.join(self.model_dir, f"{name}_engine.npz")
+        
+    def fit_engines(self, series_by_item, save_model=True):
+        """
+        Fit every item with the engine assigned to it
+        
+        Items are added to each engine's saved state, so fitting another
+        set of series keeps the items fit before.
+        
+        Args:
+            series_by_item (dict): Historical sales data keyed by item name
+            save_model (bool): Whether to save the fitted engine state
+            
+        Returns:
+            dict: Training metrics by item
+        """
+        groups = {}
+        for item_name, sales_data in series_by_item.items():
+            groups.setdefault(self.engine_for(item_name), {})[item_name] = sales_data
+            
+        results = {}
+        for name, group in groups.items():
+            engine = self.get_engine(name)
+            results.update(engine.fit_many(group))
+            if save_model and hasattr(engine, 'save'):
+                engine.save(self._engine_path(name))
+                
+        return results
         
     def prepare_data(self, sales_data):
         """
@@ -35,7 +277,7 @@ class SalesForecaster:
         
     def train_model(self, item_name, sales_data, 
                    seasonality_mode='multiplicative',
-                   save_model=True):
+                   save_model=True, evaluate=True):
         """
         Train a Prophet model for an item
         
@@ -44,7 +286,9 @@ class SalesForecaster:
             sales_data (pd.DataFrame): Historical sales data
             seasonality_mode (str): Seasonality mode for Prophet
             save_model (bool): Whether to save the trained model
-            
+            evaluate (bool): Whether to compute in-sample MAE/RMSE (use
+                backtesting.Backtester for out-of-sample accuracy)
+                
         Returns:
             dict: Training metrics
         """
@@ -52,34 +296,181 @@ class SalesForecaster:
         df = self.prepare_data(sales_data)
         
         # Create and train model
-        model = Prophet(
-            seasonality_mode=seasonality_mode,
-            yearly_seasonality=True,
-            weekly_seasonality=True,
-            daily_seasonality=True
-        )
-        
-        model.add_country_holidays(country_name='IN')
-        model.fit(df)
+        model, metrics = _fit_prophet(df, seasonality_mode, evaluate=evaluate)
         
         # Save model
         if save_model:
-            model_path = os.path.join(self.model_dir, f"{item_name}_model.pkl")
-            with open(model_path, 'wb') as f:
-                joblib.dump(model, f)
+            self.models.save(item_name, model)
+            self.models.save_metrics(item_name, metrics)
+        else:
+            self.models[item_name] = model
+            
+        return metrics
         
-        self.models[item_name] = model
+    def update_model(self, item_name, new_rows, max_mae_increase=0.1,
+                     compare_cold=False, save_model=True):
+        """
+        Incrementally retrain an item's model with newly arrived sales
         
-        # Calculate metrics
-        forecast = model.predict(df)
-        metrics = {
-            'mae': mean_absolute_error(df['y'], forecast['yhat']),
-            'rmse': np.sqrt(mean_squared_error(df['y'], forecast['yhat'])),
-            'training_date': datetime.now().isoformat()
-        }
+        The new rows are appended to the model's training history and the
+        fit is warm-started from the previous parameters. If the warm fit's
+        MAE is more than max_mae_increase worse (relative) than the MAE
+        recorded at the last training, or the warm start fails (e.g. new
+        holidays changed the parameter shapes), the model is refit from
+        scratch instead.
         
+        Args:
+            item_name (str): Name of the item
+            new_rows (pd.DataFrame): New sales data with 'date' and 'sales'
+            max_mae_increase (float): Allowed relative MAE degradation
+            compare_cold (bool): Also time a cold refit for comparison
+                (the cold model is discarded)
+            save_model (bool): Whether to save the updated model
+            
+        Returns:
+            dict: Training metrics with the update mode and fit timings
+                (a warm fit rejected for its MAE is reported as
+                rejected_warm_fit_seconds, and no speedup is given)
+        """
+        previous = self.load_model(item_name)
+        seasonality_mode = previous.seasonality_mode
+        reference = self.models.load_metrics(item_name)
+        
+        history = pd.concat([previous.history[['ds', 'y']], self.prepare_data(new_rows)])
+        history = (history.drop_duplicates('ds', keep='last')
+                          .sort_values('ds')
+                          .reset_index(drop=True))
+        
+        mode = 'warm'
+        warm_fit_seconds = None
+        try:
+            model, metrics = _fit_prophet(
+                history,
+                seasonality_mode,
+                init=_warm_start_params(previous)
+            )
+            warm_fit_seconds = metrics['fit_seconds']
+        except Exception as e:
+            print(f"Warm start failed for {item_name}: {e}")
+            mode = 'cold'
+            
+        rejected_warm_fit_seconds = None
+        if mode == 'warm' and reference and 'mae' in reference:
+            if metrics['mae'] > reference['mae'] * (1 + max_mae_increase):
+                mode = 'cold'
+                rejected_warm_fit_seconds, warm_fit_seconds = warm_fit_seconds, None
+                
+        cold_fit_seconds = None
+        if mode == 'cold':
+            model, metrics = _fit_prophet(history, seasonality_mode)
+            cold_fit_seconds = metrics['fit_seconds']
+        elif compare_cold:
+            _, cold_metrics = _fit_prophet(history, seasonality_mode)
+            cold_fit_seconds = cold_metrics['fit_seconds']
+            
+        metrics.update({
+            'mode': mode,
+            'new_rows': len(new_rows),
+            'warm_fit_seconds': warm_fit_seconds,
+            'rejected_warm_fit_seconds': rejected_warm_fit_seconds,
+            'cold_fit_seconds': cold_fit_seconds,
+            'reference_mae': reference.get('mae') if reference else None
+        })
+        # Only a kept warm fit saves time; a rejected one adds to the cold fit
+        if mode == 'warm' and warm_fit_seconds and cold_fit_seconds:
+            metrics['speedup'] = cold_fit_seconds / warm_fit_seconds
+            
+        if save_model:
+            self.models.save(item_name, model)
+            self.models.save_metrics(item_name, metrics)
+        else:
+            self.models[item_name] = model
+            
         return metrics
         
+    def iter_train_many(self, series_by_item, workers=None,
+                        seasonality_mode='multiplicative',
+                        save_model=True):
+        """
+        Train one Prophet model per item across a process pool
+        
+        Results are yielded as soon as each item finishes, so callers can
+        log or persist metrics while the rest of the batch is still
+        fitting. A failing item yields metrics with an 'error' key and
+        does not affect the other items.
+        
+        Args:
+            series_by_item (dict): Historical sales data keyed by item name
+            workers (int): Number of worker processes (defaults to CPU count)
+            seasonality_mode (str): Seasonality mode for Prophet
+            save_model (bool): Whether to save the trained models
+            
+        Yields:
+            tuple: (item_name, metrics) in completion order
+        """
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for item_name, sales_data in series_by_item.items():
+                future = executor.submit(
+                    _train_item_worker,
+                    item_name,
+                    self.prepare_data(sales_data),
+                    seasonality_mode,
+                    self.model_dir if save_model else None
+                )
+                futures[future] = item_name
+                
+            for future in as_completed(futures):
+                item_name = futures[future]
+                try:
+                    _, serialized, metrics = future.result()
+                except Exception as e:
+                    # The worker process itself died (e.g. out of memory)
+                    serialized = None
+                    metrics = {
+                        'error': f"{type(e).__name__}: {e}",
+                        'training_date': datetime.now().isoformat()
+                    }
+                    
+                if serialized is not None:
+                    if save_model:
+                        # Loaded lazily from the file the worker wrote
+                        self.models.discard(item_name)
+                    else:
+                        self.models[item_name] = model_from_json(serialized)
+                        
+                yield item_name, metrics
+                
+    def train_many(self, series_by_item, workers=None,
+                   seasonality_mode='multiplicative',
+                   save_model=True, callback=None):
+        """
+        Train one Prophet model per item across a process pool
+        
+        Args:
+            series_by_item (dict): Historical sales data keyed by item name
+            workers (int): Number of worker processes (defaults to CPU count)
+            seasonality_mode (str): Seasonality mode for Prophet
+            save_model (bool): Whether to save the trained models
+            callback (callable): Called as callback(item_name, metrics)
+                when each item finishes
+                
+        Returns:
+            dict: Training metrics by item
+        """
+        results = {}
+        for item_name, metrics in self.iter_train_many(
+            series_by_item,
+            workers=workers,
+            seasonality_mode=seasonality_mode,
+            save_model=save_model
+        ):
+            results[item_name] = metrics
+            if callback is not None:
+                callback(item_name, metrics)
+                
+        return results
+        
     def load_model(self, item_name):
         """
         Load a trained model for an item
@@ -90,16 +481,57 @@ class SalesForecaster:
         Returns:
             Prophet: Loaded model
         """
-        model_path = os.path.join(self.model_dir, f"{item_name}_model.pkl")
-        if os.path.exists(model_path):
-            with open(model_path, 'rb') as f:
-                model = joblib.load(f)
-            self.models[item_name] = model
-            return model
-        else:
-            raise FileNotFoundError(f"No trained model found for {item_name}")
+        return self.models.get(item_name)
+        
+    def cache_stats(self):
+        """
+        Report model cache statistics
+        
+        Returns:
+            dict: Hit/miss/load/eviction counters and current cache usage
+        """
+        return self.models.get_stats()
+        
+    def predict_frame(self, item_name, dates, uncertainty_samples=None):
+        """
+        Predict an item's sales on the given dates
+        
+        Args:
+            item_name (str): Name of the item
+            dates (iterable): Dates to predict
+            uncertainty_samples (int): Override Prophet's number of
+                uncertainty samples for this call (0 skips interval
+                sampling and reports yhat as both bounds)
+                
+        Returns:
+            pd.DataFrame: Forecast indexed by normalized date
+        """
+        if item_name not in self.models:
+            self.load_model(item_name)
+            
+        model = self.models[item_name]
+        future = pd.DataFrame({'ds': pd.DatetimeIndex(dates).normalize()})
+        
+        previous_samples = model.uncertainty_samples
+        if uncertainty_samples is not None:
+            model.uncertainty_samples = uncertainty_samples
+        try:
+            forecast = model.predict(future)
+        finally:
+            model.uncertainty_samples = previous_samples
             
-    def forecast_sales(self, item_name, days=30, return_components=False):
+        forecast['date'] = forecast['ds'].dt.normalize()
+        forecast = forecast.drop_duplicates('date').set_index('date')
+        
+        # Prophet leaves out the interval columns when sampling is disabled
+        for column in ('yhat_lower', 'yhat_upper'):
+            if column not in forecast:
+                forecast[column] = forecast['yhat']
+                
+        return forecast
+        
+    def forecast_sales(self, item_name, days=30, return_components=False,
+                       uncertainty_samples=None):
         """
         Generate sales forecast for an item
         
@@ -107,20 +539,77 @@ class SalesForecaster:
             item_name (str): Name of the item
             days (int): Number of days to forecast
             return_components (bool): Whether to return seasonal components
-            
+            uncertainty_samples (int): Override Prophet's number of
+                uncertainty samples (lower is faster, 0 disables bounds)
+                
         Returns:
             dict: Forecast results
         """
-        if item_name not in self.models:
-            self.load_model(item_name)
+        return self.forecast_many(
+            [item_name],
+            days=days,
+            return_components=return_components,
+            uncertainty_samples=uncertainty_samples
+        )[item_name]
+        
+    def forecast_many(self, items, days=30, return_components=False,
+                      uncertainty_samples=None):
+        """
+        Generate sales forecasts for several items
+        
+        Items are grouped by engine so that each engine predicts all of
+        its items in one call.
+        
+        Args:
+            items (iterable): Names of the items
+            days (int): Number of days to forecast
+            return_components (bool): Whether to return seasonal components
+            uncertainty_samples (int): Override Prophet's number of
+                uncertainty samples (lower is faster, 0 disables bounds)
+                
+        Returns:
+            dict: Forecast results by item
+        """
+        items = list(items)
+        groups = {}
+        for item_name in items:
+            groups.setdefault(self.engine_for(item_name), []).append(item_name)
             
-        model = self.models[item_name]
+        # Include some historical data around today
+        today = pd.Timestamp(datetime.now()).normalize()
+        window = pd.date_range(today - timedelta(days=days), periods=2 * days, freq='D')
         
-        # Create future dates
-        future = model.make_future_dataframe(periods=days)
-        forecast = model.predict(future)
+        results = {}
+        for name, group in groups.items():
+            engine = self.get_engine(name)
+            frames = engine.predict_frames(group, window, uncertainty_samples)
+            for item_name in group:
+                # Limit to the span covered by the training history plus
+                # the forecast horizon
+                history_start, history_end = engine.history_span(item_name)
+                horizon_end = history_end + timedelta(days=days)
+                forecast = frames[item_name]
+                forecast = forecast[(forecast.index >= history_start) &
+                                    (forecast.index <= horizon_end)]
+                results[item_name] = self.format_forecast(
+                    item_name, days, forecast, return_components
+                )
+                
+        return {item_name: results[item_name] for item_name in items}
+        
+    def format_forecast(self, item_name, days, forecast, return_components):
+        """
+        Build the forecast payload from a date-indexed forecast frame
         
-        # Prepare results
+        Args:
+            item_name (str): Name of the item
+            days (int): Number of days forecast
+            forecast (pd.DataFrame): Output of predict_frame
+            return_components (bool): Whether to return seasonal components
+            
+        Returns:
+            dict: Forecast results
+        """
         results = {
             'forecast_date': datetime.now().isoformat(),
             'item_name': item_name,
@@ -128,28 +617,27 @@ class SalesForecaster:
             'predictions': []
         }
         
-        # Add predictions
-        for i in range(-days, days):  # Include some historical data
-            date = (datetime.now() + timedelta(days=i)).strftime('%Y-%m-%d')
-            row = forecast[forecast['ds'].dt.strftime('%Y-%m-%d') == date].iloc[0]
-            
-            prediction = {
-                'date': date,
-                'sales': float(row['yhat']),
-                'lower_bound': float(row['yhat_lower']),
-                'upper_bound': float(row['yhat_upper'])
-            }
-            
-            if return_components:
-                prediction.update({
-                    'trend': float(row['trend']),
-                    'yearly': float(row['yearly']) if 'yearly' in row else 0,
-                    'weekly': float(row['weekly']) if 'weekly' in row else 0,
-                    'daily': float(row['daily']) if 'daily' in row else 0
-                })
-                
-            results['predictions'].append(prediction)
-            
+        columns = {
+            'date': forecast.index.strftime('%Y-%m-%d').tolist(),
+            'sales': forecast['yhat'].astype(float).tolist(),
+            'lower_bound': forecast['yhat_lower'].astype(float).tolist(),
+            'upper_bound': forecast['yhat_upper'].astype(float).tolist()
+        }
+        
+        if return_components:
+            columns['trend'] = forecast['trend'].astype(float).tolist()
+            for component in ('yearly', 'weekly', 'daily'):
+                if component in forecast:
+                    columns[component] = forecast[component].astype(float).tolist()
+                else:
+                    columns[component] = [0] * len(forecast)
+                    
+        names = list(columns)
+        results['predictions'] = [
+            dict(zip(names, values))
+            for values in zip(*columns.values())
+        ]
+        
         return results
         
     def analyze_seasonality(self, item_name):
@@ -206,6 +694,25 @@ def main():
         metrics = forecaster.train_model(item_name, sales_data)
         print(f"Training metrics: {metrics}")
         
+        # Train several items in parallel
+        series_by_item = {
+            f'sample_item_{i}': pd.DataFrame({
+                'date': dates,
+                'sales': np.random.normal(100, 20, size=len(dates))
+            })
+            for i in range(4)
+        }
+        forecaster.train_many(
+            series_by_item,
+            callback=lambda item, m: print(f"Trained {item}: {m}")
+        )
+        
+        # Keep Prophet for the best seller, use the NumPy engine for the rest
+        forecaster.assign_engines_by_volume(series_by_item, top_n=1)
+        forecaster.fit_engines(series_by_item)
+        forecasts = forecaster.forecast_many(series_by_item, days=14)
+        print(f"Forecast {len(forecasts)} items with engines {forecaster.engine_by_item}")
+        
         # Generate forecast
         forecast = forecaster.forecast_sales(item_name, days=30, return_components=True)
         print(f"Generated forecast for next {forecast['forecast_days']} days")
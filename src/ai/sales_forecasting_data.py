@@ -2,8 +2,21 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import json
+import os
+from dashboard_schema import SCHEMA_VERSION, CURRENCY
 
-def generate_sales_data():
+DEFAULT_PEAK_HOURS = ["Evening", "Night", "Afternoon"]
+
+def generate_sales_data(profile=None, daily_forecast=None):
+    """
+    Generate the sales forecast dashboard data
+    
+    Args:
+        profile (IntradayProfile): Intraday demand profile used for the
+            peak periods and per-slot prep quantities
+        daily_forecast (pd.DataFrame): Daily item forecasts ('date',
+            'item_name', 'quantity') projected onto the profile
+    """
     # Base parameters
     base_sales = 45000  # Base daily sales
     daily_variation = 0.2  # 20% variation
@@ -27,36 +40,71 @@ def generate_sales_data():
             "revenue": round(sales),
             "confidence": round(confidence, 1)
         })
-
+        
     # Calculate trend
     last_week_total = 320000  # Simulated last week's total
     this_week_total = sum(pred["revenue"] for pred in daily_predictions)
     trend_percentage = ((this_week_total - last_week_total) / last_week_total) * 100
-
+    
+    peak_hours = DEFAULT_PEAK_HOURS
+    if profile is not None:
+        peak_hours = profile.peak_hours(daily_forecast=daily_forecast)
+    staffing = f"Increase staff during predicted peak periods ({', '.join(peak_hours[:2])})"
+        
     # Generate synthetic data
     forecast_data = {
-        "predictedRevenue": f"₹{round(this_week_total):,}",
+        "schemaVersion": SCHEMA_VERSION,
+        "currency": CURRENCY,
+        "predictedRevenue": round(this_week_total),
         "trend": "up" if trend_percentage > 0 else "down",
-        "trendPercentage": f"{abs(round(trend_percentage, 1))}%",
+        "trendPercentage": abs(round(trend_percentage, 1)),
         "dailyPredictions": daily_predictions,
-        "peakHours": ["7:00 PM", "8:00 PM", "1:00 PM"],
+        "peakHours": peak_hours,
         "recommendations": [
-            "Increase staff during predicted peak hours (7-8 PM)",
+            staffing,
             "Stock up on popular items before weekend rush",
             "Consider lunch hour promotions to boost afternoon sales",
             "Optimize kitchen prep time for weekend service"
         ]
     }
     
+    if profile is not None and daily_forecast is not None:
+        forecast_data["prepSchedule"] = profile.prep_schedule(daily_forecast)
+        
     return forecast_data
 
+def build_intraday_profile(csv_path='../../public/files/sales_data.csv',
+                           state_path='intraday_profile.json'):
+    """
+    Update the intraday profile with new transactions and forecast the
+    coming week from its weekday averages
+    
+    Returns:
+        tuple: (IntradayProfile, daily forecast) or (None, None) when the
+            sales log is not available
+    """
+    if not os.path.exists(csv_path):
+        return None, None
+        
+    from intraday_profile import IntradayProfile
+    
+    profile = IntradayProfile()
+    if os.path.exists(state_path):
+        profile.load(state_path)
+    profile.update_from_csv(csv_path)
+    profile.save(state_path)
+    
+    dates = pd.date_range(pd.Timestamp.now().normalize(), periods=7, freq='D')
+    return profile, profile.baseline_forecast(dates)
+
 if __name__ == "__main__":
     # Generate data
-    data = generate_sales_data()
+    profile, daily_forecast = build_intraday_profile()
+    data = generate_sales_data(profile, daily_forecast)
     
     # Save to JSON file
     with open('sales_forecast.json', 'w') as f:
         json.dump(data, f, indent=2)
-    
+        
     print("Generated sales forecast data:")
     print(json.dumps(data, indent=2)) 
\ No newline at end of file
@@ -0,0 +1,249 @@
+import pandas as pd
+import numpy as np
+import hashlib
+import os
+
+SALES_COLUMNS = [
+    'order_id', 'date', 'item_name', 'item_type', 'item_price', 'quantity',
+    'transaction_amount', 'transaction_type', 'time_of_sale'
+]
+
+SALES_DTYPES = {
+    'order_id': 'int64',
+    'item_name': 'category',
+    'item_type': 'category',
+    'item_price': 'float64',
+    'quantity': 'float64',
+    'transaction_amount': 'float64',
+    'transaction_type': 'category',
+    'time_of_sale': 'category'
+}
+
+DAILY_KEYS = ['date', 'item_name', 'item_type']
+
+def parse_sales_dates(dates):
+    """
+    Parse the mixed date formats found in sales_data.csv
+    
+    The log mixes 07-03-2022 and 8/23/2022; both are month first. ISO
+    dates (2022-07-03) are accepted as well.
+    
+    Args:
+        dates (pd.Series): Raw date strings
+        
+    Returns:
+        pd.Series: Parsed dates (NaT where unparseable)
+    """
+    dates = dates.astype(str)
+    parsed = pd.to_datetime(dates.str.replace('/', '-', regex=False),
+                            format='%m-%d-%Y', errors='coerce')
+    missing = parsed.isna()
+    if missing.any():
+        parsed[missing] = pd.to_datetime(dates[missing], format='%Y-%m-%d', errors='coerce')
+    return parsed
+
+def file_hash(path, block_size=1 << 20):
+    """
+    Hash a file's contents without reading it into memory
+    
+    Args:
+        path (str): Path to the file
+        block_size (int): Read size in bytes
+        
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def log_fingerprint(path, size=None, block_size=1 << 16):
+    """
+    Fingerprint the first size bytes of an append-only log by their
+    length and a hash of their first and last block, so resuming a log
+    can tell appended rows from a rewritten file without rereading it
+    
+    Args:
+        path (str): Path to the log
+        size (int): Bytes covered (defaults to the current file size)
+        block_size (int): Bytes hashed at each end
+        
+    Returns:
+        dict: 'size' and 'hash'
+    """
+    size = os.path.getsize(path) if size is None else size
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        digest.update(f.read(min(size, block_size)))
+        tail_start = max(size - block_size, block_size)
+        if size > tail_start:
+            f.seek(tail_start)
+            digest.update(f.read(size - tail_start))
+    return {'size': size, 'hash': digest.hexdigest()}
+
+def log_unchanged(path, fingerprint):
+    """
+    Check that a log still starts with the bytes it had when fingerprinted,
+    i.e. rows were only appended since
+    
+    Args:
+        path (str): Path to the log
+        fingerprint (dict): Output of log_fingerprint (None never matches)
+        
+    Returns:
+        bool: Whether rows can be resumed from the fingerprinted position
+    """
+    if fingerprint is None or not os.path.exists(path) \
+            or os.path.getsize(path) < fingerprint['size']:
+        return False
+    return log_fingerprint(path, fingerprint['size']) == fingerprint
+
+def iter_transactions(csv_path, chunksize=1_000_000, skip_rows=0):
+    """
+    Stream cleaned transactions from a sales log
+    
+    Rows are passed through one-for-one (unparseable dates become NaT and
+    are dropped by the group-bys downstream), so callers can count rows
+    to resume an append-only log.
+    
+    Args:
+        csv_path (str): Path to a sales_data.csv style log
+        chunksize (int): Rows per chunk
+        skip_rows (int): Number of data rows to skip (already processed)
+        
+    Yields:
+        pd.DataFrame: Transactions with parsed dates, categorical text
+            columns and 'Unknown' for missing transaction types
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [column for column in SALES_COLUMNS if column in header]
+    dtypes = {column: dtype for column, dtype in SALES_DTYPES.items() if column in usecols}
+    # Category dtype is applied after filling missing values
+    read_dtypes = {column: ('object' if dtype == 'category' else dtype)
+                   for column, dtype in dtypes.items()}
+    
+    skiprows = range(1, skip_rows + 1) if skip_rows else None
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=read_dtypes,
+                             chunksize=chunksize, skiprows=skiprows):
+        chunk['date'] = parse_sales_dates(chunk['date'])
+        if 'transaction_type' in chunk:
+            chunk['transaction_type'] = chunk['transaction_type'].fillna('Unknown')
+        for column, dtype in dtypes.items():
+            if dtype == 'category':
+                chunk[column] = chunk[column].astype('category')
+        yield chunk
+
+class SalesIngestor:
+    def __init__(self, cache_dir='cache', chunksize=1_000_000):
+        """
+        Initialize ingestion of sales logs into daily per-item series
+        
+        Args:
+            cache_dir (str): Directory for cached daily aggregates
+            chunksize (int): Rows parsed per chunk, bounding peak memory
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.chunksize = chunksize
+        
+    def _cache_path(self, csv_path):
+        return os.path.join(self.cache_dir, f"sales_daily_{file_hash(csv_path)[:16]}")
+        
+    def load_daily(self, csv_path):
+        """
+        Load daily per-item quantity and revenue, parsing the log only
+        when it has changed since the last run
+        
+        Args:
+            csv_path (str): Path to a sales_data.csv style log
+            
+        Returns:
+            pd.DataFrame: One row per (date, item_name, item_type) with
+                'quantity', 'revenue' and 'orders'
+        """
+        cache_path = self._cache_path(csv_path)
+        daily = _read_cache(cache_path)
+        if daily is not None:
+            return daily
+            
+        partials = [_aggregate(chunk) for chunk in iter_transactions(csv_path, self.chunksize)]
+        daily = (pd.concat(partials, ignore_index=True)
+                   .groupby(DAILY_KEYS, as_index=False, sort=True)
+                   [['quantity', 'revenue', 'orders']].sum())
+        _write_cache(daily, cache_path)
+        return daily
+        
+    def series_by_item(self, daily, value='quantity'):
+        """
+        Reshape daily aggregates into the (date, sales) frames expected
+        by SalesForecaster, with days without sales filled as zero
+        
+        Args:
+            daily (pd.DataFrame): Output of load_daily
+            value (str): 'quantity' or 'revenue'
+            
+        Returns:
+            dict: DataFrames with 'date' and 'sales' columns keyed by item
+        """
+        grid = pd.date_range(daily['date'].min(), daily['date'].max(), freq='D')
+        wide = (daily.pivot_table(index='date', columns='item_name',
+                                  values=value, aggfunc='sum', observed=True)
+                     .reindex(grid)
+                     .fillna(0))
+        
+        return {
+            str(item_name): pd.DataFrame({'date': grid, 'sales': wide[item_name].to_numpy()})
+            for item_name in wide.columns
+        }
+
+def _aggregate(transactions):
+    """
+    Sum one chunk of transactions per date and item
+    """
+    frame = transactions.assign(
+        date=transactions['date'].dt.normalize(),
+        revenue=transactions['transaction_amount'],
+        orders=np.ones(len(transactions), dtype='int64')
+    )
+    daily = (frame.groupby(DAILY_KEYS, observed=True, as_index=False)
+                  [['quantity', 'revenue', 'orders']].sum())
+    
+    # Chunks have different category sets, so combine on plain strings
+    for column in ('item_name', 'item_type'):
+        daily[column] = daily[column].astype(str)
+    return daily
+
+def _write_cache(df, cache_path):
+    """Write a frame as Parquet, or as a pickle when pyarrow is missing"""
+    try:
+        df.to_parquet(f"{cache_path}.parquet", index=False)
+    except ImportError:
+        df.to_pickle(f"{cache_path}.pkl")
+
+def _read_cache(cache_path):
+    if os.path.exists(f"{cache_path}.parquet"):
+        return pd.read_parquet(f"{cache_path}.parquet")
+    if os.path.exists(f"{cache_path}.pkl"):
+        return pd.read_pickle(f"{cache_path}.pkl")
+    return None
+
+def main():
+    # Example usage
+    ingestor = SalesIngestor()
+    
+    try:
+        daily = ingestor.load_daily('../../public/files/sales_data.csv')
+        print(f"Loaded {len(daily)} daily rows for {daily['item_name'].nunique()} items "
+              f"from {daily['date'].min():%Y-%m-%d} to {daily['date'].max():%Y-%m-%d}")
+        
+        series_by_item = ingestor.series_by_item(daily, value='quantity')
+        for item_name, series in series_by_item.items():
+            print(f"{item_name}: {int(series['sales'].sum())} units")
+            
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import os
+import time
+import pytest
+from generate_insights import (
+    SECTION_FILES, FALLBACK_INSIGHTS, HttpLLMClient, generate_text, generate_insights,
+    load_json_data
+)
+from branch_insights import generate_branch_insights, make_demo_branches
+from insight_cache import InsightCache
+from local_insights import LocalInsightEngine
+from local_llm_server import start_server
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+FILES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'public', 'files')
+
+def load_sections():
+    return {section: load_json_data(os.path.join(DATA_DIR, file_name))
+            for section, file_name in SECTION_FILES.items()}
+
+def local_engine():
+    return LocalInsightEngine(
+        sales_path=os.path.join(FILES_DIR, 'sales_data.csv'),
+        waste_path=os.path.join(FILES_DIR, 'waste_management_data.csv'),
+        indian_inventory_path=os.path.join(FILES_DIR, 'indian_restaurant_inventory.csv'),
+        restaurant_inventory_path=os.path.join(FILES_DIR, 'restaurant_inventory_data.csv'),
+        as_of='2025-04-11'
+    )
+
+@pytest.fixture
+def llm_server():
+    servers = []
+    
+    def start(latency=0.0, failure_rate=0.0):
+        server, url = start_server(port=0, latency=latency, jitter=0.0,
+                                   failure_rate=failure_rate)
+        servers.append(server)
+        return server, url
+    
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def test_slow_calls_time_out_at_the_deadline(llm_server):
+    server, url = llm_server(latency=2.0)
+    
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        generate_text(HttpLLMClient(url), "Analyze this sales data", timeout=0.2,
+                      retries=0, backoff=0)
+    
+    assert time.perf_counter() - start < 1.0
+
+def test_failed_calls_are_retried(llm_server):
+    server, url = llm_server(failure_rate=1.0)
+    
+    with pytest.raises(Exception):
+        generate_text(HttpLLMClient(url), "Analyze this sales data", timeout=5.0,
+                      retries=2, backoff=0)
+    
+    assert server.requests == 3
+
+def test_cached_insights_are_not_regenerated(llm_server, tmp_path):
+    server, url = llm_server()
+    sections_data = load_sections()
+    cache = InsightCache(cache_dir=str(tmp_path))
+    
+    first = generate_insights(sections_data, client=HttpLLMClient(url), backoff=0, cache=cache)
+    second = generate_insights(sections_data, client=HttpLLMClient(url), backoff=0, cache=cache)
+    
+    assert server.requests == len(sections_data)
+    assert second == first
+    assert first['sales'].startswith("Stand-in insight")
+
+def test_failed_sections_fall_back_to_local_insights(llm_server):
+    server, url = llm_server(failure_rate=1.0)
+    failed_sections = []
+    
+    def fallbacks(failed):
+        failed_sections.extend(failed)
+        return local_engine().insights(tuple(failed))
+    
+    analyses = generate_insights(load_sections(), client=HttpLLMClient(url), retries=1,
+                                 backoff=0, fallbacks=fallbacks)
+    
+    assert sorted(failed_sections) == sorted(SECTION_FILES)
+    assert analyses == local_engine().insights()
+    assert analyses['sales'] != FALLBACK_INSIGHTS['sales']
+
+def test_batched_branches_share_the_request_rate(llm_server, tmp_path):
+    server, url = llm_server()
+    input_dir = make_demo_branches(DATA_DIR, 4, output_dir=str(tmp_path))
+    
+    report = generate_branch_insights(input_dir, client=HttpLLMClient(url),
+                                      requests_per_second=5.0, burst=1, batch=True)
+    
+    # One request per branch, the first immediately and then one per
+    # 0.2 seconds
+    assert report['completed'] == 4
+    assert report['llm_calls'] == server.requests == 4
+    assert report['elapsed_seconds'] >= 0.55
+    insights = load_json_data(os.path.join(input_dir, 'branch_000', 'combined_insights.json'))
+    assert all(section['analysis'].startswith("Stand-in") for section in insights.values())
@@ -0,0 +1,11 @@
+from model_store import ModelStore
+
+def test_unsaved_models_are_not_evicted(tmp_path):
+    store = ModelStore(model_dir=str(tmp_path), max_models=1)
+    store.put('a', 'model a')
+    store.put('b', 'model b')
+    
+    assert store.cached_items() == ['a', 'b']
+    assert store.get('a') == 'model a'
+    assert store.get_stats()['evictions'] == 0
+
@@ -0,0 +1,37 @@
+import pandas as pd
+from waste_ingestion import WasteIngestor
+
+def write_log(path, rows, mode='w'):
+    pd.DataFrame(rows).to_csv(path, mode=mode, header=mode == 'w', index=False)
+
+def waste_rows(item_name, dates, quantity):
+    return [{'date': date, 'item_name': item_name, 'quantity': quantity, 'cost': quantity * 2,
+             'category': 'produce'} for date in dates]
+
+def test_update_from_csv_resumes_appended_rows(tmp_path):
+    log = tmp_path / 'waste.csv'
+    write_log(log, waste_rows('Tomatoes', ['2024-01-01', '2024-01-02'], 1.0))
+    ingestor = WasteIngestor()
+    ingestor.update_from_csv(str(log))
+    
+    write_log(log, waste_rows('Tomatoes', ['2024-01-03'], 1.0), mode='a')
+    state = tmp_path / 'state.json'
+    ingestor.save(str(state))
+    resumed = WasteIngestor()
+    resumed.load(str(state))
+    
+    assert resumed.update_from_csv(str(log)) == 1
+    assert resumed.daily['waste_amount'].sum() == 3.0
+
+def test_update_from_csv_rebuilds_after_the_log_is_rewritten(tmp_path):
+    log = tmp_path / 'waste.csv'
+    write_log(log, waste_rows('Tomatoes', ['2024-01-01', '2024-01-02'], 1.0))
+    ingestor = WasteIngestor()
+    ingestor.update_from_csv(str(log))
+    
+    # A regenerated log with as many rows as before, plus one
+    write_log(log, waste_rows('Milk', ['2024-02-01', '2024-02-02', '2024-02-03'], 5.0))
+    
+    assert ingestor.update_from_csv(str(log)) == 3
+    assert ingestor.daily.index.get_level_values('item_name').unique().tolist() == ['Milk']
+    assert ingestor.daily['waste_amount'].sum() == 15.0
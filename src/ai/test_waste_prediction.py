@@ -0,0 +1,91 @@
+import pandas as pd
+import numpy as np
+from waste_prediction import WastePredictor, MAX_CATEGORIES
+
+def make_catalogue(n_items, n_days=20, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-01', periods=n_days, freq='D')
+    n_rows = n_items * n_days
+    item_index = np.repeat(np.arange(n_items), n_days)
+    return pd.DataFrame({
+        'date': np.tile(dates, n_items),
+        'item_name': [f'item_{i:04d}' for i in item_index],
+        'category': [f'category_{i % 7}' for i in item_index],
+        'inventory_level': rng.uniform(50, 200, n_rows),
+        'sales_forecast': rng.uniform(20, 100, n_rows),
+        'shelf_life_days': rng.uniform(3, 14, n_rows),
+        'waste_amount': item_index % 10 + rng.uniform(0, 1, n_rows)
+    })
+
+def test_global_model_trains_with_more_items_than_categories(tmp_path):
+    data = make_catalogue(MAX_CATEGORIES + 45)
+    predictor = WastePredictor(model_dir=str(tmp_path), mode='global')
+    
+    metrics = predictor.train_global_model(data)
+    
+    assert metrics['items'] == MAX_CATEGORIES + 45
+    assert 'item_code' in predictor.global_model['target_encodings']
+    assert 'category' not in predictor.global_model['target_encodings']
+    
+    batch = data[data['date'] == data['date'].max()]
+    predictions = predictor.predict_waste_many(batch)
+    assert len(predictions) == MAX_CATEGORIES + 45
+    
+    # The saved model encodes the items the same way
+    reloaded = WastePredictor(model_dir=str(tmp_path), mode='global')
+    reloaded_predictions = reloaded.predict_waste_many(batch)
+    assert reloaded_predictions['item_0000']['predictions'] == \
+        predictions['item_0000']['predictions']
+
+def test_global_model_keeps_small_catalogues_categorical(tmp_path):
+    predictor = WastePredictor(model_dir=str(tmp_path), mode='global')
+    predictor.train_global_model(make_catalogue(12), save_model=False)
+    
+    assert predictor.global_model['target_encodings'] == {}
+    assert predictor.global_model['model'].is_categorical_.sum() == 2
+
+def test_retraining_discards_the_compiled_forest(tmp_path):
+    data = make_catalogue(1, n_days=60)
+    predictor = WastePredictor(model_dir=str(tmp_path), use_compiled=True)
+    predictor.train_model('item_0000', data)
+    predictor.compile_model('item_0000')
+    
+    retrained = data.assign(waste_amount=data['waste_amount'] + 100)
+    predictor.train_model('item_0000', retrained)
+    
+    assert not (tmp_path / 'item_0000_waste_model.npz').exists()
+    predictions = predictor.predict_waste('item_0000', data.tail(5))['predictions']
+    assert min(p['predicted_waste'] for p in predictions) > 50
+
+def test_compiled_predictions_fall_back_for_streaming_models(tmp_path):
+    data = make_catalogue(1, n_days=60)
+    predictor = WastePredictor(model_dir=str(tmp_path), use_compiled=True)
+    predictor.train_model('item_0000', data)
+    predictor.compile_model('item_0000')
+    predictor.train_streaming('item_0000', data)
+    
+    assert not (tmp_path / 'item_0000_waste_model.npz').exists()
+    
+    # A new process loads the SGD model instead of compiling it
+    reloaded = WastePredictor(model_dir=str(tmp_path), use_compiled=True)
+    predictions = reloaded.predict_waste('item_0000', data.tail(5))['predictions']
+    assert len(predictions) == 5
+    assert 'item_0000' not in reloaded.compiled
+
+def test_explained_predictions_sum_their_contributions_after_pruning(tmp_path):
+    data = make_catalogue(1, n_days=60)
+    predictor = WastePredictor(model_dir=str(tmp_path), use_compiled=True)
+    predictor.train_model('item_0000', data)
+    predictor.compile_model('item_0000', max_depth=3, min_samples=5)
+    
+    results = predictor.predict_waste('item_0000', data.tail(10), explain=True)
+    
+    bias = results['baseline']
+    for record in results['predictions']:
+        total = bias + sum(record['contributions'].values())
+        assert np.isclose(total, record['predicted_waste'])
+    
+    # The explained predictions match the unpruned sklearn model
+    X, _ = predictor.prepare_features(data.tail(10), 'item_0000')
+    expected = predictor.models['item_0000'].predict(predictor.scalers['item_0000'].transform(X))
+    assert np.allclose([r['predicted_waste'] for r in results['predictions']], expected)
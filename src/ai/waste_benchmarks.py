@@ -0,0 +1,250 @@
+import pandas as pd
+import numpy as np
+import argparse
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+import pickle
+import tempfile
+import time
+import tracemalloc
+import joblib
+import os
+from waste_prediction import WastePredictor
+from compiled_forest import CompiledForest
+from benchmark_dataset import SCALE_FACTORS, load_waste_history
+
+def _holdout_split(data, holdout_fraction):
+    """Hold out the most recent fraction of each item's days"""
+    cutoff = data.groupby('item_name')['date'].transform(
+        lambda dates: dates.quantile(1 - holdout_fraction)
+    )
+    return data[data['date'] <= cutoff], data[data['date'] > cutoff]
+
+def _directory_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+def benchmark_global_model(data, attribute_columns=('category',), holdout_fraction=0.2):
+    """
+    Compare per-item models with a single global model
+    
+    Both modes train on the same history and are scored on the same
+    trailing holdout of every item.
+    
+    Args:
+        data (pd.DataFrame): Waste history for every item, with an
+            'item_name' column
+        attribute_columns (tuple): Item attributes used by the global model
+        holdout_fraction (float): Fraction of each item's days held out
+        
+    Returns:
+        pd.DataFrame: One row per mode with model count, training and
+            prediction time, in-memory and on-disk model size, and
+            holdout MAE/RMSE. The memory figure is model_bytes, the
+            pickled size of the models the predictor keeps; tracemalloc
+            would miss the tree buffers sklearn allocates natively.
+    """
+    train, test = _holdout_split(data, holdout_fraction)
+    items = sorted(train['item_name'].unique())
+    
+    rows = []
+    for mode in ('per_item', 'global'):
+        with tempfile.TemporaryDirectory() as model_dir:
+            predictor = WastePredictor(model_dir=model_dir, mode=mode)
+            
+            start = time.perf_counter()
+            if mode == 'per_item':
+                for item_name in items:
+                    predictor.train_model(item_name, train[train['item_name'] == item_name])
+            else:
+                predictor.train_global_model(train, attribute_columns)
+            train_seconds = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            if mode == 'per_item':
+                predictions = {
+                    item_name: predictor.predict_waste(item_name, group)
+                    for item_name, group in test.groupby('item_name')
+                }
+            else:
+                predictions = predictor.predict_waste_many(test)
+            predict_seconds = time.perf_counter() - start
+            
+            if mode == 'per_item':
+                model_bytes = len(pickle.dumps((predictor.models, predictor.scalers)))
+            else:
+                model_bytes = len(pickle.dumps(predictor.global_model))
+            disk_bytes = _directory_bytes(model_dir)
+            
+        y_true = np.concatenate([
+            group['waste_amount'].to_numpy() for _, group in test.groupby('item_name')
+        ])
+        y_pred = np.concatenate([
+            [prediction['predicted_waste'] for prediction in predictions[item_name]['predictions']]
+            for item_name, _ in test.groupby('item_name')
+        ])
+        
+        rows.append({
+            'mode': mode,
+            'models': len(items) if mode == 'per_item' else 1,
+            'train_seconds': train_seconds,
+            'predict_seconds': predict_seconds,
+            'model_bytes': model_bytes,
+            'disk_bytes': disk_bytes,
+            'mae': mean_absolute_error(y_true, y_pred),
+            'rmse': np.sqrt(mean_squared_error(y_true, y_pred))
+        })
+        
+    return pd.DataFrame(rows)
+
+def _median_seconds(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+def benchmark_compiled_forest(data, variants=((None, 1), (12, 1), (None, 5)),
+                              batch_rows=10000, repeats=20):
+    """
+    Compare sklearn inference with compiled forests for one item's model
+    
+    Args:
+        data (pd.DataFrame): Waste history of one item
+        variants (tuple): (max_depth, min_samples) settings to compile
+        batch_rows (int): Rows in the batch latency test
+        repeats (int): Timing repetitions (the median is reported)
+        
+    Returns:
+        pd.DataFrame: One row per model with load time, in-memory and
+            on-disk size, single-row and batch latency, and the mean
+            absolute difference from the sklearn predictions
+    """
+    with tempfile.TemporaryDirectory() as model_dir:
+        predictor = WastePredictor(model_dir=model_dir)
+        predictor.train_model('item', data)
+        model_path = os.path.join(model_dir, 'item_waste_model.pkl')
+        scaler_path = os.path.join(model_dir, 'item_scaler.pkl')
+        
+        X, _ = predictor.prepare_features(data, 'item')
+        batch = X.sample(batch_rows, replace=True, random_state=42)
+        single = X.iloc[:1]
+        
+        model, scaler = predictor.models['item'], predictor.scalers['item']
+        reference = model.predict(scaler.transform(batch))
+        rows = [{
+            'model': 'sklearn',
+            'nodes': sum(tree.tree_.node_count for tree in model.estimators_),
+            'load_seconds': _median_seconds(
+                lambda: (joblib.load(model_path), joblib.load(scaler_path)), repeats
+            ),
+            'model_bytes': len(pickle.dumps((model, scaler))),
+            'disk_bytes': os.path.getsize(model_path) + os.path.getsize(scaler_path),
+            'single_row_seconds': _median_seconds(
+                lambda: model.predict(scaler.transform(single)), repeats
+            ),
+            'batch_seconds': _median_seconds(
+                lambda: model.predict(scaler.transform(batch)), repeats
+            ),
+            'mean_abs_diff': 0.0
+        }]
+        
+        values = batch.to_numpy(dtype=float)
+        for max_depth, min_samples in variants:
+            compiled = predictor.compile_model('item', max_depth, min_samples)
+            compiled_path = os.path.join(model_dir, 'item_waste_model.npz')
+            single_values = values[:1]
+            rows.append({
+                'model': f"compiled(max_depth={max_depth}, min_samples={min_samples})",
+                'nodes': compiled.n_nodes,
+                'load_seconds': _median_seconds(lambda: CompiledForest.load(compiled_path), repeats),
+                'model_bytes': compiled.nbytes,
+                'disk_bytes': os.path.getsize(compiled_path),
+                'single_row_seconds': _median_seconds(
+                    lambda: compiled.predict(single_values), repeats
+                ),
+                'batch_seconds': _median_seconds(lambda: compiled.predict(values), repeats),
+                'mean_abs_diff': float(np.abs(compiled.predict(values) - reference).mean())
+            })
+            
+    return pd.DataFrame(rows)
+
+def benchmark_streaming_training(data, memory_budget_mb=16, epochs=5, holdout_fraction=0.2):
+    """
+    Compare in-memory RandomForest training with out-of-core SGD training
+    
+    The item's history is written to a CSV and streamed back in chunks
+    sized by the memory budget; both models are scored on the same
+    trailing holdout.
+    
+    Args:
+        data (pd.DataFrame): Waste history of one item
+        memory_budget_mb (float): Memory budget for the streamed chunks
+        epochs (int): Passes over the streamed data
+        holdout_fraction (float): Fraction of the days held out
+        
+    Returns:
+        pd.DataFrame: One row per training path with training time,
+            throughput, peak traced memory and holdout MAE/RMSE
+    """
+    train, test = _holdout_split(data, holdout_fraction)
+    train = train.drop(columns=['item_name'], errors='ignore')
+    
+    rows = []
+    with tempfile.TemporaryDirectory() as model_dir:
+        csv_path = os.path.join(model_dir, 'train.csv')
+        train.to_csv(csv_path, index=False)
+        
+        for path in ('in_memory_random_forest', 'streaming_sgd'):
+            predictor = WastePredictor(model_dir=model_dir)
+            
+            tracemalloc.start()
+            start = time.perf_counter()
+            if path == 'in_memory_random_forest':
+                predictor.train_model('item', pd.read_csv(csv_path))
+            else:
+                predictor.train_streaming('item', csv_path, memory_budget_mb=memory_budget_mb,
+                                          holdout_fraction=0, epochs=epochs)
+            train_seconds = time.perf_counter() - start
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            y_pred = np.array([
+                prediction['predicted_waste']
+                for prediction in predictor.predict_waste('item', test)['predictions']
+            ])
+            y_true = test['waste_amount'].to_numpy()
+            rows.append({
+                'path': path,
+                'rows': len(train),
+                'train_seconds': train_seconds,
+                'rows_per_second': len(train) * (epochs if path == 'streaming_sgd' else 1)
+                                   / train_seconds,
+                'peak_train_memory_bytes': peak_memory,
+                'mae': mean_absolute_error(y_true, y_pred),
+                'rmse': np.sqrt(mean_squared_error(y_true, y_pred))
+            })
+            
+    return pd.DataFrame(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark waste model training and inference")
+    parser.add_argument('--scale', default='SF1', choices=sorted(SCALE_FACTORS),
+                        help="benchmark dataset scale factor")
+    args = parser.parse_args()
+    
+    try:
+        data = load_waste_history(args.scale)
+        print(benchmark_global_model(data).to_string(index=False))
+        
+        # The item with the most logged waste
+        item_name = data.groupby('item_name')['waste_amount'].sum().idxmax()
+        print(benchmark_compiled_forest(data[data['item_name'] == item_name]).to_string(index=False))
+        
+        # Every item's rows streamed as one long history
+        print(benchmark_streaming_training(data).to_string(index=False))
+        
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
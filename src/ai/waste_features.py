@@ -0,0 +1,242 @@
+import pandas as pd
+import numpy as np
+import joblib
+
+CALENDAR_COLUMNS = ['day_of_week', 'month', 'day_of_month']
+RAW_COLUMNS = ['inventory_level', 'sales_forecast', 'shelf_life_days']
+FEATURE_COLUMNS = CALENDAR_COLUMNS + RAW_COLUMNS
+DEFAULT_ITEM = '__all__'
+
+class WasteFeatureStore:
+    def __init__(self, lags=(1, 7), rolling_windows=(7, 28), days_to_expiry=True,
+                 target='waste_amount'):
+        """
+        Initialize the waste prediction feature store
+        
+        Calendar features are computed once per unique date and cached.
+        History features (lagged waste and rolling means) are computed from
+        the per-item waste history, which grows incrementally as new daily
+        rows arrive through update(). Lags and rolling means only use
+        observations dated before the row, so they are available both for
+        training rows and for future dates at prediction time (a lag
+        reaching past the latest observation uses the latest one).
+        
+        Args:
+            lags (tuple): Waste lags in days
+            rolling_windows (tuple): Rolling-mean windows in observations
+            days_to_expiry (bool): Whether to add days until expiry
+                (from an 'expiration_date' column, else the shelf life)
+            target (str): Target column
+        """
+        self.lags = tuple(lags)
+        self.rolling_windows = tuple(rolling_windows)
+        self.days_to_expiry = days_to_expiry
+        self.target = target
+        
+        self.feature_columns = (
+            FEATURE_COLUMNS
+            + [f"lag_{lag}" for lag in self.lags]
+            + [f"rolling_mean_{window}" for window in self.rolling_windows]
+            + (['days_to_expiry'] if days_to_expiry else [])
+        )
+        
+        self.calendar = pd.DataFrame(columns=CALENDAR_COLUMNS, dtype='int64')
+        self.history = {}
+        self.features = None
+        
+    @property
+    def uses_history(self):
+        return bool(self.lags or self.rolling_windows)
+        
+    def calendar_features(self, dates):
+        """
+        Look up calendar features, computing them only for dates not seen
+        before
+        
+        Args:
+            dates (pd.Series): Parsed, normalized dates
+            
+        Returns:
+            pd.DataFrame: Calendar features aligned with dates
+        """
+        new_dates = pd.DatetimeIndex(dates.unique()).difference(self.calendar.index)
+        if len(new_dates):
+            computed = pd.DataFrame({
+                'day_of_week': new_dates.dayofweek,
+                'month': new_dates.month,
+                'day_of_month': new_dates.day
+            }, index=new_dates, dtype='int64')
+            self.calendar = pd.concat([self.calendar, computed]) if len(self.calendar) else computed
+            
+        features = self.calendar.reindex(dates.to_numpy())
+        features.index = dates.index
+        return features
+        
+    def _item_keys(self, data, item_name):
+        if 'item_name' in data.columns:
+            return data['item_name'].astype(str)
+        return pd.Series(item_name or DEFAULT_ITEM, index=data.index)
+        
+    def _add_history(self, items, dates, values, replace=False):
+        """
+        Merge new observations into the per-item history, replacing
+        observations for dates already recorded (or the item's whole
+        history when replace is set)
+        """
+        frame = pd.DataFrame({'item_name': items, 'date': dates, 'value': values}) \
+                  .dropna(subset=['date', 'value'])
+        for item_name, group in frame.groupby('item_name', sort=False):
+            new = pd.Series(group['value'].to_numpy(dtype=float),
+                            index=pd.DatetimeIndex(group['date']))
+            new = new[~new.index.duplicated(keep='last')]
+            old = None if replace else self.history.get(item_name)
+            if old is not None:
+                new = pd.concat([old['series'][~old['series'].index.isin(new.index)], new])
+            new = new.sort_index()
+            self.history[item_name] = {
+                'series': new,
+                'dates': new.index.as_unit('ns').asi8,
+                'cumsum': np.concatenate([[0.0], np.cumsum(new.to_numpy())])
+            }
+            
+    def _history_features(self, items, dates):
+        """
+        Compute lag and rolling-mean features from the history, one
+        vectorized lookup per item
+        """
+        columns = [f"lag_{lag}" for lag in self.lags] + \
+                  [f"rolling_mean_{window}" for window in self.rolling_windows]
+        features = np.zeros((len(dates), len(columns)))
+        day_ns = dates.to_numpy(dtype='datetime64[ns]').astype('int64')
+        
+        for item_name, rows in items.groupby(items, sort=False).indices.items():
+            history = self.history.get(item_name)
+            if history is None:
+                continue
+                
+            values = history['series'].to_numpy()
+            for column, lag in enumerate(self.lags):
+                target_ns = day_ns[rows] - lag * 86_400_000_000_000
+                position = np.searchsorted(history['dates'], target_ns, side='right') - 1
+                features[rows, column] = np.where(
+                    position >= 0, values[np.maximum(position, 0)], 0.0
+                )
+                
+            before = np.searchsorted(history['dates'], day_ns[rows], side='left')
+            for column, window in enumerate(self.rolling_windows, start=len(self.lags)):
+                start = np.maximum(before - window, 0)
+                count = before - start
+                totals = history['cumsum'][before] - history['cumsum'][start]
+                features[rows, column] = np.where(count > 0, totals / np.maximum(count, 1), 0.0)
+                
+        return pd.DataFrame(features, index=dates.index, columns=columns)
+        
+    def transform(self, data, item_name=None):
+        """
+        Build the feature matrix for rows without changing the history
+        
+        Args:
+            data (pd.DataFrame): Rows with 'date' and the raw feature columns
+            item_name (str): Item of the rows when data has no
+                'item_name' column
+                
+        Returns:
+            pd.DataFrame: Features in feature_columns order
+        """
+        dates = pd.to_datetime(data['date']).dt.normalize()
+        parts = [self.calendar_features(dates), data[RAW_COLUMNS]]
+        
+        if self.uses_history:
+            parts.append(self._history_features(self._item_keys(data, item_name), dates))
+            
+        features = pd.concat(parts, axis=1)
+        if self.days_to_expiry:
+            if 'expiration_date' in data.columns:
+                features['days_to_expiry'] = (pd.to_datetime(data['expiration_date']).dt.normalize()
+                                              - dates).dt.days
+            else:
+                features['days_to_expiry'] = data['shelf_life_days']
+                
+        return features[self.feature_columns]
+        
+    def update(self, data, item_name=None, cache=True, replace=False):
+        """
+        Add new daily rows to the history and compute their features
+        
+        The features of the new rows are appended to the cached feature
+        matrix, so earlier rows are never recomputed. With replace, the
+        rows become the whole history of their items instead, so
+        retraining on a full training set does not pile up stale rows.
+        
+        Args:
+            data (pd.DataFrame): Rows with 'date', the raw feature columns
+                and the target
+            item_name (str): Item of the rows when data has no
+                'item_name' column
+            cache (bool): Append the features to the cached matrix
+                (disable when streaming data larger than memory)
+            replace (bool): Drop the items' earlier history and cached
+                features first
+                
+        Returns:
+            pd.DataFrame: Features of the new rows
+        """
+        items = self._item_keys(data, item_name)
+        if self.uses_history:
+            self._add_history(items, pd.to_datetime(data['date']).dt.normalize(),
+                              data[self.target], replace=replace)
+        
+        features = self.transform(data, item_name)
+        if not cache:
+            return features
+            
+        cached = features.assign(
+            item_name=items.to_numpy(),
+            date=pd.to_datetime(data['date']).dt.normalize().to_numpy(),
+            **{self.target: data[self.target].to_numpy()}
+        )
+        previous = self.features
+        if previous is not None and replace:
+            previous = previous[~previous['item_name'].isin(items.unique())]
+        if previous is not None:
+            cached = pd.concat([previous, cached], ignore_index=True) \
+                       .drop_duplicates(['item_name', 'date'], keep='last')
+        self.features = cached.reset_index(drop=True)
+        return features
+        
+    def feature_matrix(self, item_name=None):
+        """
+        Return the cached features of every row added through update()
+        
+        Args:
+            item_name (str): Only return this item's rows
+            
+        Returns:
+            tuple: X (features) and y (target)
+        """
+        features = self.features
+        if item_name is not None:
+            features = features[features['item_name'] == item_name]
+        return features[self.feature_columns], features[self.target]
+        
+    def save(self, path):
+        """
+        Save the store (calendar cache, history and cached features)
+        
+        Args:
+            path (str): Path of the pickle file
+        """
+        joblib.dump(self, path)
+        
+    @staticmethod
+    def load(path):
+        """
+        Load a store written by save()
+        
+        Args:
+            path (str): Path of the pickle file
+            
+        Returns:
+            WasteFeatureStore: The loaded store
+        """
+        return joblib.load(path)
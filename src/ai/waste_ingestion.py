@@ -0,0 +1,308 @@
+import pandas as pd
+import numpy as np
+import json
+import re
+import os
+from sales_ingestion import log_fingerprint, log_unchanged
+
+WASTE_COLUMNS = ['date', 'item_name', 'quantity', 'cost', 'category']
+WASTE_KEYS = ['date', 'item_name']
+TRAINING_COLUMNS = [
+    'date', 'item_name', 'category', 'inventory_level', 'sales_forecast',
+    'shelf_life_days', 'waste_amount', 'waste_cost', 'waste_events'
+]
+
+def normalize_item_name(name):
+    """
+    Normalize an item name for joining the waste log with the inventory
+    files ('Tomatoes' -> 'tomato', 'Chicken Breast' -> 'chicken breast')
+    
+    Args:
+        name (str): Raw item name
+        
+    Returns:
+        str: Lowercase, singular words separated by single spaces
+    """
+    words = re.sub(r'[^a-z ]+', ' ', str(name).lower()).split()
+    singular = []
+    for word in words:
+        if word.endswith('oes') or word.endswith('shes') or word.endswith('ches'):
+            word = word[:-2]
+        elif word.endswith('s') and not word.endswith('ss') and len(word) > 3:
+            word = word[:-1]
+        singular.append(word)
+    return ' '.join(singular)
+
+def iter_waste_log(csv_path, chunksize=100_000, skip_rows=0):
+    """
+    Stream cleaned rows from a waste_management_data.csv style log
+    
+    Rows are passed through one-for-one (unparseable dates become NaT),
+    so callers can count rows to resume an append-only log.
+    
+    Args:
+        csv_path (str): Path to the waste log
+        chunksize (int): Rows per chunk
+        skip_rows (int): Number of data rows to skip (already processed)
+        
+    Yields:
+        pd.DataFrame: Waste events with parsed dates
+    """
+    skiprows = range(1, skip_rows + 1) if skip_rows else None
+    for chunk in pd.read_csv(csv_path, usecols=WASTE_COLUMNS, chunksize=chunksize,
+                             skiprows=skiprows, dtype={'item_name': 'object', 'category': 'object'}):
+        chunk['date'] = pd.to_datetime(chunk['date'], format='%Y-%m-%d', errors='coerce')
+        yield chunk
+
+def load_inventory_attributes(indian_inventory_path=None, restaurant_inventory_path=None,
+                              usage_days=30):
+    """
+    Summarize the inventory snapshots per normalized item name
+    
+    restaurant_inventory_data.csv provides stock, shelf life and usage;
+    indian_restaurant_inventory.csv fills in stock for items missing from
+    it.
+    
+    Args:
+        indian_inventory_path (str): Path to indian_restaurant_inventory.csv
+        restaurant_inventory_path (str): Path to restaurant_inventory_data.csv
+        usage_days (int): Days covered by Usage_Count, used to turn it
+            into a daily usage rate
+            
+    Returns:
+        pd.DataFrame: 'inventory_level', 'shelf_life_days' and
+            'sales_forecast' (daily usage) indexed by normalized name
+    """
+    frames = []
+    if restaurant_inventory_path and os.path.exists(restaurant_inventory_path):
+        restaurant = pd.read_csv(restaurant_inventory_path)
+        frames.append(pd.DataFrame({
+            'key': restaurant['Item'].map(normalize_item_name),
+            'inventory_level': restaurant['Current_Stock'],
+            'shelf_life_days': restaurant['Expiration_Days'],
+            'sales_forecast': restaurant['Usage_Count'] / usage_days
+        }).groupby('key').mean())
+        
+    if indian_inventory_path and os.path.exists(indian_inventory_path):
+        indian = pd.read_csv(indian_inventory_path)
+        frames.append(pd.DataFrame({
+            'key': indian['Name'].map(normalize_item_name),
+            'inventory_level': indian['Quantity']
+        }).groupby('key').sum())
+        
+    columns = ['inventory_level', 'shelf_life_days', 'sales_forecast']
+    if not frames:
+        return pd.DataFrame(columns=columns, dtype=float)
+        
+    # Earlier sources take precedence
+    attributes = frames[0].reindex(columns=columns)
+    for frame in frames[1:]:
+        attributes = attributes.combine_first(frame.reindex(columns=columns))
+    return attributes
+
+def _match_inventory(item_names, attributes):
+    """
+    Match waste log items to inventory keys: the full normalized name
+    first, then its last word, then any other word ('chicken breast'
+    falls back to 'chicken')
+    """
+    matches = {}
+    for item_name in item_names:
+        key = normalize_item_name(item_name)
+        words = key.split()
+        for candidate in [key] + words[::-1]:
+            if candidate in attributes.index:
+                matches[item_name] = candidate
+                break
+    return matches
+
+class WasteIngestor:
+    def __init__(self, chunksize=100_000):
+        """
+        Initialize incremental aggregation of the waste log into daily
+        per-item training rows
+        
+        Args:
+            chunksize (int): Rows parsed per chunk, bounding peak memory
+        """
+        self.chunksize = chunksize
+        self.reset()
+        
+    def reset(self):
+        """Drop the aggregates and the position in the waste log"""
+        self.daily = pd.DataFrame(
+            columns=['waste_amount', 'waste_cost', 'waste_events'],
+            index=pd.MultiIndex.from_arrays([[], []], names=WASTE_KEYS),
+            dtype='float64'
+        )
+        self.categories = {}
+        self.rows_seen = 0
+        self.source = None
+        
+    def update(self, events):
+        """
+        Add a chunk of waste events to the daily aggregates
+        
+        Args:
+            events (pd.DataFrame): Waste events with 'date', 'item_name',
+                'quantity', 'cost' and 'category'
+        """
+        frame = events.dropna(subset=['date', 'item_name']).assign(
+            date=lambda df: df['date'].dt.normalize(),
+            waste_events=1.0
+        ).rename(columns={'quantity': 'waste_amount', 'cost': 'waste_cost'})
+        
+        daily = frame.groupby(WASTE_KEYS)[['waste_amount', 'waste_cost', 'waste_events']].sum()
+        self.daily = daily if self.daily.empty else self.daily.add(daily, fill_value=0)
+        self.categories.update(
+            frame.dropna(subset=['category']).groupby('item_name')['category'].last().to_dict()
+        )
+        
+    def update_from_csv(self, csv_path):
+        """
+        Add the rows appended to the waste log since the last update
+        
+        When the log was rewritten or truncated since then (e.g.
+        regenerated by scripts/generate_waste_data.py), the aggregates
+        are rebuilt from the whole file.
+        
+        Args:
+            csv_path (str): Path to the waste log
+            
+        Returns:
+            int: Number of new rows processed
+        """
+        if self.rows_seen and not log_unchanged(csv_path, self.source):
+            print(f"{csv_path} was rewritten since the last update, rebuilding the aggregates")
+            self.reset()
+        self.source = log_fingerprint(csv_path)
+        
+        processed = 0
+        for chunk in iter_waste_log(csv_path, self.chunksize, skip_rows=self.rows_seen):
+            self.update(chunk)
+            processed += len(chunk)
+            
+        self.rows_seen += processed
+        return processed
+        
+    def training_frame(self, inventory=None, fill_missing_days=True):
+        """
+        Build daily per-item training rows for WastePredictor
+        
+        Items are joined to the inventory attributes by normalized name.
+        Attributes missing for an item are filled with the median over
+        the matched items.
+        
+        Args:
+            inventory (pd.DataFrame): Output of load_inventory_attributes
+            fill_missing_days (bool): Add zero-waste rows for days without
+                logged waste between the first and last logged day
+                
+        Returns:
+            pd.DataFrame: Rows with TRAINING_COLUMNS
+        """
+        daily = self.daily
+        if fill_missing_days and not daily.empty:
+            dates = daily.index.get_level_values('date')
+            grid = pd.MultiIndex.from_product(
+                [pd.date_range(dates.min(), dates.max(), freq='D'),
+                 daily.index.get_level_values('item_name').unique()],
+                names=WASTE_KEYS
+            )
+            daily = daily.reindex(grid, fill_value=0)
+        frame = daily.reset_index()
+        frame['category'] = frame['item_name'].map(self.categories)
+        
+        if inventory is None:
+            inventory = load_inventory_attributes()
+        matches = _match_inventory(frame['item_name'].unique(), inventory)
+        attributes = inventory.reindex(frame['item_name'].map(matches))
+        for column in ['inventory_level', 'shelf_life_days', 'sales_forecast']:
+            values = attributes[column].to_numpy(dtype=float) if column in attributes \
+                else np.full(len(frame), np.nan)
+            median = np.nanmedian(values) if np.isfinite(values).any() else 0.0
+            frame[column] = np.where(np.isnan(values), median, values)
+            
+        return frame[TRAINING_COLUMNS].sort_values(WASTE_KEYS).reset_index(drop=True)
+        
+    def save(self, path):
+        """
+        Save the aggregation state
+        
+        Args:
+            path (str): Path of the JSON state file
+        """
+        state = {
+            'rows_seen': self.rows_seen,
+            'source': self.source,
+            'categories': self.categories,
+            'daily': [
+                [date.strftime('%Y-%m-%d'), item_name, *map(float, values)]
+                for (date, item_name), values in zip(self.daily.index, self.daily.to_numpy())
+            ]
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        
+    def load(self, path):
+        """
+        Load aggregation state written by save()
+        
+        Args:
+            path (str): Path of the JSON state file
+        """
+        with open(path, 'r') as f:
+            state = json.load(f)
+            
+        self.rows_seen = state['rows_seen']
+        self.source = state.get('source')
+        self.categories = state['categories']
+        daily = pd.DataFrame(state['daily'], columns=WASTE_KEYS + list(self.daily.columns))
+        daily['date'] = pd.to_datetime(daily['date'])
+        self.daily = daily.set_index(WASTE_KEYS).astype('float64')
+
+def load_waste_training_data(waste_log='../../public/files/waste_management_data.csv',
+                             indian_inventory='../../public/files/indian_restaurant_inventory.csv',
+                             restaurant_inventory='../../public/files/restaurant_inventory_data.csv',
+                             state_path='waste_ingestion_state.json'):
+    """
+    Update the persisted aggregation with new waste log rows and build the
+    training frame
+    
+    Args:
+        waste_log (str): Path to the waste log
+        indian_inventory (str): Path to indian_restaurant_inventory.csv
+        restaurant_inventory (str): Path to restaurant_inventory_data.csv
+        state_path (str): Path of the aggregation state (None disables
+            persistence)
+            
+    Returns:
+        pd.DataFrame: Daily per-item training rows
+    """
+    ingestor = WasteIngestor()
+    if state_path and os.path.exists(state_path):
+        ingestor.load(state_path)
+        
+    ingestor.update_from_csv(waste_log)
+    if state_path:
+        ingestor.save(state_path)
+        
+    inventory = load_inventory_attributes(indian_inventory, restaurant_inventory)
+    return ingestor.training_frame(inventory)
+
+def main():
+    # Example usage
+    try:
+        training = load_waste_training_data()
+        print(f"Built {len(training)} training rows for {training['item_name'].nunique()} items "
+              f"from {training['date'].min():%Y-%m-%d} to {training['date'].max():%Y-%m-%d}")
+        print(training.groupby('item_name')[['waste_amount', 'inventory_level',
+                                             'shelf_life_days']].mean().round(2))
+    
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.linear_model import SGDRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
@@ -8,44 +9,70 @@ import joblib
 import json
 from datetime import datetime, timedelta
 import os
+import time
+from waste_features import WasteFeatureStore
+from compiled_forest import CompiledForest
+from waste_ingestion import load_waste_training_data
+
+# HistGradientBoostingRegressor's limit on categorical cardinality; columns
+# with more values are target encoded instead
+MAX_CATEGORIES = 255
 
 class WastePredictor:
-    def __init__(self, model_dir='models'):
+    def __init__(self, model_dir='models', mode='per_item', feature_store=None,
+                 use_compiled=False):
         """
         Initialize the waste prediction system
         
         Args:
             model_dir (str): Directory to store trained models
+            mode (str): 'per_item' trains a model and scaler per item,
+                'global' one model across all items
+            feature_store (WasteFeatureStore): Feature store shared by
+                training and prediction (defaults to the calendar and raw
+                columns only)
+            use_compiled (bool): Predict per-item models with their
+                compiled forests (see compile_model) instead of sklearn
         """
+        if mode not in ('per_item', 'global'):
+            raise ValueError(f"Unknown mode {mode}")
+            
         self.model_dir = model_dir
         os.makedirs(model_dir, exist_ok=True)
+        self.mode = mode
+        self.use_compiled = use_compiled
         self.models = {}
         self.scalers = {}
+        self.compiled = {}
+        self.explainers = {}
+        self.global_model = None
+        self.feature_store = feature_store or WasteFeatureStore(
+            lags=(), rolling_windows=(), days_to_expiry=False
+        )
+        self.feature_columns = self.feature_store.feature_columns
         
-    def prepare_features(self, data):
+    def prepare_features(self, data, item_name=None, update=False):
         """
         Prepare features for waste prediction
         
         Args:
             data (pd.DataFrame): Raw data with waste information
-            
+            item_name (str): Item of the rows when data has no
+                'item_name' column
+            update (bool): Make the rows the feature store's history of
+                their items (training data) instead of only reading from
+                it
+                
         Returns:
-            tuple: X (features) and y (target)
+            tuple: X (features) and y (target, None when absent)
         """
-        # Extract temporal features
-        df = data.copy()
-        df['day_of_week'] = pd.to_datetime(df['date']).dt.dayofweek
-        df['month'] = pd.to_datetime(df['date']).dt.month
-        df['day_of_month'] = pd.to_datetime(df['date']).dt.day
-        
-        # Define feature columns
-        feature_cols = [
-            'day_of_week', 'month', 'day_of_month',
-            'inventory_level', 'sales_forecast', 'shelf_life_days'
-        ]
-        
-        X = df[feature_cols]
-        y = df['waste_amount']
+        if update:
+            # Training reads the returned features, so the store's cached
+            # matrix (a copy of every training set) is not built
+            X = self.feature_store.update(data, item_name, cache=False, replace=True)
+        else:
+            X = self.feature_store.transform(data, item_name)
+        y = data['waste_amount'] if 'waste_amount' in data.columns else None
         
         return X, y
         
@@ -62,7 +89,7 @@ class WastePredictor:
             dict: Training metrics
         """
         # Prepare features
-        X, y = self.prepare_features(training_data)
+        X, y = self.prepare_features(training_data, item_name, update=True)
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -92,9 +119,10 @@ class WastePredictor:
             
             joblib.dump(model, model_path)
             joblib.dump(scaler, scaler_path)
-        
+            
         self.models[item_name] = model
         self.scalers[item_name] = scaler
+        self._discard_compiled(item_name, remove_file=save_model)
         
         # Calculate metrics
         y_pred = model.predict(X_test_scaled)
@@ -107,6 +135,124 @@ class WastePredictor:
         
         return metrics
         
+    def train_streaming(self, item_name, chunks, memory_budget_mb=256, holdout_fraction=0.05,
+                        max_holdout_rows=100_000, epochs=1, save_model=True):
+        """
+        Train an item's waste model out of core on data larger than memory
+        
+        Chunks are streamed through an incrementally updated StandardScaler
+        and SGDRegressor (partial_fit), so peak memory is bounded by the
+        chunk size rather than the history size. The model and scaler
+        replace the item's entries like train_model, so predict_waste
+        works unchanged.
+        
+        Args:
+            item_name (str): Name of the item
+            chunks (str or iterable): Path of a CSV with the training
+                columns, or an iterable of DataFrame chunks; rows of other
+                items are skipped when chunks have an 'item_name' column
+            memory_budget_mb (float): Memory budget used to size the chunks
+                read from a CSV path
+            holdout_fraction (float): Fraction of rows held out (chosen by
+                a hash of the row, so stable across epochs) for scoring
+            max_holdout_rows (int): Maximum number of holdout rows kept
+            epochs (int): Passes over the data (chunks must be a path or
+                a list when above 1)
+            save_model (bool): Whether to save the trained model
+            
+        Returns:
+            dict: Holdout metrics and throughput
+        """
+        if isinstance(chunks, str):
+            csv_path = chunks
+            chunk_rows = chunk_rows_for_budget(csv_path, memory_budget_mb,
+                                               len(self.feature_columns))
+            chunks = lambda: pd.read_csv(csv_path, chunksize=chunk_rows)
+        elif isinstance(chunks, pd.DataFrame) or isinstance(chunks, list):
+            frames = [chunks] if isinstance(chunks, pd.DataFrame) else chunks
+            chunk_rows = max(len(frame) for frame in frames)
+            chunks = lambda: iter(frames)
+        elif epochs == 1:
+            chunk_rows = None
+            iterator = iter(chunks)
+            chunks = lambda: iterator
+        else:
+            raise ValueError("Multiple epochs need a CSV path or a list of chunks")
+            
+        scaler = StandardScaler()
+        model = SGDRegressor(alpha=1e-4, learning_rate='invscaling', eta0=0.01, random_state=42)
+        holdout_X, holdout_y = [], []
+        holdout_rows = 0
+        rows = 0
+        n_chunks = 0
+        
+        start = time.perf_counter()
+        for epoch in range(epochs):
+            for chunk in chunks():
+                if 'item_name' in chunk.columns:
+                    chunk = chunk[chunk['item_name'].astype(str) == item_name]
+                if chunk.empty:
+                    continue
+                    
+                if self.feature_store.uses_history and epoch == 0:
+                    X = self.feature_store.update(chunk, item_name, cache=False)
+                else:
+                    X = self.feature_store.transform(chunk, item_name)
+                X = X.to_numpy(dtype=float)
+                y = chunk['waste_amount'].to_numpy(dtype=float)
+                
+                held_out = np.zeros(len(chunk), dtype=bool)
+                if holdout_fraction:
+                    row_hash = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+                    held_out = (row_hash % 10_000) < holdout_fraction * 10_000
+                    if epoch == 0 and holdout_rows < max_holdout_rows:
+                        keep = np.flatnonzero(held_out)[:max_holdout_rows - holdout_rows]
+                        holdout_X.append(X[keep])
+                        holdout_y.append(y[keep])
+                        holdout_rows += len(keep)
+                        
+                X, y = X[~held_out], y[~held_out]
+                if not len(y):
+                    continue
+                if epoch == 0:
+                    scaler.partial_fit(X)
+                model.partial_fit(scaler.transform(X), y)
+                rows += len(y)
+                n_chunks += 1
+                
+        train_seconds = time.perf_counter() - start
+        if not rows:
+            raise ValueError(f"No training rows found for {item_name}")
+            
+        if save_model:
+            joblib.dump(model, os.path.join(self.model_dir, f"{item_name}_waste_model.pkl"))
+            joblib.dump(scaler, os.path.join(self.model_dir, f"{item_name}_scaler.pkl"))
+            
+        self.models[item_name] = model
+        self.scalers[item_name] = scaler
+        self._discard_compiled(item_name, remove_file=save_model)
+        
+        metrics = {
+            'rows_processed': rows,
+            'chunks': n_chunks,
+            'chunk_rows': chunk_rows,
+            'epochs': epochs,
+            'train_seconds': train_seconds,
+            'rows_per_second': rows / train_seconds if train_seconds else None,
+            'training_date': datetime.now().isoformat()
+        }
+        if holdout_rows:
+            y_test = np.concatenate(holdout_y)
+            y_pred = model.predict(scaler.transform(np.concatenate(holdout_X)))
+            metrics.update({
+                'holdout_rows': holdout_rows,
+                'mae': mean_absolute_error(y_test, y_pred),
+                'rmse': np.sqrt(mean_squared_error(y_test, y_pred)),
+                'r2': r2_score(y_test, y_pred)
+            })
+            
+        return metrics
+        
     def load_model(self, item_name):
         """
         Load a trained model and scaler for an item
@@ -123,48 +269,185 @@ class WastePredictor:
         else:
             raise FileNotFoundError(f"No trained model found for {item_name}")
             
-    def predict_waste(self, item_name, input_data):
+    def compile_model(self, item_name, max_depth=None, min_samples=1, save_model=True):
         """
-        Generate waste predictions for an item
+        Flatten an item's forest and scaler into a compact CompiledForest
         
         Args:
             item_name (str): Name of the item
-            input_data (pd.DataFrame): Input data for prediction
+            max_depth (int): Truncate the trees below this depth
+            min_samples (int): Prune splits with a child holding fewer
+                training samples than this
+            save_model (bool): Whether to save the compiled forest
             
         Returns:
-            dict: Prediction results
+            CompiledForest: The compiled forest
+            
+        Raises:
+            ValueError: When the item's model is linear (train_streaming)
         """
         if item_name not in self.models:
             self.load_model(item_name)
+        if hasattr(self.models[item_name], 'coef_'):
+            raise ValueError(f"The model for {item_name} is linear and has no trees to compile")
             
-        # Prepare features
-        X, _ = self.prepare_features(input_data)
-        X_scaled = self.scalers[item_name].transform(X)
+        compiled = CompiledForest.from_sklearn(
+            self.models[item_name], self.scalers[item_name],
+            max_depth=max_depth, min_samples=min_samples
+        )
+        if save_model:
+            compiled.save(os.path.join(self.model_dir, f"{item_name}_waste_model.npz"))
+            
+        self.compiled[item_name] = compiled
+        return compiled
         
-        # Make predictions
-        predictions = self.models[item_name].predict(X_scaled)
+    def _discard_compiled(self, item_name, remove_file=True):
+        """
+        Drop an item's compiled forests after its model is retrained so
+        outdated forests are not served or used for explanations
         
+        Args:
+            item_name (str): Name of the item
+            remove_file (bool): Also delete the saved compiled forest
+        """
+        self.compiled.pop(item_name, None)
+        self.explainers.pop(item_name, None)
+        compiled_path = os.path.join(self.model_dir, f"{item_name}_waste_model.npz")
+        if remove_file and os.path.exists(compiled_path):
+            os.remove(compiled_path)
+            
+    def load_compiled(self, item_name):
+        """
+        Load an item's compiled forest, compiling the trained model when
+        no compiled forest has been saved. Linear models (train_streaming)
+        are left uncompiled.
+        
+        Args:
+            item_name (str): Name of the item
+        """
+        compiled_path = os.path.join(self.model_dir, f"{item_name}_waste_model.npz")
+        if os.path.exists(compiled_path):
+            self.compiled[item_name] = CompiledForest.load(compiled_path)
+            return
+            
+        if item_name not in self.models:
+            self.load_model(item_name)
+        if not hasattr(self.models[item_name], 'coef_'):
+            self.compile_model(item_name)
+            
+    def predict_waste(self, item_name, input_data, explain=False):
+        """
+        Generate waste predictions for an item
+        
+        Args:
+            item_name (str): Name of the item
+            input_data (pd.DataFrame): Input data for prediction
+            explain (bool): Add per-feature contributions to every
+                prediction (see explain_waste); per-item models only.
+                Predictions then come from the unpruned model even when
+                a pruned compiled forest is served.
+                
+        Returns:
+            dict: Prediction results
+            
+        Raises:
+            ValueError: When explain is requested in global mode
+        """
+        if self.mode == 'global':
+            if explain:
+                raise ValueError("Contributions are only available for per-item models")
+            return self.predict_waste_many(
+                input_data.assign(item_name=item_name)
+            )[item_name]
+            
+        # Prepare features
+        X, _ = self.prepare_features(input_data, item_name)
+        
+        # Make predictions; explained predictions are the sum of their
+        # contributions, so both come from the same unpruned forest
+        if explain:
+            bias, contributions = self._contributions(item_name, X)
+            predictions = bias + contributions.sum(axis=1)
+        else:
+            if self.use_compiled and item_name not in self.compiled:
+                self.load_compiled(item_name)
+            if self.use_compiled and item_name in self.compiled:
+                predictions = self.compiled[item_name].predict(X)
+            else:
+                if item_name not in self.models:
+                    self.load_model(item_name)
+                X_scaled = self.scalers[item_name].transform(X)
+                predictions = self.models[item_name].predict(X_scaled)
+                
         # Prepare results
         results = {
             'prediction_date': datetime.now().isoformat(),
             'item_name': item_name,
-            'predictions': []
+            'predictions': _prediction_records(input_data, predictions)
         }
         
-        for i, pred in enumerate(predictions):
-            results['predictions'].append({
-                'date': input_data.iloc[i]['date'],
-                'predicted_waste': float(pred),
-                'inventory_level': float(input_data.iloc[i]['inventory_level']),
-                'sales_forecast': float(input_data.iloc[i]['sales_forecast'])
-            })
-            
+        if explain:
+            results['baseline'] = float(bias[0]) if len(bias) else None
+            for record, row in zip(results['predictions'], contributions.tolist()):
+                record['contributions'] = dict(zip(self.feature_columns, row))
+                
         return results
         
+    def predict_waste_iter(self, item_name, frames, chunk_size=10000):
+        """
+        Generate waste predictions for arbitrarily large inputs in chunks
+        
+        Args:
+            item_name (str): Name of the item
+            frames (pd.DataFrame or iterable): Input data, or an iterable
+                of input chunks (e.g. pd.read_csv(..., chunksize=...))
+            chunk_size (int): Maximum rows predicted per batch
+            
+        Yields:
+            dict: Prediction results for each batch, in the predict_waste
+                format
+        """
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+            
+        for frame in frames:
+            for start in range(0, len(frame), chunk_size):
+                yield self.predict_waste(item_name, frame.iloc[start:start + chunk_size])
+                
+    def write_predictions(self, item_name, frames, output_path, chunk_size=10000):
+        """
+        Stream waste predictions to a JSON Lines file, one prediction per
+        line, without holding the results in memory
+        
+        Args:
+            item_name (str): Name of the item
+            frames (pd.DataFrame or iterable): Input data or input chunks
+            output_path (str): Path of the .jsonl file
+            chunk_size (int): Maximum rows predicted per batch
+            
+        Returns:
+            int: Number of predictions written
+        """
+        written = 0
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            for batch in self.predict_waste_iter(item_name, frames, chunk_size):
+                for prediction in batch['predictions']:
+                    f.write(json.dumps({'item_name': item_name, **prediction}, default=str))
+                    f.write('\n')
+                written += len(batch['predictions'])
+        os.replace(tmp_path, output_path)
+        return written
+        
     def analyze_feature_importance(self, item_name):
         """
         Analyze feature importance for waste prediction
         
+        Forests report their impurity-based importances. Linear models
+        (train_streaming) report their absolute coefficients, which are
+        comparable because they apply to standardized features, normalized
+        to sum to one like the forest importances.
+        
         Args:
             item_name (str): Name of the item
             
@@ -177,13 +460,15 @@ class WastePredictor:
         model = self.models[item_name]
         
         # Get feature names
-        feature_names = [
-            'day_of_week', 'month', 'day_of_month',
-            'inventory_level', 'sales_forecast', 'shelf_life_days'
-        ]
+        feature_names = self.feature_columns
         
         # Calculate importance
-        importance = model.feature_importances_
+        if hasattr(model, 'coef_'):
+            importance = np.abs(np.ravel(model.coef_))
+            if importance.sum() > 0:
+                importance = importance / importance.sum()
+        else:
+            importance = model.feature_importances_
         
         return {
             'item_name': item_name,
@@ -194,6 +479,223 @@ class WastePredictor:
             }
         }
         
+    def _global_features(self, data, update=False):
+        """
+        Build the global model's feature matrix: the per-item features plus
+        the item identity and item attributes as categorical codes (or as
+        target encodings when they have more than MAX_CATEGORIES values)
+        
+        Attributes missing from the data are looked up from the values
+        seen for each item in training. Unknown items or attribute values
+        are encoded as missing.
+        """
+        X, y = self.prepare_features(data, update=update)
+        X = X.astype(float)
+        target_encodings = self.global_model.get('target_encodings', {})
+        
+        item_codes = target_encodings.get('item_code', self.global_model['items'])
+        X['item_code'] = data['item_name'].map(item_codes).astype(float)
+        for column in self.global_model['attributes']:
+            if column in data.columns:
+                values = data[column]
+            else:
+                values = data['item_name'].map(self.global_model['item_attributes'][column])
+            codes = target_encodings.get(column, self.global_model['attribute_codes'].get(column))
+            if codes is not None:
+                values = values.map(codes)
+            X[column] = values.astype(float)
+        return X, y
+        
+    def train_global_model(self, training_data, attribute_columns=('category',),
+                           smoothing=10, save_model=True):
+        """
+        Train one waste prediction model across all items
+        
+        The item and text attributes are categorical features. A column
+        with more than MAX_CATEGORIES values (such as the item in a large
+        catalogue) is replaced by its smoothed mean waste per value.
+        
+        Args:
+            training_data (pd.DataFrame): Historical waste data for every
+                item, with an 'item_name' column
+            attribute_columns (tuple): Item attribute columns used as
+                features (text columns are treated as categorical)
+            smoothing (float): Rows of weight given to the overall mean
+                in target encodings
+            save_model (bool): Whether to save the trained model
+            
+        Returns:
+            dict: Training metrics
+        """
+        attribute_columns = [column for column in attribute_columns
+                             if column in training_data.columns]
+        items = sorted(training_data['item_name'].unique())
+        self.global_model = {
+            'items': {item_name: code for code, item_name in enumerate(items)},
+            'attributes': attribute_columns,
+            'attribute_codes': {
+                column: {value: code for code, value in
+                         enumerate(sorted(training_data[column].dropna().unique()))}
+                for column in attribute_columns
+                if not pd.api.types.is_numeric_dtype(training_data[column])
+            },
+            'item_attributes': (training_data.drop_duplicates('item_name', keep='last')
+                                             .set_index('item_name')[attribute_columns]
+                                             .to_dict())
+        }
+        
+        # Split first so the held-out targets stay out of the encodings
+        train_rows, test_rows = train_test_split(
+            np.arange(len(training_data)), test_size=0.2, random_state=42
+        )
+        train_data = training_data.iloc[train_rows]
+        
+        keys = {'item_code': training_data['item_name']}
+        keys.update({column: training_data[column]
+                     for column in self.global_model['attribute_codes']})
+        self.global_model['target_encodings'] = {
+            column: _target_encoding(values.iloc[train_rows], train_data['waste_amount'], smoothing)
+            for column, values in keys.items()
+            if values.nunique() > MAX_CATEGORIES
+        }
+        
+        X, y = self._global_features(training_data, update=True)
+        X_train, X_test = X.iloc[train_rows], X.iloc[test_rows]
+        y_train, y_test = y.iloc[train_rows], y.iloc[test_rows]
+        
+        categorical = [column in keys and column not in self.global_model['target_encodings']
+                       for column in X.columns]
+        model = HistGradientBoostingRegressor(
+            categorical_features=categorical,
+            max_iter=200,
+            random_state=42
+        )
+        model.fit(X_train, y_train)
+        self.global_model['model'] = model
+        
+        if save_model:
+            joblib.dump(self.global_model, os.path.join(self.model_dir, "global_waste_model.pkl"))
+            
+        y_pred = model.predict(X_test)
+        return {
+            'mae': mean_absolute_error(y_test, y_pred),
+            'rmse': np.sqrt(mean_squared_error(y_test, y_pred)),
+            'r2': r2_score(y_test, y_pred),
+            'items': len(items),
+            'training_date': datetime.now().isoformat()
+        }
+        
+    def load_global_model(self):
+        """
+        Load the global waste prediction model
+        """
+        model_path = os.path.join(self.model_dir, "global_waste_model.pkl")
+        if not os.path.exists(model_path):
+            raise FileNotFoundError("No trained global waste model found")
+        self.global_model = joblib.load(model_path)
+        
+    def predict_waste_many(self, input_data):
+        """
+        Generate waste predictions for many items with one batched call
+        
+        Args:
+            input_data (pd.DataFrame): Input data for prediction with an
+                'item_name' column
+                
+        Returns:
+            dict: Prediction results by item, in the predict_waste format
+        """
+        if self.global_model is None:
+            self.load_global_model()
+            
+        X, _ = self._global_features(input_data)
+        predictions = self.global_model['model'].predict(X)
+        
+        prediction_date = datetime.now().isoformat()
+        results = {}
+        for item_name, index in input_data.groupby('item_name', sort=False).indices.items():
+            results[item_name] = {
+                'prediction_date': prediction_date,
+                'item_name': item_name,
+                'predictions': _prediction_records(input_data.iloc[index], predictions[index])
+            }
+            
+        return results
+        
+    def _contributions(self, item_name, X):
+        """
+        Compute per-feature contributions for an item's feature rows
+        
+        Forests are decomposed along their tree paths through an unpruned
+        compiled forest, cached apart from the one compile_model builds for
+        serving (which may be pruned); linear models (train_streaming) contribute coefficient
+        times scaled feature.
+        
+        Returns:
+            tuple: (bias per row, n_rows x n_features contributions)
+        """
+        if self.mode == 'global':
+            raise ValueError("Contributions are only available for per-item models")
+            
+        if item_name not in self.models:
+            self.load_model(item_name)
+        model = self.models[item_name]
+        
+        if hasattr(model, 'coef_'):
+            X_scaled = self.scalers[item_name].transform(X)
+            bias = np.full(len(X_scaled), float(np.ravel(model.intercept_)[0]))
+            return bias, X_scaled * model.coef_
+            
+        # Kept apart from the serving forests, which may be pruned
+        if item_name not in self.explainers:
+            self.explainers[item_name] = CompiledForest.from_sklearn(model, self.scalers[item_name])
+        return self.explainers[item_name].contributions(X.to_numpy(dtype=float))
+        
+    def explain_waste(self, item_name, input_data):
+        """
+        Explain why waste is predicted high or low, row by row
+        
+        Each prediction is split into a baseline (the model's average
+        prediction) plus one contribution per feature, which sum to the
+        prediction.
+        
+        Args:
+            item_name (str): Name of the item
+            input_data (pd.DataFrame): Input data for prediction
+            
+        Returns:
+            dict: Baseline, feature names, and per-row predictions with
+                contributions and the largest drivers
+        """
+        X, _ = self.prepare_features(input_data, item_name)
+        bias, contributions = self._contributions(item_name, X)
+        predictions = bias + contributions.sum(axis=1)
+        
+        # Largest absolute contributions first
+        order = np.argsort(-np.abs(contributions), axis=1)[:, :3]
+        feature_names = np.array(self.feature_columns)
+        
+        return {
+            'item_name': item_name,
+            'analysis_date': datetime.now().isoformat(),
+            'baseline': float(bias[0]) if len(bias) else None,
+            'features': list(self.feature_columns),
+            'explanations': [
+                {
+                    'date': date,
+                    'predicted_waste': prediction,
+                    'contributions': dict(zip(self.feature_columns, row)),
+                    'top_drivers': drivers
+                }
+                for date, prediction, row, drivers in zip(
+                    input_data['date'].tolist(),
+                    predictions.tolist(),
+                    contributions.tolist(),
+                    feature_names[order].tolist()
+                )
+            ]
+        }
+        
     def export_predictions(self, predictions, output_path='waste_predictions.json'):
         """
         Export predictions to JSON file
@@ -203,27 +705,88 @@ class WastePredictor:
             output_path (str): Path to save the predictions
         """
         with open(output_path, 'w') as f:
-            json.dump(predictions, f, indent=4)
+            json.dump(predictions, f, indent=4, default=str)
+
+def chunk_rows_for_budget(csv_path, memory_budget_mb, n_features, sample_rows=1000):
+    """
+    Size CSV chunks to fit a memory budget
+    
+    The per-row cost is measured on a sample of the file and includes the
+    float64 feature matrix and its scaled copy.
+    
+    Args:
+        csv_path (str): Path of the CSV
+        memory_budget_mb (float): Memory budget in megabytes
+        n_features (int): Number of model features
+        sample_rows (int): Rows read to measure the row size
+        
+    Returns:
+        int: Rows per chunk
+    """
+    sample = pd.read_csv(csv_path, nrows=sample_rows)
+    row_bytes = sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1)
+    row_bytes += 3 * n_features * 8
+    return max(int(memory_budget_mb * 2 ** 20 / row_bytes), 100)
+
+def _target_encoding(values, target, smoothing):
+    """
+    Map each value to its mean target, shrunk towards the overall mean
+    for values with few rows
+    """
+    stats = target.groupby(values).agg(['sum', 'count'])
+    prior = target.mean()
+    return ((stats['sum'] + smoothing * prior) / (stats['count'] + smoothing)).to_dict()
+
+def _prediction_records(input_data, predictions):
+    """
+    Build the per-row prediction entries column-wise instead of looking
+    up every row with iloc
+    """
+    return [
+        {
+            'date': date,
+            'predicted_waste': pred,
+            'inventory_level': inventory_level,
+            'sales_forecast': sales_forecast
+        }
+        for date, pred, inventory_level, sales_forecast in zip(
+            input_data['date'].tolist(),
+            np.asarray(predictions, dtype=float).tolist(),
+            input_data['inventory_level'].to_numpy(dtype=float).tolist(),
+            input_data['sales_forecast'].to_numpy(dtype=float).tolist()
+        )
+    ]
 
 def main():
     # Example usage
     predictor = WastePredictor()
     
     try:
-        # Generate sample data
-        dates = pd.date_range(start='2023-01-01', end='2024-03-20', freq='D')
-        n_samples = len(dates)
-        
-        sample_data = pd.DataFrame({
-            'date': dates,
-            'inventory_level': np.random.uniform(50, 200, n_samples),
-            'sales_forecast': np.random.uniform(20, 100, n_samples),
-            'shelf_life_days': np.random.uniform(3, 14, n_samples),
-            'waste_amount': np.random.uniform(0, 30, n_samples)
-        })
-        
+        waste_log = '../../public/files/waste_management_data.csv'
+        if os.path.exists(waste_log):
+            # Daily per-item rows aggregated from the waste log
+            global_data = load_waste_training_data(waste_log)
+            item_name = global_data.groupby('item_name')['waste_amount'].sum().idxmax()
+            sample_data = global_data[global_data['item_name'] == item_name]
+        else:
+            # Generate sample data
+            dates = pd.date_range(start='2023-01-01', end='2024-03-20', freq='D')
+            n_samples = len(dates)
+            
+            sample_data = pd.DataFrame({
+                'date': dates,
+                'inventory_level': np.random.uniform(50, 200, n_samples),
+                'sales_forecast': np.random.uniform(20, 100, n_samples),
+                'shelf_life_days': np.random.uniform(3, 14, n_samples),
+                'waste_amount': np.random.uniform(0, 30, n_samples)
+            })
+            item_name = 'sample_item'
+            global_data = pd.concat([
+                sample_data.assign(item_name=f'sample_item_{i}', category=category)
+                for i, category in enumerate(['Dairy', 'Dairy', 'Produce', 'Bakery'])
+            ], ignore_index=True)
+            
         # Train model
-        item_name = 'sample_item'
         metrics = predictor.train_model(item_name, sample_data)
         print(f"Training metrics: {metrics}")
         
@@ -249,9 +812,31 @@ def main():
         importance = predictor.analyze_feature_importance(item_name)
         print(f"Feature importance: {importance}")
         
+        # Explain individual predictions
+        explanation = predictor.explain_waste(item_name, future_data)
+        first = explanation['explanations'][0]
+        print(f"Top waste drivers on {first['date']:%Y-%m-%d}: {first['top_drivers']}")
+        
         # Export results
         predictor.export_predictions({item_name: predictions})
         
+        # Stream a large input to disk in chunks
+        written = predictor.write_predictions(
+            item_name, [future_data] * 100, 'waste_predictions.jsonl', chunk_size=500
+        )
+        print(f"Streamed {written} predictions to waste_predictions.jsonl")
+        
+        # Global mode: one model for several items
+        global_predictor = WastePredictor(mode='global')
+        metrics = global_predictor.train_global_model(global_data)
+        print(f"Global training metrics: {metrics}")
+        
+        batch = pd.concat([
+            future_data.assign(item_name=name) for name in global_data['item_name'].unique()
+        ], ignore_index=True)
+        predictions = global_predictor.predict_waste_many(batch)
+        print(f"Generated global predictions for {len(predictions)} items")
+        
     except Exception as e:
         print(f"Error: {e}")
 
@@ -1,5 +1,6 @@
 import numpy as np
 import json
+from dashboard_schema import SCHEMA_VERSION, CURRENCY
 from datetime import datetime, timedelta
 
 def generate_waste_data():
@@ -19,21 +20,21 @@ def generate_waste_data():
         else:
             percentage = np.random.randint(20, min(50, remaining_percentage))
             remaining_percentage -= percentage
-        
+            
         amount = round((percentage / 100) * base_waste)
         remaining_amount -= amount
         
         waste_by_category.append({
             "category": category,
-            "amount": f"₹{amount:,}",
-            "percentage": f"{percentage}%"
+            "amount": amount,
+            "percentage": percentage
         })
-    
+        
     # Add last category with remaining amount
     waste_by_category.append({
         "category": categories[-1],
-        "amount": f"₹{remaining_amount:,}",
-        "percentage": f"{remaining_percentage}%"
+        "amount": remaining_amount,
+        "percentage": remaining_percentage
     })
     
     # Generate high-risk items
@@ -41,20 +42,23 @@ def generate_waste_data():
         {
             "name": "Fresh Vegetables",
             "expiryDays": 2,
-            "quantity": "5 kg",
-            "potentialLoss": "₹600"
+            "quantity": 5,
+            "quantityUnit": "kg",
+            "potentialLoss": 600
         },
         {
             "name": "Chicken",
             "expiryDays": 1,
-            "quantity": "3 kg",
-            "potentialLoss": "₹450"
+            "quantity": 3,
+            "quantityUnit": "kg",
+            "potentialLoss": 450
         },
         {
             "name": "Milk",
             "expiryDays": 3,
-            "quantity": "4 L",
-            "potentialLoss": "₹200"
+            "quantity": 4,
+            "quantityUnit": "L",
+            "potentialLoss": 200
         }
     ]
     
@@ -64,9 +68,11 @@ def generate_waste_data():
     
     # Generate synthetic data
     waste_data = {
-        "totalWasteCost": f"₹{base_waste:,}",
+        "schemaVersion": SCHEMA_VERSION,
+        "currency": CURRENCY,
+        "totalWasteCost": base_waste,
         "trend": "down",  # Assuming improvement
-        "trendPercentage": f"{abs(round(trend_percentage, 1))}%",
+        "trendPercentage": abs(round(trend_percentage, 1)),
         "highRiskItems": high_risk_items,
         "wasteByCategory": waste_by_category,
         "recommendations": [
@@ -86,6 +92,6 @@ if __name__ == "__main__":
     # Save to JSON file
     with open('waste_prediction.json', 'w') as f:
         json.dump(data, f, indent=2)
-    
+        
     print("Generated waste prediction data:")
     print(json.dumps(data, indent=2)) 
\ No newline at end of file
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 from pulp import *
+from scipy import sparse
 import json
 from datetime import datetime
 import os
@@ -11,6 +12,7 @@ class MenuOptimizer:
         self.recipes = {}
         self.costs = {}
         self.constraints = {}
+        self._matrix = None
         
     def load_data(self, recipe_file, cost_file):
         """
@@ -28,6 +30,78 @@ class MenuOptimizer:
         with open(cost_file, 'r') as f:
             self.costs = json.load(f)
             
+        self._matrix = None
+        
+    def _cost_matrix(self):
+        """
+        Compile the recipes and costs into a sparse recipe x ingredient
+        matrix of amounts and a unit-cost vector
+        
+        Ingredients without a cost are left out, as in
+        calculate_recipe_cost. The result is cached and rebuilt when
+        recipes or costs are replaced or gain or lose entries; call
+        invalidate() after editing their values in place.
+        
+        Returns:
+            dict: 'recipe_ids', 'ingredients', 'amounts' (CSR matrix),
+                'unit_costs', 'overhead', 'prices' and 'ingredient_costs'
+                (amounts scaled by unit cost, CSR)
+        """
+        stamp = (id(self.recipes), len(self.recipes), id(self.costs), len(self.costs))
+        if self._matrix is not None and self._matrix['stamp'] == stamp:
+            return self._matrix
+            
+        recipe_ids = list(self.recipes)
+        ingredients = list(self.costs)
+        ingredient_index = {ingredient: i for i, ingredient in enumerate(ingredients)}
+        
+        # Built directly in CSR form so each row keeps the recipe's
+        # ingredient order
+        columns, amounts = [], []
+        indptr = np.zeros(len(recipe_ids) + 1, dtype=np.int64)
+        for row, recipe_id in enumerate(recipe_ids):
+            for ingredient, amount in self.recipes[recipe_id]['ingredients'].items():
+                column = ingredient_index.get(ingredient)
+                if column is not None:
+                    columns.append(column)
+                    amounts.append(amount)
+            indptr[row + 1] = len(columns)
+            
+        shape = (len(recipe_ids), len(ingredients))
+        columns = np.asarray(columns, dtype=np.int64)
+        amounts = np.asarray(amounts, dtype=float)
+        unit_costs = np.array([self.costs[ingredient]['cost_per_unit'] for ingredient in ingredients],
+                              dtype=float)
+        self._matrix = {
+            'stamp': stamp,
+            'recipe_ids': recipe_ids,
+            'ingredients': np.array(ingredients, dtype=object),
+            'amounts': sparse.csr_matrix((amounts, columns, indptr), shape=shape),
+            'unit_costs': unit_costs,
+            'overhead': np.array([self.recipes[recipe_id].get('overhead_percentage', 0.2)
+                                  for recipe_id in recipe_ids], dtype=float),
+            'prices': np.array([self.recipes[recipe_id]['current_price'] for recipe_id in recipe_ids],
+                               dtype=float),
+            'ingredient_costs': sparse.csr_matrix((amounts * unit_costs[columns], columns, indptr),
+                                                  shape=shape)
+        }
+        return self._matrix
+        
+    def invalidate(self):
+        """Drop the compiled cost matrix after recipes or costs change"""
+        self._matrix = None
+        
+    def recipe_costs(self):
+        """
+        Calculate the cost of every recipe with one sparse product
+        
+        Returns:
+            np.ndarray: Total cost including overhead, in the order of
+                self.recipes
+        """
+        matrix = self._cost_matrix()
+        return (matrix['amounts'] @ matrix['unit_costs']) * (1 + matrix['overhead'])
+        
     def calculate_recipe_cost(self, recipe):
         """
         Calculate the cost of a recipe
@@ -70,18 +144,20 @@ class MenuOptimizer:
             self.recipes.keys(),
             lowBound=0
         )
+        costs = dict(zip(self._cost_matrix()['recipe_ids'], self.recipe_costs().tolist()))
         
         # Objective: Maximize total profit
-        total_profit = lpSum([
-            prices[recipe_id] * recipe['expected_sales'] -
-            self.calculate_recipe_cost(recipe) * recipe['expected_sales']
-            for recipe_id, recipe in self.recipes.items()
-        ])
+        total_profit = LpAffineExpression(
+            [(prices[recipe_id], recipe['expected_sales'])
+             for recipe_id, recipe in self.recipes.items()],
+            constant=-sum(costs[recipe_id] * recipe['expected_sales']
+                          for recipe_id, recipe in self.recipes.items())
+        )
         prob += total_profit
         
         # Constraints
         for recipe_id, recipe in self.recipes.items():
-            cost = self.calculate_recipe_cost(recipe)
+            cost = costs[recipe_id]
             current_price = recipe['current_price']
             
             # Minimum profit margin
@@ -106,10 +182,8 @@ class MenuOptimizer:
             results['prices'][recipe_id] = {
                 'old_price': self.recipes[recipe_id]['current_price'],
                 'new_price': value(prices[recipe_id]),
-                'cost': self.calculate_recipe_cost(self.recipes[recipe_id]),
-                'profit_margin': (value(prices[recipe_id]) - 
-                                self.calculate_recipe_cost(self.recipes[recipe_id])) /
-                               self.calculate_recipe_cost(self.recipes[recipe_id])
+                'cost': costs[recipe_id],
+                'profit_margin': (value(prices[recipe_id]) - costs[recipe_id]) / costs[recipe_id]
             }
             
         return results
@@ -126,34 +200,31 @@ class MenuOptimizer:
             'recipes': {}
         }
         
-        for recipe_id, recipe in self.recipes.items():
-            # Calculate costs
-            ingredient_costs = {}
-            total_ingredient_cost = 0
-            
-            for ingredient, amount in recipe['ingredients'].items():
-                if ingredient in self.costs:
-                    cost = amount * self.costs[ingredient]['cost_per_unit']
-                    ingredient_costs[ingredient] = cost
-                    total_ingredient_cost += cost
-                    
-            # Calculate metrics
-            overhead_cost = total_ingredient_cost * recipe.get('overhead_percentage', 0.2)
-            total_cost = total_ingredient_cost + overhead_cost
-            current_price = recipe['current_price']
-            profit_margin = (current_price - total_cost) / total_cost
+        # Calculate costs for all recipes at once
+        matrix = self._cost_matrix()
+        ingredient_costs = matrix['ingredient_costs']
+        total_ingredient_costs = np.asarray(ingredient_costs.sum(axis=1)).ravel()
+        overhead_costs = total_ingredient_costs * matrix['overhead']
+        total_costs = total_ingredient_costs + overhead_costs
+        counts = np.diff(ingredient_costs.indptr)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profit_margins = (matrix['prices'] - total_costs) / total_costs
+            shares = ingredient_costs.data / np.repeat(total_costs, counts) * 100
             
+        names = matrix['ingredients'][ingredient_costs.indices].tolist()
+        costs = ingredient_costs.data.tolist()
+        shares = shares.tolist()
+        indptr = ingredient_costs.indptr
+        for row, recipe_id in enumerate(matrix['recipe_ids']):
+            start, end = indptr[row], indptr[row + 1]
             analysis['recipes'][recipe_id] = {
-                'name': recipe['name'],
-                'total_cost': total_cost,
-                'ingredient_costs': ingredient_costs,
-                'overhead_cost': overhead_cost,
-                'current_price': current_price,
-                'profit_margin': profit_margin,
-                'cost_breakdown_percentage': {
-                    ingredient: (cost / total_cost) * 100
-                    for ingredient, cost in ingredient_costs.items()
-                }
+                'name': self.recipes[recipe_id]['name'],
+                'total_cost': float(total_costs[row]),
+                'ingredient_costs': dict(zip(names[start:end], costs[start:end])),
+                'overhead_cost': float(overhead_costs[row]),
+                'current_price': self.recipes[recipe_id]['current_price'],
+                'profit_margin': float(profit_margins[row]),
+                'cost_breakdown_percentage': dict(zip(names[start:end], shares[start:end]))
             }
             
         return analysis
@@ -173,39 +244,48 @@ class MenuOptimizer:
             'recipes': {}
         }
         
-        for recipe_id, recipe in self.recipes.items():
-            current_cost = self.calculate_recipe_cost(recipe)
-            current_price = recipe['current_price']
-            current_margin = (current_price - current_cost) / current_cost
-            
-            if current_margin < target_margin:
-                # Analyze ingredient costs
-                ingredient_costs = []
-                for ingredient, amount in recipe['ingredients'].items():
-                    if ingredient in self.costs:
-                        cost = amount * self.costs[ingredient]['cost_per_unit']
-                        ingredient_costs.append({
-                            'ingredient': ingredient,
-                            'cost': cost,
-                            'amount': amount,
-                            'unit_cost': self.costs[ingredient]['cost_per_unit']
-                        })
-                
-                # Sort by cost
-                ingredient_costs.sort(key=lambda x: x['cost'], reverse=True)
-                
-                suggestions['recipes'][recipe_id] = {
-                    'name': recipe['name'],
-                    'current_margin': current_margin,
-                    'target_margin': target_margin,
-                    'cost_reduction_needed': current_cost * (target_margin - current_margin),
-                    'high_cost_ingredients': ingredient_costs[:3],
-                    'suggestions': [
-                        f"Consider reducing {ing['ingredient']} amount by 10-15%"
-                        for ing in ingredient_costs[:3]
-                    ]
+        matrix = self._cost_matrix()
+        current_costs = self.recipe_costs()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            current_margins = (matrix['prices'] - current_costs) / current_costs
+            
+        # Order every recipe's ingredients by cost, highest first (ties
+        # keep the recipe's order)
+        ingredient_costs = matrix['ingredient_costs']
+        indptr = ingredient_costs.indptr
+        rows = np.repeat(np.arange(len(current_costs)), np.diff(indptr))
+        order = np.lexsort((-ingredient_costs.data, rows))
+        names = matrix['ingredients'][ingredient_costs.indices]
+        amounts = matrix['amounts'].data
+        unit_costs = matrix['unit_costs'][ingredient_costs.indices]
+        
+        for row in np.flatnonzero(current_margins < target_margin):
+            recipe_id = matrix['recipe_ids'][row]
+            current_cost = float(current_costs[row])
+            current_margin = float(current_margins[row])
+            top = order[indptr[row]:min(indptr[row] + 3, indptr[row + 1])]
+            high_cost_ingredients = [
+                {
+                    'ingredient': names[i],
+                    'cost': float(ingredient_costs.data[i]),
+                    'amount': float(amounts[i]),
+                    'unit_cost': float(unit_costs[i])
                 }
-                
+                for i in top
+            ]
+            
+            suggestions['recipes'][recipe_id] = {
+                'name': self.recipes[recipe_id]['name'],
+                'current_margin': current_margin,
+                'target_margin': target_margin,
+                'cost_reduction_needed': current_cost * (target_margin - current_margin),
+                'high_cost_ingredients': high_cost_ingredients,
+                'suggestions': [
+                    f"Consider reducing {ing['ingredient']} amount by 10-15%"
+                    for ing in high_cost_ingredients
+                ]
+            }
+            
         return suggestions
         
     def export_analysis(self, analysis, output_path='cost_analysis.json'):
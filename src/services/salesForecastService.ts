@@ -11,6 +11,8 @@ export interface SalesForecast {
     revenue: number;
     confidence: number;
   }[];
+  // Time-of-day periods of the sales log ('Morning', 'Afternoon',
+  // 'Evening', 'Night', 'Midnight'), busiest first
   peakHours: string[];
   recommendations: string[];
 }
@@ -39,7 +41,7 @@ export const salesForecastService = {
           "saturday": 58000,
           "sunday": 49000
         },
-        "peak_hours": ["7:00 PM", "8:00 PM", "1:00 PM"],
+        "peak_hours": ["Evening", "Night", "Afternoon"],
         "popular_items": ["Butter Chicken", "Biryani", "Paneer Tikka", "Naan"]
       }
 
@@ -55,7 +57,7 @@ export const salesForecastService = {
             "confidence": number between 80 and 95
           }
         ],
-        "peakHours": ["time slots"],
+        "peakHours": ["busiest periods, each one of Morning, Afternoon, Evening, Night or Midnight"],
         "recommendations": ["actionable recommendations"]
       }`;
 
@@ -82,7 +84,7 @@ export const salesForecastService = {
           { date: "Saturday", revenue: 62000, confidence: 90 },
           { date: "Sunday", revenue: 52000, confidence: 85 }
         ],
-        peakHours: ["7:00 PM", "8:00 PM", "1:00 PM"],
+        peakHours: ["Evening", "Night", "Afternoon"],
         recommendations: [
           "Increase staff during predicted peak hours",
           "Stock up on ingredients for popular items",